@@ -0,0 +1,17 @@
+"""벤치마크 스크립트 공통 도우미."""
+
+import subprocess
+from typing import Optional
+
+
+def git_commit() -> Optional[str]:
+    """결과 비교용 현재 커밋 해시 (git 저장소가 아니면 None)"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
@@ -0,0 +1,336 @@
+"""엔드투엔드 부하 테스트.
+
+로컬 저장소 백엔드(memory / sqlite)에 연결한 ``main.app`` 을 프로세스 안에서
+띄우고, 참여자 세션 스크립트(동의서 제출 → 매칭 → 라운드 제출과 메시지 생성 반복
+→ 종합 리포트)를 지정한 동시성으로 실행한다. 결과는 라우트별 처리량과
+p50/p95/p99 지연 시간을 담은 JSON 으로 출력하여 커밋 간 비교에 사용한다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.load_test --sessions 200 --concurrency 50 --output result.json
+    python -m benchmarks.load_test --baseline result.json   # 이전 결과와 비교
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from benchmarks.common import git_commit
+
+PROJECT_ID = "ecoplay-bench"
+KEY_ID = "bench-key"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+class TokenMinter:
+    """로컬 RSA 키로 Firebase ID 토큰 형식의 토큰을 발급"""
+
+    def __init__(self):
+        self.private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+
+    def public_pem(self) -> str:
+        return (
+            self.private_key.public_key()
+            .public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            .decode("ascii")
+        )
+
+    def mint(self, uid: str, email: str, kid: str = KEY_ID, **overrides) -> str:
+        """``overrides`` 로 클레임을 바꿔 발급 (검증 실패 경우 확인용)"""
+        now = int(time.time())
+        header = {"alg": "RS256", "kid": kid, "typ": "JWT"}
+        claims = {
+            "aud": PROJECT_ID,
+            "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+            "sub": uid,
+            "email": email,
+            "iat": now,
+            "auth_time": now,
+            "exp": now + 3600,
+            **overrides,
+        }
+        signing_input = (
+            _b64(json.dumps(header).encode()) + "." + _b64(json.dumps(claims).encode())
+        )
+        signature = self.private_key.sign(
+            signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256()
+        )
+        return signing_input + "." + _b64(signature)
+
+
+def _configure_environment(args, minter: TokenMinter) -> None:
+    """앱 모듈을 import 하기 전에 로컬 백엔드와 서명 키를 설정"""
+    keys_file = os.path.join(tempfile.mkdtemp(prefix="ecoplay-bench-"), "keys.json")
+    with open(keys_file, "w", encoding="utf-8") as f:
+        json.dump({KEY_ID: minter.public_pem()}, f)
+
+    os.environ["DB_BACKEND"] = args.backend
+    os.environ["FIREBASE_PROJECT_ID"] = PROJECT_ID
+    os.environ["TOKEN_SIGNING_KEYS_FILE"] = keys_file
+    if args.backend == "sqlite":
+        os.environ["SQLITE_PATH"] = args.sqlite_path or os.path.join(
+            os.path.dirname(keys_file), "bench.sqlite3"
+        )
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, client, method: str, path: str, **kwargs):
+        route = f"{method} {path.split('?', 1)[0]}"
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except Exception:
+            self.errors[route] += 1
+            return None
+        self.latencies[route].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+            return None
+        return response.json()
+
+
+async def run_session(
+    client, recorder: Recorder, minter: TokenMinter, index: int, args
+) -> None:
+    rng = random.Random(args.seed + index)
+    medical_record_number = f"bench{index:06d}"
+    uid = f"bench-uid-{index}"
+    headers = {
+        "Authorization": "Bearer "
+        + minter.mint(uid, f"{medical_record_number}@eco.play")
+    }
+    game = args.game
+    if game == "mixed":
+        game = rng.choice(["public_goods", "trust_game"])
+
+    await recorder.request(
+        client,
+        "POST",
+        "/consent/submit",
+        headers=headers,
+        json={
+            "medicalRecordNumber": medical_record_number,
+            "consentGiven": True,
+            "consentDetails": {
+                "researchParticipation": True,
+                "dataCollection": True,
+                "dataSharing": True,
+                "contactPermission": True,
+            },
+        },
+    )
+    await recorder.request(
+        client,
+        "POST",
+        "/match/trust-game",
+        headers=headers,
+        json={"user_id": uid, "game_type": "trust-game"},
+    )
+
+    balance = 100.0
+    for round_number in range(1, args.rounds + 1):
+        if game == "public_goods":
+            result = await recorder.request(
+                client,
+                "POST",
+                "/game/public-goods/submit",
+                headers=headers,
+                json={
+                    "round": round_number,
+                    "donation": rng.randint(0, 25),
+                    "current_balance": balance,
+                },
+            )
+            message_game_type = "public_goods"
+        else:
+            if round_number % 2:
+                payload = {
+                    "round": round_number,
+                    "role": "trustee",
+                    "investment": rng.randint(0, 10),
+                    "current_balance": balance,
+                }
+            else:
+                received = rng.randint(0, 30)
+                payload = {
+                    "round": round_number,
+                    "role": "receiver",
+                    "received_amount": received,
+                    "return_amount": rng.randint(0, received),
+                    "current_balance": balance,
+                }
+            result = await recorder.request(
+                client,
+                "POST",
+                "/game/trust-game/submit",
+                headers=headers,
+                json=payload,
+            )
+            message_game_type = "trust_game_trustee"
+        if result:
+            balance = result["new_balance"]
+
+        await recorder.request(
+            client,
+            "POST",
+            "/message/generate",
+            headers=headers,
+            json={
+                "game_type": message_game_type,
+                "round": round_number,
+                "performance_data": {"balance": balance},
+            },
+        )
+
+    await recorder.request(client, "GET", "/report/all", headers=headers)
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+def summarize(recorder: Recorder, elapsed: float, args) -> Dict[str, Any]:
+    routes = {}
+    total_requests = 0
+    for route in sorted(set(recorder.latencies) | set(recorder.errors)):
+        ordered = sorted(recorder.latencies.get(route, []))
+        total_requests += len(ordered)
+        routes[route] = {
+            "count": len(ordered),
+            "errors": recorder.errors.get(route, 0),
+            "throughput_rps": round(len(ordered) / elapsed, 2),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0,
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0,
+        }
+    return {
+        "commit": git_commit(),
+        "config": {
+            "backend": args.backend,
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+            "rounds": args.rounds,
+            "game": args.game,
+            "seed": args.seed,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "total_requests": total_requests,
+        "total_errors": sum(recorder.errors.values()),
+        "throughput_rps": round(total_requests / elapsed, 2),
+        "sessions_per_second": round(args.sessions / elapsed, 2),
+        "routes": routes,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """기준 결과 대비 라우트별 변화율 출력"""
+
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    print(
+        f"\n기준 {baseline.get('commit')} 대비 {result.get('commit')}: "
+        f"처리량 {change(result['throughput_rps'], baseline['throughput_rps'])}",
+        file=sys.stderr,
+    )
+    for route, stats in result["routes"].items():
+        old = baseline["routes"].get(route)
+        if not old:
+            continue
+        deltas = ", ".join(
+            f"{key} {stats[key]:.2f}ms ({change(stats[key], old[key])})"
+            for key in ("p50_ms", "p95_ms", "p99_ms")
+        )
+        print(f"  {route}: {deltas}", file=sys.stderr)
+
+
+async def run(args) -> Dict[str, Any]:
+    minter = TokenMinter()
+    _configure_environment(args, minter)
+
+    import httpx
+
+    import main
+
+    # 요청마다 찍히는 INFO 로그가 측정을 방해하지 않도록
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+
+            async def limited(index: int) -> None:
+                async with semaphore:
+                    await run_session(client, recorder, minter, index, args)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(limited(i) for i in range(args.sessions)))
+            elapsed = time.perf_counter() - started
+
+    return summarize(recorder, elapsed, args)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="EcoPlay 엔드투엔드 부하 테스트")
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--sqlite-path", help="sqlite 백엔드 파일 (기본: 임시 파일)")
+    parser.add_argument("--sessions", type=int, default=100, help="참여자 세션 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 세션 수")
+    parser.add_argument("--rounds", type=int, default=10, help="세션당 라운드 수")
+    parser.add_argument(
+        "--game", choices=["public_goods", "trust_game", "mixed"], default="mixed"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    return parser.parse_args(argv)
+
+
+def main_cli(argv=None) -> None:
+    args = parse_args(argv)
+    result = asyncio.run(run(args))
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,206 @@
+"""순수 계산 경로 마이크로벤치마크.
+
+라운드 보상 계산(``services.game_rules``)과 리포트/기록 행 변환
+(``services.report_rows``, ``services.report_summary``)을 10 ~ 100k 라운드의
+합성 기록으로 측정하고, 라운드당 비용(ns)을 JSON 으로 출력한다. 라운드 수가
+늘 때 라운드당 비용이 커지면 회귀로 본다.
+
+실행 (backend 디렉토리에서):
+    python -m benchmarks.microbench --output micro.json
+    python -m benchmarks.microbench --baseline micro.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from benchmarks.common import git_commit
+from services.game_rules import (
+    public_goods_outcome,
+    simulate_other_donations,
+    trust_game_outcome,
+)
+from services.report_rows import (
+    history_rows,
+    public_goods_report_rows,
+    trust_game_report_rows,
+)
+from services.report_summary import public_goods_summary, trust_game_summary
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+
+def synthetic_public_goods_rounds(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    started = datetime(2025, 1, 1)
+    rounds = []
+    balance = 100.0
+    for i in range(n):
+        donation = rng.randint(0, 25)
+        others = simulate_other_donations(rng)
+        outcome = public_goods_outcome(donation, others, balance)
+        balance = outcome.new_balance
+        rounds.append(
+            {
+                "round": i % 10 + 1,
+                "human_contribution": donation,
+                "human_payoff": outcome.payoff,
+                "computer_contributions": others,
+                "total_donated": outcome.total_donated,
+                "common_pot": outcome.common_pot,
+                "share_received": outcome.share_per_player,
+                "new_balance": balance,
+                "timestamp": started + timedelta(seconds=i),
+            }
+        )
+    return rounds
+
+
+def synthetic_trust_game_rounds(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    started = datetime(2025, 1, 1)
+    rounds = []
+    balance = 100.0
+    for i in range(n):
+        if i % 2:
+            received = rng.randint(0, 30)
+            outcome = trust_game_outcome(
+                "receiver",
+                balance,
+                received_amount=received,
+                return_amount=rng.randint(0, received),
+            )
+        else:
+            outcome = trust_game_outcome(
+                "trustee", balance, investment=rng.randint(0, 10)
+            )
+        balance = outcome.new_balance
+        rounds.append(
+            {
+                "round": i % 10 + 1,
+                "role": outcome.role,
+                "decision": outcome.decision,
+                "received_amount": outcome.received_amount,
+                "multiplied_amount": outcome.multiplied_amount,
+                "new_balance": balance,
+                "response_time": 0,
+                "partner_id": "",
+                "game_name": "trust game",
+                "timestamp": started + timedelta(seconds=i),
+            }
+        )
+    return rounds
+
+
+def _benchmarks(n: int, seed: int) -> Dict[str, Callable[[], Any]]:
+    rng = random.Random(seed)
+    pg_rounds = synthetic_public_goods_rounds(n, rng)
+    tg_rounds = synthetic_trust_game_rounds(n, rng)
+    donations = [
+        (r["human_contribution"], r["computer_contributions"]) for r in pg_rounds
+    ]
+    trust_requests = [
+        ("receiver", r["received_amount"], r["decision"], None)
+        if r["role"] == "trustee"
+        else ("trustee", None, None, r["decision"])
+        for r in tg_rounds
+    ]
+
+    def public_goods_payoff():
+        balance = 100.0
+        for donation, others in donations:
+            balance = public_goods_outcome(donation, others, balance).new_balance
+
+    def trust_game_branch():
+        balance = 100.0
+        for role, received, returned, investment in trust_requests:
+            balance = trust_game_outcome(
+                role,
+                balance,
+                received_amount=received,
+                return_amount=returned,
+                investment=investment,
+            ).new_balance
+
+    def public_goods_report():
+        _, fields = public_goods_report_rows(pg_rounds)
+        public_goods_summary(fields)
+
+    def trust_game_report():
+        _, fields = trust_game_report_rows(tg_rounds)
+        trust_game_summary(fields)
+
+    return {
+        "public_goods_payoff": public_goods_payoff,
+        "trust_game_branch": trust_game_branch,
+        "public_goods_report": public_goods_report,
+        "trust_game_report": trust_game_report,
+        "history_public_goods": lambda: history_rows("public_goods", pg_rounds),
+        "history_trust_game": lambda: history_rows("trust_game_trustee", tg_rounds),
+    }
+
+
+def run(sizes: List[int], repeat: int, seed: int) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for n in sizes:
+        # 크기와 상관없이 한 번 측정에 대략 같은 라운드 수를 처리
+        number = max(1, 100_000 // n)
+        for name, fn in _benchmarks(n, seed).items():
+            best = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+            results.setdefault(name, {})[str(n)] = {
+                "ms_per_call": round(best * 1000, 4),
+                "ns_per_round": round(best / n * 1e9, 1),
+            }
+            print(
+                f"{name:<22} n={n:<7} {best * 1000:10.3f} ms  {best / n * 1e9:8.1f} ns/round",
+                file=sys.stderr,
+            )
+    return {
+        "commit": git_commit(),
+        "config": {"sizes": sizes, "repeat": repeat, "seed": seed},
+        "results": results,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(
+        f"\n기준 {baseline.get('commit')} 대비 {result.get('commit')} (ns/round)",
+        file=sys.stderr,
+    )
+    for name, by_size in result["results"].items():
+        for size, stats in by_size.items():
+            old = baseline["results"].get(name, {}).get(size)
+            if not old or not old["ns_per_round"]:
+                continue
+            delta = (stats["ns_per_round"] - old["ns_per_round"]) / old["ns_per_round"]
+            print(
+                f"  {name:<22} n={size:<7} {stats['ns_per_round']:8.1f} ({delta * 100:+.1f}%)",
+                file=sys.stderr,
+            )
+
+
+def main_cli(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="EcoPlay 순수 계산 마이크로벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 파일 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args(argv)
+
+    result = run(args.sizes, args.repeat, args.seed)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main_cli()
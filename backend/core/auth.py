@@ -0,0 +1,121 @@
+"""라우터 공용 인증 의존성."""
+
+import asyncio
+import os
+from typing import Optional
+
+from fastapi import HTTPException, Request, WebSocket, status
+
+from core.token_cache import TokenCache
+from core.token_verifier import TokenVerifier
+
+# 개발 환경 확인
+DEVELOPMENT = os.getenv("ENVIRONMENT", "development") == "development"
+
+# 검증된 토큰 캐시 크기
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+# WebSocket 연결 후 인증 메시지를 기다리는 시간(초)
+WS_AUTH_TIMEOUT = float(os.getenv("WS_AUTH_TIMEOUT", "10"))
+
+token_cache = TokenCache(max_size=TOKEN_CACHE_SIZE)
+token_verifier = TokenVerifier()
+
+# 개발 환경에서 토큰 없이 요청할 때 사용하는 더미 사용자
+DEV_DUMMY_USER = {
+    "uid": "12345678",
+    "email": "12345678@eco.play",
+    "auth_time": 1234567890,
+    "iss": "https://securetoken.google.com/ecoplay-6fd53",
+    "aud": "ecoplay-6fd53",
+}
+
+
+async def verify_id_token_cached(id_token: str) -> dict:
+    """캐시를 거쳐 ID 토큰 검증 (캐시 미스일 때만 로컬 서명 검증 수행)"""
+    decoded_token = token_cache.get(id_token)
+    if decoded_token is not None:
+        return decoded_token
+
+    decoded_token = token_verifier.verify(id_token)
+    token_cache.put(id_token, decoded_token)
+    return decoded_token
+
+
+def _bearer_token(request: Request) -> str:
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid token"
+        )
+    return auth_header.split(" ", 1)[1]
+
+
+# 인증 의존성 (항상 인증 필요)
+async def get_current_user(request: Request) -> dict:
+    id_token = _bearer_token(request)
+    try:
+        return await verify_id_token_cached(id_token)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Firebase token"
+        )
+
+
+# 옵셔널 인증 의존성 (개발 환경에서는 우회 가능)
+async def get_current_user_optional(request: Request) -> Optional[dict]:
+    if DEVELOPMENT and not request.headers.get("Authorization"):
+        # 개발 환경에서 토큰이 없으면 더미 사용자 반환
+        return dict(DEV_DUMMY_USER)
+
+    id_token = _bearer_token(request)
+    try:
+        return await verify_id_token_cached(id_token)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid Firebase token: {str(e)}",
+        )
+
+
+async def authenticate_websocket(websocket: WebSocket) -> dict:
+    """WebSocket 연결당 한 번 인증 (accept 이후 호출, 실패하면 PermissionError)
+
+    ``Authorization`` 헤더가 있으면 그 토큰을, 없으면 첫 메시지
+    ``{"type": "auth", "token": "..."}`` 의 토큰을 검증한다 (브라우저는 WebSocket
+    요청에 헤더를 붙일 수 없음). 개발 환경에서는 토큰 없는 auth 메시지에 더미
+    사용자를 반환한다.
+    """
+    auth_header = websocket.headers.get("Authorization")
+    if auth_header:
+        if not auth_header.startswith("Bearer "):
+            raise PermissionError("Missing or invalid token")
+        id_token = auth_header.split(" ", 1)[1]
+    else:
+        try:
+            message = await asyncio.wait_for(
+                websocket.receive_json(), timeout=WS_AUTH_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise PermissionError("인증 메시지 대기 시간 초과")
+        except ValueError:
+            raise PermissionError("인증 메시지는 JSON 이어야 합니다")
+        if not isinstance(message, dict) or message.get("type") != "auth":
+            raise PermissionError("첫 메시지는 auth 여야 합니다")
+        id_token = message.get("token")
+        if not id_token:
+            if DEVELOPMENT:
+                return dict(DEV_DUMMY_USER)
+            raise PermissionError("Missing or invalid token")
+
+    try:
+        return await verify_id_token_cached(id_token)
+    except Exception as e:
+        raise PermissionError(f"Invalid Firebase token: {str(e)}")
+
+
+def get_medical_record_number(current_user: dict) -> str:
+    """이메일에서 Medical Record Number 추출 (없으면 UID 사용)"""
+    email = current_user.get("email", "")
+    if "@eco.play" in email:
+        return email.replace("@eco.play", "")
+    return current_user["uid"]  # fallback to UID
@@ -1,5 +1,5 @@
 import firebase_admin
-from firebase_admin import credentials, auth, firestore
+from firebase_admin import credentials, firestore
 from typing import Optional
 import os
 import logging
@@ -44,21 +44,3 @@ def get_firestore_client() -> firestore.Client:
     if not firebase_admin._apps:
         init_firebase()
     return firestore.client()
-
-
-def verify_id_token(id_token: str) -> dict:
-    try:
-        if not firebase_admin._apps:
-            logger.info("Firebase 초기화되지 않음. 초기화 시도...")
-            init_firebase()
-
-        logger.info("토큰 검증 시작")
-        decoded_token = auth.verify_id_token(id_token)
-        logger.info(f"토큰 검증 성공. UID: {decoded_token.get('uid', 'Unknown')}")
-        return decoded_token
-    except Exception as e:
-        logger.error(f"토큰 검증 실패: {str(e)}")
-        logger.error(
-            f"토큰: {id_token[:50]}..." if len(id_token) > 50 else f"토큰: {id_token}"
-        )
-        raise
@@ -0,0 +1,186 @@
+"""사용자별 응답 캐시 (강한 ETag / If-None-Match 지원).
+
+응답 본문을 직렬화된 바이트와 ETag로 보관하고, 사용자 단위로 무효화한다.
+캐시가 살아 있는 동안의 조건부 요청은 저장소를 조회하지 않고 304로 응답한다.
+
+무효화할 때마다 사용자의 세대(generation) 값이 바뀐다. 응답을 만들기 전에 세대를
+기록해 두고, 만드는 도중 무효화되었으면 그 응답은 캐시에 넣지 않는다. 응답을
+만드는 쪽이 ``Uncacheable`` 로 감싸 돌려준 응답(부분 실패 등)도 캐시하지 않는다.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+class Uncacheable(NamedTuple):
+    """캐시하지 않고 그대로 반환할 응답 (``ResponseCache.respond`` 의 build 결과용)"""
+
+    content: Any
+
+
+class CachedResponse(NamedTuple):
+    etag: str
+    body: bytes
+    expires_at: float
+
+
+def _serialize(content: Any) -> bytes:
+    body = json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+    )
+    return body.encode("utf-8")
+
+
+def _etag_for(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """(사용자, 요청 키) 단위 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, Hashable], CachedResponse]" = (
+            OrderedDict()
+        )
+        self._keys_by_user: Dict[str, set] = {}
+        # 사용자별 세대 (최근 무효화된 사용자만 보관, 밀려난 값은 _generation_floor 로)
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._generation_clock = 0
+        self._generation_floor = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidations = 0
+        self.stale_skips = 0
+        self.uncacheable = 0
+
+    def get(self, user_id: str, key: Hashable) -> Optional[CachedResponse]:
+        cache_key = (user_id, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None or entry.expires_at <= time.time():
+                if entry is not None:
+                    self._remove(cache_key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry
+
+    def generation(self, user_id: str) -> int:
+        """사용자의 현재 세대 (응답을 만들기 전에 기록해 ``put`` 에 넘긴다)"""
+        with self._lock:
+            return self._generation_of(user_id)
+
+    def _generation_of(self, user_id: str) -> int:
+        return self._generations.get(user_id, self._generation_floor)
+
+    def put(
+        self,
+        user_id: str,
+        key: Hashable,
+        body: bytes,
+        generation: Optional[int] = None,
+    ) -> CachedResponse:
+        """응답을 캐시에 넣음 (``generation`` 이후 무효화되었으면 넣지 않고 반환만)"""
+        entry = CachedResponse(_etag_for(body), body, time.time() + self.ttl)
+        cache_key = (user_id, key)
+        with self._lock:
+            if generation is not None and generation != self._generation_of(user_id):
+                self.stale_skips += 1
+                return entry
+            self._entries[cache_key] = entry
+            self._entries.move_to_end(cache_key)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+        return entry
+
+    def _remove(self, cache_key: Tuple[str, Hashable]) -> None:
+        user_id, key = cache_key
+        self._entries.pop(cache_key, None)
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+    def invalidate(self, *user_ids: str) -> None:
+        """해당 사용자들의 캐시 항목을 모두 제거"""
+        with self._lock:
+            for user_id in user_ids:
+                for key in list(self._keys_by_user.get(user_id, ())):
+                    self._remove((user_id, key))
+                self._generation_clock += 1
+                self._generations[user_id] = self._generation_clock
+                self._generations.move_to_end(user_id)
+            # 밀려난 세대는 floor 로 올려, 그 전에 시작된 응답이 캐시되지 않게 한다
+            while len(self._generations) > self.max_entries:
+                _, generation = self._generations.popitem(last=False)
+                self._generation_floor = max(self._generation_floor, generation)
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "invalidations": self.invalidations,
+                "stale_skips": self.stale_skips,
+                "uncacheable": self.uncacheable,
+            }
+
+    async def respond(
+        self,
+        request: Request,
+        user_id: str,
+        build: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """캐시된 응답(또는 새로 만든 응답)을 ETag와 함께 반환, 일치하면 304
+
+        ``build`` 가 ``Uncacheable`` 을 반환하면 캐시하지 않고 ETag 없이 응답한다.
+        """
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())))
+        entry = self.get(user_id, key)
+        if entry is None:
+            generation = self.generation(user_id)
+            built = await build()
+            if isinstance(built, Uncacheable):
+                with self._lock:
+                    self.uncacheable += 1
+                return Response(
+                    content=_serialize(built.content),
+                    media_type="application/json",
+                    headers={"Cache-Control": "no-store"},
+                )
+            entry = self.put(user_id, key, _serialize(built), generation)
+
+        headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(
+            content=entry.body, media_type="application/json", headers=headers
+        )
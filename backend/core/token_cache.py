@@ -0,0 +1,74 @@
+"""검증된 Firebase ID 토큰 결과를 보관하는 LRU 캐시."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenCache:
+    """토큰 해시를 키로 하는 크기 제한 LRU 캐시.
+
+    각 항목은 토큰 자체의 ``exp`` 클레임 시각에 만료된다.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(id_token: str) -> str:
+        return hashlib.sha256(id_token.encode("utf-8")).hexdigest()
+
+    def get(self, id_token: str) -> Optional[Dict[str, Any]]:
+        key = self._key(id_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, decoded_token = entry
+            if expires_at <= time.time():
+                # 토큰 만료: 항목 제거 후 재검증 유도
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decoded_token
+
+    def put(self, id_token: str, decoded_token: Dict[str, Any]) -> None:
+        expires_at = decoded_token.get("exp")
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return
+
+        key = self._key(id_token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), decoded_token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0,
+            }
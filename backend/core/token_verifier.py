@@ -0,0 +1,251 @@
+"""로컬 Firebase ID 토큰 검증 엔진.
+
+Google 공개 서명 키(x509 인증서)를 메모리에 보관하고, 응답의
+Cache-Control max-age 에 맞춰 백그라운드에서 갱신한다. 요청 처리 중에는
+네트워크 요청 없이 RS256 서명과 ``aud``/``iss`` 등의 클레임만 로컬에서 검증한다.
+갱신이 계속 실패해 키 목록이 max-age 를 넘기면 갱신을 요청하고 토큰을 거부한다
+(회수된 키로 서명한 토큰을 계속 받아들이지 않도록).
+로컬 백엔드처럼 시작 시 키를 기다릴 필요가 없으면 ``start(eager=False)`` 로
+첫 토큰 검증 때 백그라운드에서 가져온다.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+import re
+import time
+import urllib.request
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from google.auth import crypt
+from google.auth import jwt
+
+logger = logging.getLogger(__name__)
+
+FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID", "ecoplay-6fd53")
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+
+# 로컬 키 파일 ({kid: PEM}) 을 지정하면 네트워크 갱신 없이 해당 키만 사용
+TOKEN_SIGNING_KEYS_FILE = os.getenv("TOKEN_SIGNING_KEYS_FILE")
+
+# 허용 시계 오차(초)
+CLOCK_SKEW_SECONDS = 60
+# max-age 만료 전에 미리 갱신할 여유 시간(초)
+REFRESH_MARGIN_SECONDS = 300
+# 갱신 실패 시 재시도 간격(초)
+RETRY_INTERVAL_SECONDS = 30
+DEFAULT_MAX_AGE_SECONDS = 3600
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class TokenVerificationError(ValueError):
+    pass
+
+
+def _parse_max_age(cache_control: Optional[str]) -> int:
+    match = _MAX_AGE_RE.search(cache_control or "")
+    return int(match.group(1)) if match else DEFAULT_MAX_AGE_SECONDS
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def fetch_google_signing_keys(
+    url: str = GOOGLE_CERTS_URL,
+) -> Tuple[Dict[str, str], int]:
+    """Google 공개 인증서와 max-age(초)를 가져온다 (블로킹 호출)"""
+    with urllib.request.urlopen(url, timeout=10) as response:
+        certs = json.loads(response.read().decode("utf-8"))
+        max_age = _parse_max_age(response.headers.get("Cache-Control"))
+    return certs, max_age
+
+
+class SigningKeySet:
+    """kid 별로 미리 파싱한 RS256 검증기를 보관"""
+
+    def __init__(self):
+        self._verifiers: Dict[str, crypt.RSAVerifier] = {}
+        self.expires_at = 0.0
+        self.loaded_at: Optional[float] = None
+
+    def load(self, certs: Mapping[str, str], max_age: Optional[int] = None) -> None:
+        # 새 딕셔너리로 통째로 교체하므로 읽는 쪽에 잠금이 필요 없다
+        self._verifiers = {
+            kid: crypt.RSAVerifier.from_string(pem) for kid, pem in certs.items()
+        }
+        self.loaded_at = time.time()
+        self.expires_at = (
+            self.loaded_at + max_age if max_age is not None else float("inf")
+        )
+
+    def get(self, kid: str) -> Optional[crypt.RSAVerifier]:
+        return self._verifiers.get(kid)
+
+    @property
+    def loaded(self) -> bool:
+        return self.loaded_at is not None
+
+    @property
+    def expired(self) -> bool:
+        """max-age 가 지난 키 목록인지 (로컬 키 파일은 만료 없음)"""
+        return self.loaded and time.time() >= self.expires_at
+
+    def key_ids(self):
+        return list(self._verifiers)
+
+
+class TokenVerifier:
+    """네트워크 없이 Firebase ID 토큰을 검증"""
+
+    def __init__(
+        self,
+        project_id: str = FIREBASE_PROJECT_ID,
+        keys_file: Optional[str] = TOKEN_SIGNING_KEYS_FILE,
+    ):
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.keys_file = keys_file
+        self.key_set = SigningKeySet()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_requested: Optional[asyncio.Event] = None
+        self.refresh_failures = 0
+
+    # ---- 키 관리 ----
+
+    def load_keys(self, certs: Mapping[str, str], max_age: Optional[int] = None):
+        self.key_set.load(certs, max_age)
+        logger.info(f"서명 키 {len(certs)}개 로드 (max_age={max_age})")
+
+    async def refresh_keys(self) -> int:
+        """키를 다시 가져오고, 다음 갱신까지 대기할 시간(초)을 반환"""
+        loop = asyncio.get_running_loop()
+        certs, max_age = await loop.run_in_executor(None, fetch_google_signing_keys)
+        self.load_keys(certs, max_age)
+        return max(max_age - REFRESH_MARGIN_SECONDS, RETRY_INTERVAL_SECONDS)
+
+    async def _refresh_loop(self, delay: Optional[float]) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._refresh_requested.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_requested.clear()
+            # 알 수 없는 kid 토큰이 반복돼도 갱신 요청이 몰리지 않도록 최소 간격 유지
+            elapsed = time.time() - (self.key_set.loaded_at or 0)
+            if elapsed < RETRY_INTERVAL_SECONDS:
+                await asyncio.sleep(RETRY_INTERVAL_SECONDS - elapsed)
+            try:
+                delay = await self.refresh_keys()
+            except Exception as e:
+                self.refresh_failures += 1
+                logger.error(f"서명 키 갱신 실패: {str(e)}")
+                delay = RETRY_INTERVAL_SECONDS
+
+    async def start(self, eager: bool = True) -> None:
+        """초기 키 로드 후 백그라운드 갱신 시작 (앱 시작 시 호출)
+
+        ``eager`` 가 False 면 시작 시 네트워크 요청 없이, 키가 없는 상태에서 첫
+        토큰이 들어올 때 백그라운드 갱신을 요청한다.
+        """
+        if self.keys_file:
+            with open(self.keys_file, encoding="utf-8") as f:
+                self.load_keys(json.load(f))
+            return
+
+        delay = None  # 갱신 요청이 올 때까지 대기
+        if eager:
+            try:
+                delay = await self.refresh_keys()
+            except Exception as e:
+                self.refresh_failures += 1
+                logger.error(f"초기 서명 키 로드 실패: {str(e)}")
+                delay = RETRY_INTERVAL_SECONDS
+
+        self._refresh_requested = asyncio.Event()
+        self._refresh_task = asyncio.create_task(self._refresh_loop(delay))
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def request_refresh(self) -> None:
+        """처음 보는 kid 등으로 키 갱신이 필요할 때 백그라운드 갱신을 앞당김"""
+        if self._refresh_requested is not None:
+            self._refresh_requested.set()
+
+    # ---- 검증 ----
+
+    def verify(self, id_token: str) -> Dict[str, Any]:
+        """서명과 클레임을 검증하고 디코딩된 클레임을 반환"""
+        try:
+            header = jwt.decode_header(id_token)
+            signed_section, signature = id_token.rsplit(".", 1)
+        except Exception as e:
+            raise TokenVerificationError(f"잘못된 토큰 형식: {str(e)}")
+
+        if header.get("alg") != "RS256":
+            raise TokenVerificationError("RS256 서명 토큰이 아닙니다")
+
+        if self.key_set.expired:
+            self.request_refresh()
+            raise TokenVerificationError("서명 키 목록이 만료되었습니다 (갱신 대기 중)")
+
+        kid = header.get("kid")
+        verifier = self.key_set.get(kid) if kid else None
+        if verifier is None:
+            self.request_refresh()
+            raise TokenVerificationError(f"알 수 없는 서명 키: {kid}")
+
+        if not verifier.verify(signed_section.encode("ascii"), _b64decode(signature)):
+            raise TokenVerificationError("토큰 서명 검증 실패")
+
+        claims = jwt.decode(id_token, verify=False)
+        self._verify_claims(claims)
+
+        decoded_token = dict(claims)
+        decoded_token["uid"] = claims["sub"]
+        return decoded_token
+
+    def _verify_claims(self, claims: Mapping[str, Any]) -> None:
+        now = time.time()
+
+        if claims.get("aud") != self.project_id:
+            raise TokenVerificationError(f"잘못된 aud 클레임: {claims.get('aud')}")
+        if claims.get("iss") != self.issuer:
+            raise TokenVerificationError(f"잘못된 iss 클레임: {claims.get('iss')}")
+
+        subject = claims.get("sub")
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise TokenVerificationError("잘못된 sub 클레임")
+
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or exp + CLOCK_SKEW_SECONDS < now:
+            raise TokenVerificationError("만료된 토큰입니다")
+
+        for claim in ("iat", "auth_time"):
+            value = claims.get(claim)
+            if not isinstance(value, (int, float)) or value - CLOCK_SKEW_SECONDS > now:
+                raise TokenVerificationError(f"잘못된 {claim} 클레임")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys_loaded": len(self.key_set.key_ids()),
+            "keys_loaded_at": self.key_set.loaded_at,
+            "keys_expire_at": self.key_set.expires_at
+            if self.key_set.expires_at != float("inf")
+            else None,
+            "keys_expired": self.key_set.expired,
+            "refresh_failures": self.refresh_failures,
+        }
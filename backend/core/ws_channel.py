@@ -0,0 +1,110 @@
+"""WebSocket 연결 하나의 송수신 채널 (백프레셔 포함).
+
+수신 프레임과 송신 메시지를 각각 크기 제한이 있는 큐에 두고 읽기/쓰기 작업을
+따로 돌린다. 처리기가 밀리면 수신 큐가 차서 소켓 읽기가 멈추고(TCP 수준에서
+클라이언트 전송이 느려짐), 클라이언트가 느리게 읽으면 송신 큐가 차서 처리기가
+기다린다. 어느 쪽도 메모리를 무한히 쓰지 않는다.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+# 연결별 수신/송신 큐 크기
+WS_RECEIVE_QUEUE_SIZE = int(os.getenv("WS_RECEIVE_QUEUE_SIZE", "16"))
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+# 송신 큐가 이 시간 이상 비워지지 않으면 클라이언트가 멈춘 것으로 보고 연결 종료(초)
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+
+# 정상 종료 표시
+_CLOSED = object()
+
+
+class WebSocketChannel:
+    def __init__(
+        self,
+        websocket: WebSocket,
+        receive_queue_size: int = WS_RECEIVE_QUEUE_SIZE,
+        send_queue_size: int = WS_SEND_QUEUE_SIZE,
+        send_timeout: float = WS_SEND_TIMEOUT,
+    ):
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self._incoming: asyncio.Queue = asyncio.Queue(receive_queue_size)
+        self._outgoing: asyncio.Queue = asyncio.Queue(send_queue_size)
+        self._writer_task: Optional[asyncio.Task] = None
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """송신 큐에 메시지 추가 (가득 차 있으면 자리가 날 때까지 대기)"""
+        if self._writer_task is not None and self._writer_task.done():
+            # 소켓 쓰기가 이미 실패함 (클라이언트 연결 끊김)
+            raise WebSocketDisconnect()
+        await asyncio.wait_for(
+            self._outgoing.put(jsonable_encoder(message)), self.send_timeout
+        )
+
+    async def _reader(self) -> None:
+        try:
+            while True:
+                text = await self.websocket.receive_text()
+                try:
+                    message = json.loads(text)
+                except ValueError:
+                    message = None
+                await self._incoming.put(message)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await self._incoming.put(_CLOSED)
+
+    async def _writer(self) -> None:
+        while True:
+            message = await self._outgoing.get()
+            if message is _CLOSED:
+                return
+            try:
+                await self.websocket.send_text(
+                    json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+                )
+            except Exception:
+                # 클라이언트가 연결을 끊음, 이후 send() 는 WebSocketDisconnect
+                return
+
+    async def run(
+        self, handle: Callable[[Optional[Dict[str, Any]]], Awaitable[None]]
+    ) -> None:
+        """연결이 끊길 때까지 수신 메시지를 순서대로 ``handle`` 에 전달
+
+        JSON 이 아닌 프레임은 ``None`` 으로 전달한다.
+        """
+        reader = asyncio.create_task(self._reader())
+        writer = self._writer_task = asyncio.create_task(self._writer())
+        try:
+            while True:
+                message = await self._incoming.get()
+                if message is _CLOSED:
+                    break
+                await handle(message)
+            # 남은 응답을 모두 보낸 뒤 종료
+            await self._outgoing.put(_CLOSED)
+            await writer
+        except WebSocketDisconnect:
+            pass
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket 송신 큐가 비워지지 않아 연결을 종료합니다")
+            try:
+                await self.websocket.close(code=1013)
+            except Exception:
+                pass
+        except Exception as e:
+            logger.error(f"WebSocket 처리 중 오류: {str(e)}")
+        finally:
+            reader.cancel()
+            writer.cancel()
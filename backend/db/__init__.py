@@ -1 +1,110 @@
- 
\ No newline at end of file
+import os
+from typing import Optional
+
+from db.base import DOCUMENT_ID, Document, DocumentStore
+from db.batch import (
+    DocumentExistsError,
+    WriteOp,
+    add_op,
+    create_op,
+    delete_op,
+    increment_op,
+    set_op,
+    update_op,
+)
+from db.group_commit import GroupCommitWriter
+from db.repositories import Repositories, build_repositories
+
+# 저장소 백엔드: 'firestore' | 'postgres' | 'sqlite' | 'memory'
+# (sqlite, memory 는 네트워크/인증 정보 없이 로컬 부하 테스트용)
+DB_BACKEND = os.getenv("DB_BACKEND", "firestore")
+
+_store: Optional[DocumentStore] = None
+_repositories: Optional[Repositories] = None
+_group_writer: Optional[GroupCommitWriter] = None
+
+
+def get_store() -> DocumentStore:
+    """프로세스 전역 데이터 저장소 반환 (최초 호출 시 생성)"""
+    global _store
+    if _store is None:
+        if DB_BACKEND == "firestore":
+            from db.firestore import FirestoreStore
+
+            _store = FirestoreStore()
+        elif DB_BACKEND == "postgres":
+            from db.postgres import PostgresStore
+
+            _store = PostgresStore()
+        elif DB_BACKEND == "sqlite":
+            from db.sqlite import SQLiteStore
+
+            _store = SQLiteStore()
+        elif DB_BACKEND == "memory":
+            from db.memory import MemoryStore
+
+            _store = MemoryStore()
+        else:
+            raise ValueError(f"지원하지 않는 DB_BACKEND 입니다: {DB_BACKEND}")
+    return _store
+
+
+def get_repositories() -> Repositories:
+    """전역 저장소 위의 도메인 리포지토리 반환"""
+    global _repositories
+    if _repositories is None:
+        store = get_store()
+        if DB_BACKEND == "postgres":
+            from db.postgres import PostgresRoundRepository
+
+            _repositories = build_repositories(store, PostgresRoundRepository(store))
+        else:
+            _repositories = build_repositories(store)
+    return _repositories
+
+
+def get_group_writer() -> GroupCommitWriter:
+    """라운드 제출 등 동시 쓰기를 묶어 커밋하는 전역 그룹 커밋 writer 반환"""
+    global _group_writer
+    if _group_writer is None:
+        _group_writer = GroupCommitWriter(get_store())
+    return _group_writer
+
+
+async def open_store() -> None:
+    """앱 시작 시 저장소 연결 준비 (연결 풀 생성, 스키마 확인 등)"""
+    await get_store().connect()
+
+
+async def close_store() -> None:
+    global _store, _repositories, _group_writer
+    if _group_writer is not None:
+        await _group_writer.drain()
+        _group_writer = None
+    if _store is not None:
+        await _store.close()
+        _store = None
+    _repositories = None
+
+
+__all__ = [
+    "DB_BACKEND",
+    "DOCUMENT_ID",
+    "Document",
+    "DocumentExistsError",
+    "DocumentStore",
+    "GroupCommitWriter",
+    "Repositories",
+    "WriteOp",
+    "add_op",
+    "create_op",
+    "set_op",
+    "update_op",
+    "delete_op",
+    "increment_op",
+    "get_store",
+    "get_repositories",
+    "get_group_writer",
+    "open_store",
+    "close_store",
+]
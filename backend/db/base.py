@@ -0,0 +1,80 @@
+"""저장소 백엔드 공통 인터페이스.
+
+라우터와 서비스는 이 인터페이스(컬렉션/문서 단위의 비동기 연산)만 사용하며,
+Firestore, PostgreSQL 등 실제 백엔드는 이를 구현한다.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from db.batch import WriteOp
+
+# (필드, 연산자, 값) 형태의 where 조건
+Filter = Tuple[str, str, Any]
+
+# order_by 에서 문서 ID 순 정렬에 사용하는 필드 경로
+DOCUMENT_ID = "__name__"
+
+
+class Document(NamedTuple):
+    id: str
+    data: Dict[str, Any]
+
+
+class DocumentStore(ABC):
+    """컬렉션/문서 단위 비동기 저장소"""
+
+    async def connect(self) -> None:
+        """연결 준비 (필요한 백엔드만 구현)"""
+
+    @abstractmethod
+    async def add(self, collection: str, data: Dict[str, Any]) -> str:
+        """문서를 추가하고 생성된 문서 ID를 반환"""
+
+    @abstractmethod
+    async def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """문서 하나를 조회 (없으면 None)"""
+
+    @abstractmethod
+    async def set(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        merge: bool = False,
+    ) -> None: ...
+
+    @abstractmethod
+    async def update(
+        self, collection: str, doc_id: str, data: Dict[str, Any]
+    ) -> None: ...
+
+    @abstractmethod
+    async def delete(self, collection: str, doc_id: str) -> None: ...
+
+    @abstractmethod
+    async def query(
+        self,
+        collection: str,
+        filters: Sequence[Filter] = (),
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """조건에 맞는 문서 목록을 조회
+
+        ``order_by`` 의 "-필드" 는 내림차순, ``start_after`` 는 이전 페이지 마지막
+        문서 ID, ``select`` 는 가져올 필드 목록.
+        """
+
+    @abstractmethod
+    async def count(self, collection: str, filters: Sequence[Filter] = ()) -> int:
+        """조건에 맞는 문서 수"""
+
+    @abstractmethod
+    async def commit_batch(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        """여러 쓰기 연산을 원자적으로 커밋하고 각 문서 ID를 반환"""
+
+    async def close(self) -> None:
+        """연결/스레드 풀 정리"""
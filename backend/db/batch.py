@@ -0,0 +1,84 @@
+"""원자적 배치 쓰기에 사용하는 쓰기 연산 정의."""
+
+from typing import Any, Dict, NamedTuple, Optional
+
+# Firestore WriteBatch 한 번에 담을 수 있는 최대 연산 수
+MAX_BATCH_OPS = 500
+
+
+class DocumentExistsError(ValueError):
+    """생성 전용(create) 연산의 문서가 이미 있음 (배치 전체가 적용되지 않음)"""
+
+
+class WriteOp(NamedTuple):
+    kind: str  # 'add' | 'create' | 'set' | 'update' | 'delete' | 'increment'
+    collection: str
+    doc_id: Optional[str] = None
+    data: Optional[Dict[str, Any]] = None
+    merge: bool = False
+    increments: Optional[Dict[str, float]] = None
+
+
+def add_op(collection: str, data: Dict[str, Any]) -> WriteOp:
+    """자동 생성 ID로 문서 추가"""
+    return WriteOp("add", collection, None, data)
+
+
+def create_op(collection: str, doc_id: str, data: Dict[str, Any]) -> WriteOp:
+    """문서가 없을 때만 생성 (이미 있으면 ``DocumentExistsError`` 로 배치 실패)"""
+    return WriteOp("create", collection, doc_id, data)
+
+
+def set_op(
+    collection: str, doc_id: str, data: Dict[str, Any], merge: bool = False
+) -> WriteOp:
+    return WriteOp("set", collection, doc_id, data, merge)
+
+
+def update_op(collection: str, doc_id: str, data: Dict[str, Any]) -> WriteOp:
+    return WriteOp("update", collection, doc_id, data)
+
+
+def delete_op(collection: str, doc_id: str) -> WriteOp:
+    return WriteOp("delete", collection, doc_id)
+
+
+def increment_op(
+    collection: str,
+    doc_id: str,
+    increments: Dict[str, float],
+    data: Optional[Dict[str, Any]] = None,
+) -> WriteOp:
+    """숫자 필드를 원자적으로 증가 (문서가 없으면 생성, ``data`` 는 병합 저장)"""
+    return WriteOp("increment", collection, doc_id, data, True, increments)
+
+
+def apply_op(
+    current: Optional[Dict[str, Any]], op: WriteOp
+) -> Optional[Dict[str, Any]]:
+    """기존 문서(없으면 None)에 쓰기 연산을 적용한 결과 (삭제면 None)
+
+    문서를 직접 다루는 로컬 저장소(메모리, SQLite)에서 사용한다.
+    """
+    if op.kind == "create":
+        if current is not None:
+            raise DocumentExistsError(
+                f"문서가 이미 있습니다: {op.collection}/{op.doc_id}"
+            )
+        return dict(op.data)
+    if op.kind in ("add", "set"):
+        if op.merge and current is not None:
+            return {**current, **op.data}
+        return dict(op.data)
+    if op.kind == "update":
+        if current is None:
+            raise ValueError(f"문서를 찾을 수 없습니다: {op.collection}/{op.doc_id}")
+        return {**current, **op.data}
+    if op.kind == "delete":
+        return None
+    if op.kind == "increment":
+        result = {**(current or {}), **(op.data or {})}
+        for field, amount in op.increments.items():
+            result[field] = (result.get(field) or 0) + amount
+        return result
+    raise ValueError(f"지원하지 않는 쓰기 연산입니다: {op.kind}")
@@ -0,0 +1,33 @@
+"""문서를 JSON 으로 저장하는 백엔드(PostgreSQL, SQLite)용 직렬화.
+
+``datetime`` 은 ``{"$date": ISO 문자열}`` 로 저장해 읽을 때 다시 ``datetime``
+으로 되돌린다 (Firestore 의 타임스탬프 필드와 같은 타입을 돌려주기 위함).
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"JSON으로 변환할 수 없는 값입니다: {type(value).__name__}")
+
+
+def _decode_hook(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "$date" in obj:
+        return datetime.fromisoformat(obj["$date"])
+    return obj
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(
+        value, default=_encode_default, ensure_ascii=False, separators=(",", ":")
+    )
+
+
+def loads(raw: str) -> Any:
+    return json.loads(raw, object_hook=_decode_hook)
@@ -0,0 +1,200 @@
+"""Firestore 비동기 데이터 접근 계층.
+
+firebase_admin 이 제공하는 동기 ``firestore.Client`` 호출을 크기가 제한된
+스레드 풀에서 실행하여, 라우터의 ``async def`` 핸들러가 Firestore 왕복을
+기다리는 동안 이벤트 루프를 막지 않도록 한다.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence
+
+from firebase_admin import firestore
+from google.api_core import exceptions as google_exceptions
+
+from core.firebase import get_firestore_client
+from db.base import Document, DocumentStore, Filter
+from db.batch import MAX_BATCH_OPS, DocumentExistsError, WriteOp
+
+logger = logging.getLogger(__name__)
+
+# Firestore 호출에 사용할 최대 스레드 수
+FIRESTORE_MAX_WORKERS = int(os.getenv("FIRESTORE_MAX_WORKERS", "16"))
+
+
+class FirestoreStore(DocumentStore):
+    """스레드 풀 위에서 동작하는 Firestore 문서 저장소"""
+
+    def __init__(self, max_workers: int = FIRESTORE_MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="firestore"
+        )
+        logger.info(f"Firestore 스레드 풀 생성 (max_workers={max_workers})")
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def _build_query(
+        self,
+        collection: str,
+        filters: Sequence[Filter] = (),
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ):
+        collection_ref = get_firestore_client().collection(collection)
+        query = collection_ref
+        for field, op, value in filters:
+            query = query.where(field, op, value)
+        # "-필드" 는 내림차순 정렬
+        for field in order_by:
+            if field.startswith("-"):
+                query = query.order_by(field[1:], direction=firestore.Query.DESCENDING)
+            else:
+                query = query.order_by(field)
+        # 커서: 이전 페이지 마지막 문서 다음부터 조회
+        if start_after is not None:
+            snapshot = collection_ref.document(start_after).get()
+            if not snapshot.exists:
+                raise ValueError(f"커서 문서를 찾을 수 없습니다: {start_after}")
+            query = query.start_after(snapshot)
+        if limit is not None:
+            query = query.limit(limit)
+        # 필요한 필드만 전송받도록 프로젝션
+        if select is not None:
+            query = query.select(list(select))
+        return query
+
+    # ---- 동기 구현 (스레드 풀에서 실행) ----
+
+    def _add_sync(self, collection: str, data: Dict[str, Any]) -> str:
+        _, doc_ref = get_firestore_client().collection(collection).add(data)
+        return doc_ref.id
+
+    def _get_sync(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        doc = get_firestore_client().collection(collection).document(doc_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def _set_sync(
+        self, collection: str, doc_id: str, data: Dict[str, Any], merge: bool
+    ) -> None:
+        get_firestore_client().collection(collection).document(doc_id).set(
+            data, merge=merge
+        )
+
+    def _update_sync(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        get_firestore_client().collection(collection).document(doc_id).update(data)
+
+    def _delete_sync(self, collection: str, doc_id: str) -> None:
+        get_firestore_client().collection(collection).document(doc_id).delete()
+
+    def _query_sync(self, collection: str, **kwargs) -> List[Document]:
+        query = self._build_query(collection, **kwargs)
+        return [Document(doc.id, doc.to_dict()) for doc in query.stream()]
+
+    def _count_sync(self, collection: str, filters: Sequence[Filter]) -> int:
+        query = self._build_query(collection, filters=filters)
+        result = query.count().get()
+        return int(result[0][0].value)
+
+    def _commit_batch_sync(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        client = get_firestore_client()
+        batch = client.batch()
+        doc_ids: List[Optional[str]] = []
+        for op in ops:
+            collection = client.collection(op.collection)
+            if op.kind == "add":
+                doc_ref = collection.document()
+                batch.set(doc_ref, op.data)
+            elif op.kind == "create":
+                doc_ref = collection.document(op.doc_id)
+                batch.create(doc_ref, op.data)
+            elif op.kind == "set":
+                doc_ref = collection.document(op.doc_id)
+                batch.set(doc_ref, op.data, merge=op.merge)
+            elif op.kind == "update":
+                doc_ref = collection.document(op.doc_id)
+                batch.update(doc_ref, op.data)
+            elif op.kind == "delete":
+                doc_ref = collection.document(op.doc_id)
+                batch.delete(doc_ref)
+            elif op.kind == "increment":
+                doc_ref = collection.document(op.doc_id)
+                payload = dict(op.data or {})
+                for field, amount in op.increments.items():
+                    payload[field] = firestore.Increment(amount)
+                batch.set(doc_ref, payload, merge=True)
+            else:
+                raise ValueError(f"지원하지 않는 쓰기 연산입니다: {op.kind}")
+            doc_ids.append(doc_ref.id)
+        try:
+            batch.commit()
+        except google_exceptions.AlreadyExists as e:
+            raise DocumentExistsError(str(e))
+        return doc_ids
+
+    # ---- 비동기 인터페이스 ----
+
+    async def add(self, collection: str, data: Dict[str, Any]) -> str:
+        """문서를 추가하고 생성된 문서 ID를 반환"""
+        return await self._run(self._add_sync, collection, data)
+
+    async def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """문서 하나를 조회 (없으면 None)"""
+        return await self._run(self._get_sync, collection, doc_id)
+
+    async def set(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        merge: bool = False,
+    ) -> None:
+        await self._run(self._set_sync, collection, doc_id, data, merge)
+
+    async def update(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        await self._run(self._update_sync, collection, doc_id, data)
+
+    async def delete(self, collection: str, doc_id: str) -> None:
+        await self._run(self._delete_sync, collection, doc_id)
+
+    async def query(
+        self,
+        collection: str,
+        filters: Sequence[Filter] = (),
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """조건에 맞는 문서 목록을 조회
+
+        ``start_after`` 는 이전 페이지 마지막 문서 ID, ``select`` 는 가져올 필드 목록.
+        """
+        return await self._run(
+            self._query_sync,
+            collection,
+            filters=filters,
+            order_by=order_by,
+            limit=limit,
+            start_after=start_after,
+            select=select,
+        )
+
+    async def count(self, collection: str, filters: Sequence[Filter] = ()) -> int:
+        """조건에 맞는 문서 수 (문서를 읽지 않는 집계 쿼리)"""
+        return await self._run(self._count_sync, collection, filters)
+
+    async def commit_batch(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        """여러 쓰기 연산을 하나의 WriteBatch로 원자적으로 커밋하고 각 문서 ID를 반환"""
+        if len(ops) > MAX_BATCH_OPS:
+            raise ValueError(f"배치 연산은 최대 {MAX_BATCH_OPS}개까지 가능합니다")
+        return await self._run(self._commit_batch_sync, ops)
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,188 @@
+"""동시 요청의 쓰기를 모아 하나의 WriteBatch로 커밋하는 그룹 커밋 writer.
+
+각 요청은 자신의 쓰기 연산 목록을 ``submit`` 으로 넘기고, 짧은 대기 시간
+(window) 동안 모인 다른 요청의 연산과 함께 한 번에 커밋된 뒤에야 반환된다.
+한 요청의 연산은 항상 같은 배치에 들어가므로 요청 단위 원자성이 유지된다.
+
+배치 커밋은 원자적이라 실패하면 아무것도 반영되지 않는다. 여러 요청을 묶은
+배치가 실패하면 요청마다 따로 다시 커밋해, 실제로 실패하는 요청만 실패시킨다
+(생성 전용 문서 충돌, 잘못된 문서 ID 등이 다른 참여자의 저장을 막지 않도록).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from db.batch import MAX_BATCH_OPS, WriteOp
+
+logger = logging.getLogger(__name__)
+
+# 쓰기를 모으는 최대 대기 시간(ms)
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("GROUP_COMMIT_WINDOW_MS", "10"))
+# 한 배치에 담을 최대 연산 수 (Firestore 한도 500)
+GROUP_COMMIT_MAX_OPS = min(int(os.getenv("GROUP_COMMIT_MAX_OPS", "200")), MAX_BATCH_OPS)
+
+# 통계 계산에 사용할 최근 배치 수
+_METRICS_WINDOW = 1024
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+
+class GroupCommitWriter:
+    def __init__(
+        self,
+        store,
+        window_ms: float = GROUP_COMMIT_WINDOW_MS,
+        max_ops: int = GROUP_COMMIT_MAX_OPS,
+    ):
+        self.store = store
+        self.window = window_ms / 1000
+        self.max_ops = max_ops
+        self._pending: List[Tuple[Sequence[WriteOp], asyncio.Future]] = []
+        self._pending_ops = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+        # 메트릭
+        self.batches_committed = 0
+        self.batches_failed = 0
+        self.batches_split = 0
+        self.requests_committed = 0
+        self.requests_failed = 0
+        self.ops_committed = 0
+        self._batch_sizes = deque(maxlen=_METRICS_WINDOW)
+        self._commit_latencies = deque(maxlen=_METRICS_WINDOW)
+
+    async def submit(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        """연산을 다음 배치에 추가하고, 커밋이 끝나면 각 연산의 문서 ID를 반환"""
+        if not ops:
+            return []
+        if len(ops) > MAX_BATCH_OPS:
+            raise ValueError(f"배치 연산은 최대 {MAX_BATCH_OPS}개까지 가능합니다")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        # 이번 요청을 넣으면 한도를 넘는 경우 기존 대기분을 먼저 내보낸다
+        if self._pending_ops + len(ops) > self.max_ops:
+            self._flush_now()
+
+        self._pending.append((ops, future))
+        self._pending_ops += len(ops)
+
+        if self._pending_ops >= self.max_ops or self.window <= 0:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush_now)
+
+        return await future
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        group, self._pending = self._pending, []
+        self._pending_ops = 0
+        task = asyncio.get_running_loop().create_task(self._commit(group))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _commit(
+        self, group: List[Tuple[Sequence[WriteOp], asyncio.Future]]
+    ) -> None:
+        ops = [op for request_ops, _ in group for op in request_ops]
+        started = time.perf_counter()
+        try:
+            doc_ids = await self.store.commit_batch(ops)
+        except Exception as e:
+            self.batches_failed += 1
+            if len(group) == 1:
+                self._fail(group[0][1], e)
+                return
+            # 어느 요청 때문인지 모르므로 요청마다 따로 다시 커밋
+            logger.warning(
+                f"그룹 커밋 실패, 요청별로 다시 커밋 (요청 {len(group)}건): {str(e)}"
+            )
+            self.batches_split += 1
+            await asyncio.gather(
+                *(
+                    self._commit_alone(request_ops, future)
+                    for request_ops, future in group
+                )
+            )
+            return
+
+        self._record(len(group), len(ops), started)
+        offset = 0
+        for request_ops, future in group:
+            if not future.done():
+                future.set_result(doc_ids[offset : offset + len(request_ops)])
+            offset += len(request_ops)
+
+    async def _commit_alone(
+        self, ops: Sequence[WriteOp], future: asyncio.Future
+    ) -> None:
+        started = time.perf_counter()
+        try:
+            doc_ids = await self.store.commit_batch(ops)
+        except Exception as e:
+            self._fail(future, e)
+            return
+        self._record(1, len(ops), started)
+        if not future.done():
+            future.set_result(doc_ids)
+
+    def _fail(self, future: asyncio.Future, error: Exception) -> None:
+        self.requests_failed += 1
+        logger.error(f"그룹 커밋 요청 실패: {str(error)}")
+        if not future.done():
+            future.set_exception(error)
+
+    def _record(self, requests: int, ops: int, started: float) -> None:
+        self._commit_latencies.append(time.perf_counter() - started)
+        self._batch_sizes.append(ops)
+        self.batches_committed += 1
+        self.requests_committed += requests
+        self.ops_committed += ops
+
+    async def drain(self) -> None:
+        """대기 중인 쓰기를 모두 커밋 (종료 시 호출)"""
+        self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        sizes = list(self._batch_sizes)
+        latencies_ms = [latency * 1000 for latency in self._commit_latencies]
+        return {
+            "window_ms": self.window * 1000,
+            "max_ops": self.max_ops,
+            "batches_committed": self.batches_committed,
+            "batches_failed": self.batches_failed,
+            "batches_split": self.batches_split,
+            "requests_committed": self.requests_committed,
+            "requests_failed": self.requests_failed,
+            "ops_committed": self.ops_committed,
+            "pending_requests": len(self._pending),
+            "batch_size": {
+                "mean": sum(sizes) / len(sizes) if sizes else 0,
+                "max": max(sizes) if sizes else 0,
+            },
+            "commit_latency_ms": {
+                "mean": sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0,
+                "p50": _percentile(latencies_ms, 0.5),
+                "p95": _percentile(latencies_ms, 0.95),
+                "max": max(latencies_ms) if latencies_ms else 0,
+            },
+        }
@@ -0,0 +1,187 @@
+"""프로세스 메모리 위의 문서 저장소.
+
+네트워크나 인증 정보 없이 앱 전체를 띄워 부하 테스트할 때 사용한다.
+조건/정렬/커서/프로젝션 의미는 Firestore 와 같게 맞추고, 모든 연산이 이벤트
+루프 안에서 중간 ``await`` 없이 끝나므로 별도 잠금 없이 원자적이다.
+"""
+
+import copy
+import functools
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from db.base import DOCUMENT_ID, Document, DocumentStore, Filter
+from db.batch import MAX_BATCH_OPS, WriteOp, apply_op
+
+_MISSING = object()
+
+
+def _type_rank(value: Any) -> int:
+    # Firestore 의 타입 간 정렬 순서: null < bool < 숫자 < 타임스탬프 < 문자열 < 그 외
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float)):
+        return 2
+    if isinstance(value, datetime):
+        return 3
+    if isinstance(value, str):
+        return 4
+    return 5
+
+
+def _compare(a: Any, b: Any) -> int:
+    rank_a, rank_b = _type_rank(a), _type_rank(b)
+    if rank_a != rank_b:
+        return -1 if rank_a < rank_b else 1
+    if rank_a == 5:
+        a, b = repr(a), repr(b)
+    return (a > b) - (a < b)
+
+
+_MATCHERS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: _type_rank(a) == _type_rank(b) and a < b,
+    "<=": lambda a, b: _type_rank(a) == _type_rank(b) and a <= b,
+    ">": lambda a, b: _type_rank(a) == _type_rank(b) and a > b,
+    ">=": lambda a, b: _type_rank(a) == _type_rank(b) and a >= b,
+    "in": lambda a, b: a in b,
+    "array_contains": lambda a, b: isinstance(a, list) and b in a,
+}
+
+
+def _field(doc_id: str, data: Dict[str, Any], field: str) -> Any:
+    if field == DOCUMENT_ID:
+        return doc_id
+    return data.get(field, _MISSING)
+
+
+class MemoryStore(DocumentStore):
+    """dict 기반 문서 저장소"""
+
+    def __init__(self):
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def _apply(self, op: WriteOp) -> str:
+        docs = self._collections.setdefault(op.collection, {})
+        doc_id = op.doc_id or uuid.uuid4().hex
+        result = apply_op(docs.get(doc_id), op)
+        if result is None:
+            docs.pop(doc_id, None)
+        else:
+            docs[doc_id] = copy.deepcopy(result)
+        return doc_id
+
+    async def add(self, collection: str, data: Dict[str, Any]) -> str:
+        """문서를 추가하고 생성된 문서 ID를 반환"""
+        return self._apply(WriteOp("add", collection, None, data))
+
+    async def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """문서 하나를 조회 (없으면 None)"""
+        data = self._collections.get(collection, {}).get(doc_id)
+        return copy.deepcopy(data) if data is not None else None
+
+    async def set(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        merge: bool = False,
+    ) -> None:
+        self._apply(WriteOp("set", collection, doc_id, data, merge))
+
+    async def update(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        self._apply(WriteOp("update", collection, doc_id, data))
+
+    async def delete(self, collection: str, doc_id: str) -> None:
+        self._apply(WriteOp("delete", collection, doc_id))
+
+    async def commit_batch(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        """여러 쓰기 연산을 원자적으로 적용하고 각 문서 ID를 반환"""
+        if len(ops) > MAX_BATCH_OPS:
+            raise ValueError(f"배치 연산은 최대 {MAX_BATCH_OPS}개까지 가능합니다")
+        # 하나라도 실패하면 이전 상태로 되돌린다
+        backup = {
+            op.collection: dict(self._collections.get(op.collection, {})) for op in ops
+        }
+        try:
+            return [self._apply(op) for op in ops]
+        except Exception:
+            self._collections.update(backup)
+            raise
+
+    def _matching(self, collection: str, filters: Sequence[Filter]) -> List[Document]:
+        matched = []
+        for doc_id, data in self._collections.get(collection, {}).items():
+            for field, op, value in filters:
+                if op not in _MATCHERS:
+                    raise ValueError(f"지원하지 않는 조건 연산자입니다: {op}")
+                actual = _field(doc_id, data, field)
+                if actual is _MISSING or not _MATCHERS[op](actual, value):
+                    break
+            else:
+                matched.append(Document(doc_id, data))
+        return matched
+
+    async def query(
+        self,
+        collection: str,
+        filters: Sequence[Filter] = (),
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """조건에 맞는 문서 목록을 조회
+
+        ``start_after`` 는 이전 페이지 마지막 문서 ID, ``select`` 는 가져올 필드 목록.
+        """
+        docs = self._matching(collection, filters)
+        terms = [(field.lstrip("-"), field.startswith("-")) for field in order_by]
+        if not any(field == DOCUMENT_ID for field, _ in terms):
+            terms.append((DOCUMENT_ID, False))
+        # Firestore 처럼 정렬 필드가 없는 문서는 제외
+        docs = [
+            doc
+            for doc in docs
+            if all(
+                _field(doc.id, doc.data, field) is not _MISSING for field, _ in terms
+            )
+        ]
+
+        def compare(a: Document, b: Document) -> int:
+            for field, descending in terms:
+                result = _compare(
+                    _field(a.id, a.data, field), _field(b.id, b.data, field)
+                )
+                if result:
+                    return -result if descending else result
+            return 0
+
+        docs.sort(key=functools.cmp_to_key(compare))
+
+        if start_after is not None:
+            cursor_data = self._collections.get(collection, {}).get(start_after)
+            if cursor_data is None:
+                raise ValueError(f"커서 문서를 찾을 수 없습니다: {start_after}")
+            cursor = Document(start_after, cursor_data)
+            docs = [doc for doc in docs if compare(doc, cursor) > 0]
+
+        if limit is not None:
+            docs = docs[:limit]
+        if select is not None:
+            return [
+                Document(
+                    doc.id,
+                    copy.deepcopy({k: doc.data[k] for k in select if k in doc.data}),
+                )
+                for doc in docs
+            ]
+        return [Document(doc.id, copy.deepcopy(doc.data)) for doc in docs]
+
+    async def count(self, collection: str, filters: Sequence[Filter] = ()) -> int:
+        """조건에 맞는 문서 수"""
+        return len(self._matching(collection, filters))
@@ -0,0 +1,39 @@
+"""1회성 데이터 마이그레이션.
+
+완료한 마이그레이션은 ``schema_migrations/{name}`` 문서로 표시하고 다시 실행하지
+않는다. 완료 표시 전에 실패하면 다음 시작 때 다시 실행되므로, 마이그레이션은 여러
+번 실행해도 결과가 같아야 한다.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+
+from db.base import DocumentStore
+from db.repositories import Repositories
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+
+
+async def run_once(
+    store: DocumentStore, name: str, migrate: Callable[[], Awaitable[Any]]
+) -> bool:
+    """완료 표시가 없을 때만 실행하고 표시를 남김 (이번에 실행했으면 True)"""
+    if await store.get(MIGRATIONS_COLLECTION, name) is not None:
+        return False
+    result = await migrate()
+    await store.set(
+        MIGRATIONS_COLLECTION,
+        name,
+        {"completed_at": datetime.utcnow(), "result": result},
+    )
+    logger.info(f"마이그레이션 완료: {name} ({result})")
+    return True
+
+
+async def run_migrations(store: DocumentStore, repositories: Repositories) -> None:
+    """앱 시작 시 실행할 마이그레이션 (순서대로)"""
+    # MRN 별 현재 동의서: 동의서 확인은 현재 동의서 문서 한 번 조회만 한다
+    await run_once(store, "current_consents", repositories.consents.backfill_current)
@@ -0,0 +1,55 @@
+"""커서 기반 페이지 조회."""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from db.base import Document, Filter
+
+# 페이지 크기 기본값 / 최대값
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """커서 상태를 클라이언트에 넘길 불투명 문자열로 인코딩"""
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    """``encode_cursor`` 로 만든 커서를 해석 (잘못된 커서면 ValueError)"""
+    if not cursor:
+        return {}
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except Exception:
+        raise ValueError("잘못된 커서입니다")
+    if not isinstance(state, dict):
+        raise ValueError("잘못된 커서입니다")
+    return state
+
+
+async def query_page(
+    store,
+    collection: str,
+    filters: Sequence[Filter] = (),
+    order_by: Sequence[str] = (),
+    limit: int = DEFAULT_PAGE_SIZE,
+    start_after: Optional[str] = None,
+    select: Optional[Sequence[str]] = None,
+) -> Tuple[List[Document], Optional[str]]:
+    """한 페이지를 조회하고 (문서 목록, 다음 페이지 시작 문서 ID) 를 반환"""
+    docs = await store.query(
+        collection,
+        filters=filters,
+        order_by=order_by,
+        limit=limit + 1,
+        start_after=start_after,
+        select=select,
+    )
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, docs[-1].id
+    return docs, None
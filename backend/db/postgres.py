@@ -0,0 +1,412 @@
+"""PostgreSQL(asyncpg) 데이터 접근 계층.
+
+Firestore 와 같은 컬렉션/문서 모델을 ``documents`` 테이블 하나(JSONB)로 저장한다.
+자주 조회하는 ``user_id`` 와 ``round`` 는 생성 컬럼으로 꺼내 (collection, user_id,
+round) 인덱스를 타게 하고, SQL 문은 값 대신 파라미터만 바뀌도록 만들어 asyncpg 의
+연결별 prepared statement 캐시를 재사용한다.
+"""
+
+import asyncio
+import logging
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from db.base import DOCUMENT_ID, Document, DocumentStore, Filter
+from db.batch import MAX_BATCH_OPS, DocumentExistsError, WriteOp
+from db.codec import dumps, loads
+from db.repositories import GAME_COLLECTIONS, RoundRepository
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost/ecoplay")
+POSTGRES_POOL_MIN_SIZE = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2"))
+POSTGRES_POOL_MAX_SIZE = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "20"))
+# 연결별로 보관할 prepared statement 수
+POSTGRES_STATEMENT_CACHE_SIZE = int(os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", "256"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection text NOT NULL,
+    id text NOT NULL,
+    data jsonb NOT NULL,
+    user_id text GENERATED ALWAYS AS (data ->> 'user_id') STORED,
+    round integer GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(data -> 'round') = 'number'
+            THEN (data ->> 'round')::numeric::integer END
+    ) STORED,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS documents_user_round_idx
+    ON documents (collection, user_id, round);
+CREATE INDEX IF NOT EXISTS documents_user_role_round_idx
+    ON documents (collection, user_id, (data -> 'role'), round);
+CREATE INDEX IF NOT EXISTS documents_user_timestamp_idx
+    ON documents (collection, user_id, (data -> 'timestamp'));
+"""
+
+# 생성 컬럼으로 꺼내 둔 필드 (인덱스 사용)
+_COLUMNS = {DOCUMENT_ID: "id", "user_id": "user_id", "round": "round"}
+
+_OPERATORS = {"==": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+_ADD_SQL = "INSERT INTO documents (collection, id, data) VALUES ($1, $2, $3)"
+_CREATE_SQL = """
+INSERT INTO documents (collection, id, data) VALUES ($1, $2, $3)
+ON CONFLICT (collection, id) DO NOTHING
+"""
+_GET_SQL = "SELECT data FROM documents WHERE collection = $1 AND id = $2"
+_SET_SQL = """
+INSERT INTO documents (collection, id, data) VALUES ($1, $2, $3)
+ON CONFLICT (collection, id) DO UPDATE SET data = EXCLUDED.data
+"""
+_MERGE_SQL = """
+INSERT INTO documents (collection, id, data) VALUES ($1, $2, $3)
+ON CONFLICT (collection, id) DO UPDATE SET data = documents.data || EXCLUDED.data
+"""
+_UPDATE_SQL = """
+UPDATE documents SET data = data || $3::jsonb WHERE collection = $1 AND id = $2
+"""
+_DELETE_SQL = "DELETE FROM documents WHERE collection = $1 AND id = $2"
+# $3: 새 문서일 때의 값, $4: 병합할 필드, $5: 증가분
+_INCREMENT_SQL = """
+INSERT INTO documents (collection, id, data) VALUES ($1, $2, $3)
+ON CONFLICT (collection, id) DO UPDATE SET data = documents.data || $4::jsonb || COALESCE(
+    (
+        SELECT jsonb_object_agg(
+            inc.key,
+            COALESCE((documents.data ->> inc.key)::float8, 0) + inc.value::text::float8
+        )
+        FROM jsonb_each($5::jsonb) AS inc
+    ),
+    '{}'::jsonb
+)
+"""
+
+
+def _quote(field: str) -> str:
+    return "'" + field.replace("'", "''") + "'"
+
+
+def _field_expr(field: str) -> str:
+    return _COLUMNS.get(field) or f"(data -> {_quote(field)})"
+
+
+def _column_param(field: str, value: Any) -> bool:
+    """생성 컬럼과 직접 비교할 수 있는 값인지"""
+    if field == "round":
+        return isinstance(value, int) and not isinstance(value, bool)
+    return field in _COLUMNS and isinstance(value, str)
+
+
+class _QueryBuilder:
+    """WHERE 절과 파라미터 목록을 함께 쌓는 도우미"""
+
+    def __init__(self, collection: str):
+        self.params: List[Any] = [collection]
+        self.conditions = ["collection = $1"]
+
+    def param(self, value: Any, cast: str = "") -> str:
+        self.params.append(value)
+        return f"${len(self.params)}{cast}"
+
+    def add_filter(self, field: str, op: str, value: Any) -> None:
+        if op == "in":
+            values = list(value)
+            if field in _COLUMNS and all(_column_param(field, v) for v in values):
+                cast = "::integer[]" if field == "round" else "::text[]"
+                self.conditions.append(
+                    f"{_COLUMNS[field]} = ANY({self.param(values, cast)})"
+                )
+            else:
+                self.conditions.append(
+                    f"{_field_expr(field)} = ANY({self.param(values, '::jsonb[]')})"
+                )
+            return
+        if op not in _OPERATORS:
+            raise ValueError(f"지원하지 않는 조건 연산자입니다: {op}")
+        if _column_param(field, value):
+            placeholder = self.param(value)
+            self.conditions.append(f"{_COLUMNS[field]} {_OPERATORS[op]} {placeholder}")
+        else:
+            placeholder = self.param(value, "::jsonb")
+            self.conditions.append(
+                f"(data -> {_quote(field)}) {_OPERATORS[op]} {placeholder}"
+            )
+
+    @property
+    def where(self) -> str:
+        return " AND ".join(self.conditions)
+
+
+def _order_terms(order_by: Sequence[str]) -> List[Tuple[str, bool]]:
+    """(SQL 식, 내림차순 여부) 목록 (문서 ID 를 마지막 정렬 기준으로 보장)"""
+    terms = []
+    for field in order_by:
+        descending = field.startswith("-")
+        terms.append((_field_expr(field.lstrip("-")), descending))
+    if not any(expr == "id" for expr, _ in terms):
+        terms.append(("id", False))
+    return terms
+
+
+class PostgresStore(DocumentStore):
+    """asyncpg 연결 풀 위에서 동작하는 문서 저장소"""
+
+    def __init__(
+        self,
+        dsn: str = DATABASE_URL,
+        min_size: int = POSTGRES_POOL_MIN_SIZE,
+        max_size: int = POSTGRES_POOL_MAX_SIZE,
+    ):
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    @staticmethod
+    async def _init_connection(conn) -> None:
+        # JSONB 값은 dict/list 로 주고받는다 (datetime 은 {"$date": ...} 로 보존)
+        await conn.set_type_codec(
+            "jsonb", encoder=dumps, decoder=loads, schema="pg_catalog"
+        )
+
+    async def pool(self):
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    import asyncpg
+
+                    pool = await asyncpg.create_pool(
+                        self.dsn,
+                        min_size=self.min_size,
+                        max_size=self.max_size,
+                        statement_cache_size=POSTGRES_STATEMENT_CACHE_SIZE,
+                        init=self._init_connection,
+                    )
+                    async with pool.acquire() as conn:
+                        await conn.execute(SCHEMA)
+                    self._pool = pool
+                    logger.info(
+                        f"PostgreSQL 연결 풀 생성 (min={self.min_size}, max={self.max_size})"
+                    )
+        return self._pool
+
+    async def connect(self) -> None:
+        await self.pool()
+
+    async def fetch(self, sql: str, *args) -> list:
+        """임의 SQL 조회 (리포지토리의 집계 쿼리용)"""
+        return await (await self.pool()).fetch(sql, *args)
+
+    async def fetchrow(self, sql: str, *args):
+        return await (await self.pool()).fetchrow(sql, *args)
+
+    # ---- 쓰기 ----
+
+    @staticmethod
+    async def _apply(conn, op: WriteOp) -> str:
+        if op.kind == "add":
+            doc_id = uuid.uuid4().hex
+            await conn.execute(_ADD_SQL, op.collection, doc_id, op.data)
+            return doc_id
+        if op.kind == "create":
+            status = await conn.execute(_CREATE_SQL, op.collection, op.doc_id, op.data)
+            if status.endswith(" 0"):
+                raise DocumentExistsError(
+                    f"문서가 이미 있습니다: {op.collection}/{op.doc_id}"
+                )
+        elif op.kind == "set":
+            sql = _MERGE_SQL if op.merge else _SET_SQL
+            await conn.execute(sql, op.collection, op.doc_id, op.data)
+        elif op.kind == "update":
+            status = await conn.execute(_UPDATE_SQL, op.collection, op.doc_id, op.data)
+            if status.endswith(" 0"):
+                raise ValueError(
+                    f"문서를 찾을 수 없습니다: {op.collection}/{op.doc_id}"
+                )
+        elif op.kind == "delete":
+            await conn.execute(_DELETE_SQL, op.collection, op.doc_id)
+        elif op.kind == "increment":
+            fields = dict(op.data or {})
+            await conn.execute(
+                _INCREMENT_SQL,
+                op.collection,
+                op.doc_id,
+                {**fields, **op.increments},
+                fields,
+                op.increments,
+            )
+        else:
+            raise ValueError(f"지원하지 않는 쓰기 연산입니다: {op.kind}")
+        return op.doc_id
+
+    async def _execute(self, op: WriteOp) -> str:
+        async with (await self.pool()).acquire() as conn:
+            return await self._apply(conn, op)
+
+    async def add(self, collection: str, data: Dict[str, Any]) -> str:
+        """문서를 추가하고 생성된 문서 ID를 반환"""
+        return await self._execute(WriteOp("add", collection, None, data))
+
+    async def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """문서 하나를 조회 (없으면 None)"""
+        return await (await self.pool()).fetchval(_GET_SQL, collection, doc_id)
+
+    async def set(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        merge: bool = False,
+    ) -> None:
+        await self._execute(WriteOp("set", collection, doc_id, data, merge))
+
+    async def update(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        await self._execute(WriteOp("update", collection, doc_id, data))
+
+    async def delete(self, collection: str, doc_id: str) -> None:
+        await self._execute(WriteOp("delete", collection, doc_id))
+
+    async def commit_batch(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        """여러 쓰기 연산을 하나의 트랜잭션으로 커밋하고 각 문서 ID를 반환"""
+        if len(ops) > MAX_BATCH_OPS:
+            raise ValueError(f"배치 연산은 최대 {MAX_BATCH_OPS}개까지 가능합니다")
+        async with (await self.pool()).acquire() as conn:
+            async with conn.transaction():
+                return [await self._apply(conn, op) for op in ops]
+
+    # ---- 조회 ----
+
+    async def query(
+        self,
+        collection: str,
+        filters: Sequence[Filter] = (),
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """조건에 맞는 문서 목록을 조회
+
+        ``start_after`` 는 이전 페이지 마지막 문서 ID, ``select`` 는 가져올 필드 목록.
+        """
+        builder = _QueryBuilder(collection)
+        for field, op, value in filters:
+            builder.add_filter(field, op, value)
+        terms = _order_terms(order_by)
+        # Firestore 처럼 정렬 필드가 없는 문서는 제외
+        for expr, _ in terms:
+            if expr != "id":
+                builder.conditions.append(f"{expr} IS NOT NULL")
+
+        pool = await self.pool()
+        if start_after is not None:
+            exprs = ", ".join(expr for expr, _ in terms)
+            cursor_row = await pool.fetchrow(
+                f"SELECT {exprs} FROM documents WHERE collection = $1 AND id = $2",
+                collection,
+                start_after,
+            )
+            if cursor_row is None:
+                raise ValueError(f"커서 문서를 찾을 수 없습니다: {start_after}")
+            # (a, b, id) > (x, y, z) 를 정렬 방향별로 풀어 쓴 조건
+            cursor_values = [
+                builder.param(value, "::jsonb" if expr.startswith("(data") else "")
+                for (expr, _), value in zip(terms, cursor_row)
+            ]
+            alternatives = []
+            for i, (expr, descending) in enumerate(terms):
+                parts = [f"{terms[j][0]} = {cursor_values[j]}" for j in range(i)] + [
+                    f"{expr} {'<' if descending else '>'} {cursor_values[i]}"
+                ]
+                alternatives.append("(" + " AND ".join(parts) + ")")
+            builder.conditions.append("(" + " OR ".join(alternatives) + ")")
+
+        if select is not None:
+            projection = (
+                "(SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb)"
+                f" FROM jsonb_each(data) WHERE key = ANY({builder.param(list(select), '::text[]')}))"
+            )
+        else:
+            projection = "data"
+        order_sql = ", ".join(
+            f"{expr} DESC" if descending else expr for expr, descending in terms
+        )
+        sql = f"SELECT id, {projection} AS data FROM documents WHERE {builder.where} ORDER BY {order_sql}"
+        if limit is not None:
+            sql += f" LIMIT {builder.param(limit)}"
+
+        rows = await pool.fetch(sql, *builder.params)
+        return [Document(row["id"], row["data"]) for row in rows]
+
+    async def count(self, collection: str, filters: Sequence[Filter] = ()) -> int:
+        """조건에 맞는 문서 수"""
+        builder = _QueryBuilder(collection)
+        for field, op, value in filters:
+            builder.add_filter(field, op, value)
+        return await (await self.pool()).fetchval(
+            f"SELECT count(*) FROM documents WHERE {builder.where}", *builder.params
+        )
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+# ---- 리포트 요약: 요약 문서 대신 (collection, user_id) 인덱스 위의 SQL 집계 ----
+
+_PUBLIC_GOODS_SUMMARY_SQL = """
+SELECT
+    count(*) AS pg_rounds,
+    COALESCE(sum((data ->> 'human_contribution')::float8), 0) AS pg_total_contribution,
+    COALESCE(sum((data ->> 'human_payoff')::float8), 0) AS pg_total_payoff
+FROM documents
+WHERE collection = $1 AND user_id = $2
+"""
+
+_TRUST_GAME_SUMMARY_SQL = """
+WITH rounds AS (
+    SELECT
+        data ->> 'role' AS role,
+        COALESCE((data ->> 'decision')::float8, 0) AS decision,
+        COALESCE((data ->> 'received_amount')::float8, 0) AS received
+    FROM documents
+    WHERE collection = $1 AND user_id = $2
+)
+SELECT
+    count(*) AS tg_rounds,
+    count(*) FILTER (WHERE role = 'trustor') AS tg_trustor_rounds,
+    COALESCE(sum(decision) FILTER (WHERE role = 'trustor'), 0) AS tg_total_investment,
+    count(*) FILTER (WHERE role = 'trustee') AS tg_trustee_rounds,
+    COALESCE(sum(received) FILTER (WHERE role = 'trustee'), 0) AS tg_total_received,
+    COALESCE(sum(decision) FILTER (WHERE role = 'trustee'), 0) AS tg_total_returned,
+    COALESCE(
+        sum(CASE WHEN received > 0 THEN decision / received ELSE 0 END)
+            FILTER (WHERE role = 'trustee'),
+        0
+    ) AS tg_return_rate_sum
+FROM rounds
+"""
+
+
+class PostgresRoundRepository(RoundRepository):
+    """리포트 요약을 SQL 집계 한 번으로 계산하는 라운드 리포지토리"""
+
+    store: PostgresStore
+
+    async def summary_fields(self, game: str, user_id: str) -> Dict[str, Any]:
+        if game == "public_goods":
+            sql, seeded = _PUBLIC_GOODS_SUMMARY_SQL, "pg_seeded"
+        else:
+            sql, seeded = _TRUST_GAME_SUMMARY_SQL, "tg_seeded"
+        row = await self.store.fetchrow(sql, GAME_COLLECTIONS[game], user_id)
+        return {**dict(row), seeded: True}
+
+    async def seed_summary_fields(
+        self, game: str, user_id: str, increments: Dict[str, float], flag: str
+    ) -> bool:
+        # 집계는 매번 SQL로 계산하므로 채울 필요가 없다
+        return False
@@ -0,0 +1,390 @@
+"""도메인별 리포지토리.
+
+라우터는 컬렉션 이름과 쿼리 형태를 직접 다루지 않고 이 리포지토리를 통해
+라운드, 매칭, 메시지, 동의서, 피드백을 읽고 쓴다. 기본 구현은 어떤
+``DocumentStore`` 위에서도 동작하고, 백엔드가 더 잘할 수 있는 연산(예:
+PostgreSQL 의 SQL 집계)만 하위 클래스에서 바꾼다.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from db.base import DocumentStore, Document, Filter
+from db.batch import (
+    DocumentExistsError,
+    WriteOp,
+    add_op,
+    create_op,
+    delete_op,
+    increment_op,
+    set_op,
+    update_op,
+)
+from db.pagination import DEFAULT_PAGE_SIZE, query_page
+
+PUBLIC_GOODS_COLLECTION = "public_goods_game"
+TRUST_GAME_COLLECTION = "trust_game"
+# 게임 이름 -> 라운드 컬렉션
+GAME_COLLECTIONS = {
+    "public_goods": PUBLIC_GOODS_COLLECTION,
+    "trust_game": TRUST_GAME_COLLECTION,
+}
+# MRN 별 리포트 요약 (라운드 제출 시 증가). 이전 ``report_summaries`` 문서는
+# UID 로 증가된 값이 섞여 있어 읽지 않는다.
+SUMMARY_COLLECTION = "report_aggregates"
+# 집계 도입 이전 라운드를 요약에 반영했는지 표시 (문서 ID = "{game}:{MRN}")
+SUMMARY_SEEDS_COLLECTION = "report_aggregate_seeds"
+MATCHES_COLLECTION = "game_matches"
+# 사용자별 가장 최근 매칭 (문서 ID = UID, match_id 와 매칭된 성격만)
+CURRENT_MATCHES_COLLECTION = "current_matches"
+MESSAGES_COLLECTION = "llm_messages"
+CONSENTS_COLLECTION = "basic_info"
+# Medical Record Number 별 현재 동의서 (문서 ID = MRN)
+CURRENT_CONSENTS_COLLECTION = "current_consents"
+FEEDBACK_COLLECTION = "message_feedback"
+FEEDBACK_COUNTERS_COLLECTION = "message_feedback_counters"
+SESSIONS_COLLECTION = "game_sessions"
+
+
+class RoundRepository:
+    """게임 라운드 기록 (game: 'public_goods' | 'trust_game')"""
+
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    @staticmethod
+    def _filters(user_id: str, role: Optional[str] = None) -> List[Filter]:
+        filters = [("user_id", "==", user_id)]
+        if role:
+            filters.append(("role", "==", role))
+        return filters
+
+    def add_op(self, game: str, data: Dict[str, Any]) -> WriteOp:
+        """라운드 문서 추가 연산 (다른 쓰기와 같은 배치로 커밋)"""
+        return add_op(GAME_COLLECTIONS[game], data)
+
+    async def list_for_user(
+        self,
+        game: str,
+        user_id: str,
+        role: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """사용자의 라운드 전체 (라운드 순)"""
+        return await self.store.query(
+            GAME_COLLECTIONS[game],
+            filters=self._filters(user_id, role),
+            order_by=["round"],
+            select=select,
+        )
+
+    async def page_for_user(
+        self,
+        game: str,
+        user_id: str,
+        role: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        start_after: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        """사용자의 라운드 한 페이지 (라운드 순)"""
+        return await query_page(
+            self.store,
+            GAME_COLLECTIONS[game],
+            filters=self._filters(user_id, role),
+            order_by=["round"],
+            limit=limit,
+            start_after=start_after,
+            select=select,
+        )
+
+    async def summary_fields(self, game: str, user_id: str) -> Dict[str, Any]:
+        """리포트 요약 필드 (``report_aggregates`` 문서, 없으면 빈 dict)"""
+        return await self.store.get(SUMMARY_COLLECTION, user_id) or {}
+
+    async def seed_summary_fields(
+        self, game: str, user_id: str, increments: Dict[str, float], flag: str
+    ) -> bool:
+        """집계 도입 이전 라운드의 합계를 요약 문서에 한 번만 더함
+
+        시드 표시 문서를 생성 전용(create)으로 같은 배치에 넣으므로 여러 요청이
+        동시에 시도해도 한 번만 반영되고, 합계는 증가 연산이라 동시에 제출된
+        라운드의 증가분을 덮어쓰지 않는다. 이번 호출이 반영했으면 True.
+        """
+        try:
+            await self.store.commit_batch(
+                [
+                    create_op(
+                        SUMMARY_SEEDS_COLLECTION,
+                        f"{game}:{user_id}",
+                        {"game": game, "user_id": user_id},
+                    ),
+                    increment_op(SUMMARY_COLLECTION, user_id, increments, {flag: True}),
+                ]
+            )
+        except DocumentExistsError:
+            return False
+        return True
+
+
+class MatchRepository:
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    async def add(self, data: Dict[str, Any]) -> str:
+        """매칭 기록을 저장하고 사용자의 현재 매칭으로 설정 (한 배치)"""
+        match_id = uuid.uuid4().hex
+        await self.store.commit_batch(
+            [
+                set_op(MATCHES_COLLECTION, match_id, data),
+                set_op(
+                    CURRENT_MATCHES_COLLECTION,
+                    data["user_id"],
+                    {
+                        "match_id": match_id,
+                        "user_id": data["user_id"],
+                        "matched_personality": data.get("matched_personality"),
+                        "timestamp": data.get("timestamp"),
+                    },
+                ),
+            ]
+        )
+        return match_id
+
+    async def get(self, match_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get(MATCHES_COLLECTION, match_id)
+
+    async def current(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """사용자의 가장 최근 매칭 (UID 로 한 번 조회, 없으면 None)"""
+        return await self.store.get(CURRENT_MATCHES_COLLECTION, user_id)
+
+    async def list_for_user(self, user_id: str) -> List[Document]:
+        return await self.store.query(
+            MATCHES_COLLECTION, filters=[("user_id", "==", user_id)]
+        )
+
+
+class MessageRepository:
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    async def add(self, data: Dict[str, Any]) -> str:
+        return await self.store.add(MESSAGES_COLLECTION, data)
+
+    async def get(self, message_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get(MESSAGES_COLLECTION, message_id)
+
+    def save_op(self, message_id: str, data: Dict[str, Any]) -> WriteOp:
+        return set_op(MESSAGES_COLLECTION, message_id, data)
+
+    async def list_for_user(
+        self, user_id: str, game_type: Optional[str] = None
+    ) -> List[Document]:
+        """사용자의 메시지 (시간 순)"""
+        filters = [("user_id", "==", user_id)]
+        if game_type:
+            filters.append(("game_type", "==", game_type))
+        return await self.store.query(
+            MESSAGES_COLLECTION, filters=filters, order_by=["timestamp"]
+        )
+
+    async def page_for_user(
+        self,
+        user_id: str,
+        game_type: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        start_after: Optional[str] = None,
+    ) -> Tuple[List[Document], Optional[str]]:
+        """사용자의 메시지 한 페이지 (시간 순, ``since`` 보다 나중 것만)"""
+        filters = [("user_id", "==", user_id)]
+        if game_type:
+            filters.append(("game_type", "==", game_type))
+        if since:
+            filters.append(("timestamp", ">", since))
+        return await query_page(
+            self.store,
+            MESSAGES_COLLECTION,
+            filters=filters,
+            order_by=["timestamp"],
+            limit=limit,
+            start_after=start_after,
+        )
+
+
+def _created_at_key(doc: Document) -> float:
+    created_at = doc.data.get("created_at")
+    if not isinstance(created_at, datetime):
+        return float("-inf")
+    if created_at.tzinfo is None:
+        # 저장 시 utcnow() 를 쓰므로 시간대 없는 값은 UTC
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.timestamp()
+
+
+class ConsentRepository:
+    """동의서 기록(``basic_info``, 전체 이력)과 MRN 별 현재 동의서(``current_consents``)"""
+
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    def add_op(self, data: Dict[str, Any]) -> WriteOp:
+        return add_op(CONSENTS_COLLECTION, data)
+
+    @staticmethod
+    def new_document_id() -> str:
+        # 현재 동의서 문서에서 참조하도록 배치 전에 ID를 정함
+        return uuid.uuid4().hex
+
+    def record_op(self, document_id: str, data: Dict[str, Any]) -> WriteOp:
+        return set_op(CONSENTS_COLLECTION, document_id, data)
+
+    def update_record_op(self, document_id: str, data: Dict[str, Any]) -> WriteOp:
+        return update_op(CONSENTS_COLLECTION, document_id, data)
+
+    def delete_record_op(self, document_id: str) -> WriteOp:
+        return delete_op(CONSENTS_COLLECTION, document_id)
+
+    async def current(self, medical_record_number: str) -> Optional[Dict[str, Any]]:
+        """현재 동의서 (MRN 으로 한 번 조회)"""
+        return await self.store.get(CURRENT_CONSENTS_COLLECTION, medical_record_number)
+
+    def current_op(self, document_id: str, data: Dict[str, Any]) -> WriteOp:
+        """동의서 기록 ``document_id`` 를 해당 MRN 의 현재 동의서로 설정하는 연산"""
+        current = {
+            "user_id": data.get("user_id"),
+            "document_id": document_id,
+            "consent_given": data.get("consent_given", False),
+            "consent_details": data.get("consent_details", {}),
+            "consent_timestamp": data.get("consent_timestamp"),
+            "firebase_uid": data.get("firebase_uid"),
+            "updated_at": data.get("updated_at") or data.get("created_at"),
+        }
+        return set_op(CURRENT_CONSENTS_COLLECTION, data["user_id"], current)
+
+    def clear_current_op(self, medical_record_number: str) -> WriteOp:
+        return delete_op(CURRENT_CONSENTS_COLLECTION, medical_record_number)
+
+    async def backfill_current(self) -> int:
+        """이력 전체로 현재 동의서가 없는 MRN 의 현재 동의서를 만듦 (도입 이전 기록용)
+
+        생성 전용(create)으로 쓰므로 그 사이 제출/수정으로 이미 만들어진 현재
+        동의서는 덮어쓰지 않는다. 새로 만든 수를 반환한다.
+        """
+        latest: Dict[str, Document] = {}
+        for doc in await self.store.query(CONSENTS_COLLECTION):
+            medical_record_number = doc.data.get("user_id")
+            if not medical_record_number:
+                continue
+            known = latest.get(medical_record_number)
+            if known is None or _created_at_key(doc) > _created_at_key(known):
+                latest[medical_record_number] = doc
+
+        ops = []
+        for doc in latest.values():
+            current = self.current_op(doc.id, doc.data)
+            ops.append(create_op(current.collection, current.doc_id, current.data))
+
+        created = 0
+        # WriteBatch 한도에 맞춰 나누고, 이미 있는 문서가 섞인 묶음은 하나씩 커밋
+        for start in range(0, len(ops), 400):
+            chunk = ops[start : start + 400]
+            try:
+                await self.store.commit_batch(chunk)
+                created += len(chunk)
+            except DocumentExistsError:
+                for op in chunk:
+                    try:
+                        await self.store.commit_batch([op])
+                        created += 1
+                    except DocumentExistsError:
+                        pass
+        return created
+
+    async def latest_for_medical_record_number(
+        self, medical_record_number: str, exclude: Optional[str] = None
+    ) -> Optional[Document]:
+        """이력에서 가장 최근(``created_at``) 동의서 (현재 동의서 삭제 시 교체용)"""
+        docs = [
+            doc
+            for doc in await self.list_for_medical_record_number(medical_record_number)
+            if doc.id != exclude
+        ]
+        return max(docs, key=_created_at_key, default=None)
+
+    async def list_for_medical_record_number(
+        self, medical_record_number: str
+    ) -> List[Document]:
+        return await self.store.query(
+            CONSENTS_COLLECTION, filters=[("user_id", "==", medical_record_number)]
+        )
+
+    async def list_for_firebase_uid(self, firebase_uid: str) -> List[Document]:
+        return await self.store.query(
+            CONSENTS_COLLECTION, filters=[("firebase_uid", "==", firebase_uid)]
+        )
+
+    async def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get(CONSENTS_COLLECTION, document_id)
+
+    async def update(self, document_id: str, data: Dict[str, Any]) -> None:
+        await self.store.update(CONSENTS_COLLECTION, document_id, data)
+
+    async def delete(self, document_id: str) -> None:
+        await self.store.delete(CONSENTS_COLLECTION, document_id)
+
+
+class FeedbackRepository:
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    async def add(self, data: Dict[str, Any]) -> str:
+        return await self.store.add(FEEDBACK_COLLECTION, data)
+
+    def add_op(self, data: Dict[str, Any]) -> WriteOp:
+        return add_op(FEEDBACK_COLLECTION, data)
+
+    async def counter_shards(
+        self, scope: str, key: Optional[str] = None
+    ) -> List[Document]:
+        """피드백 카운터 샤드 (scope: 'message' | 'template', ``key`` 가 없으면 전체)"""
+        filters = [("scope", "==", scope)]
+        if key is not None:
+            filters.append(("key", "==", key))
+        return await self.store.query(FEEDBACK_COUNTERS_COLLECTION, filters=filters)
+
+
+class SessionRepository:
+    """게임 세션 스냅샷 (``game_sessions/{session_id}``)"""
+
+    def __init__(self, store: DocumentStore):
+        self.store = store
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return await self.store.get(SESSIONS_COLLECTION, session_id)
+
+    def save_op(self, session_id: str, data: Dict[str, Any]) -> WriteOp:
+        return set_op(SESSIONS_COLLECTION, session_id, data)
+
+
+class Repositories(NamedTuple):
+    rounds: RoundRepository
+    matches: MatchRepository
+    messages: MessageRepository
+    consents: ConsentRepository
+    feedback: FeedbackRepository
+    sessions: SessionRepository
+
+
+def build_repositories(
+    store: DocumentStore, rounds: Optional[RoundRepository] = None
+) -> Repositories:
+    return Repositories(
+        rounds=rounds or RoundRepository(store),
+        matches=MatchRepository(store),
+        messages=MessageRepository(store),
+        consents=ConsentRepository(store),
+        feedback=FeedbackRepository(store),
+        sessions=SessionRepository(store),
+    )
@@ -0,0 +1,284 @@
+"""SQLite 파일 위의 문서 저장소.
+
+네트워크나 인증 정보 없이 앱 전체를 띄워 부하 테스트할 때 사용한다. 문서는
+``documents`` 테이블에 JSON 텍스트로 저장하고, ``user_id`` 와 ``round`` 는 생성
+컬럼으로 꺼내 (collection, user_id, round) 인덱스를 탄다. sqlite3 호출은 전용
+스레드 하나에서 순서대로 실행되어 이벤트 루프를 막지 않는다.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from db.base import DOCUMENT_ID, Document, DocumentStore, Filter
+from db.batch import MAX_BATCH_OPS, WriteOp, apply_op
+from db.codec import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PATH = os.getenv("SQLITE_PATH", "ecoplay.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    user_id TEXT GENERATED ALWAYS AS (json_extract(data, '$.user_id')) VIRTUAL,
+    round INTEGER GENERATED ALWAYS AS (json_extract(data, '$.round')) VIRTUAL,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS documents_user_round_idx
+    ON documents (collection, user_id, round);
+"""
+
+# 생성 컬럼으로 꺼내 둔 필드 (인덱스 사용)
+_COLUMNS = {DOCUMENT_ID: "id", "user_id": "user_id", "round": "round"}
+
+_OPERATORS = {"==": "=", "!=": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+def _sql_value(value: Any) -> Any:
+    """json_extract 결과와 비교할 수 있는 SQLite 값으로 변환"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (datetime, dict, list, tuple)):
+        return dumps(value)
+    return value
+
+
+def _field_expr(field: str, value: Any = None) -> str:
+    if field in _COLUMNS and (
+        field == DOCUMENT_ID
+        or (field == "user_id" and isinstance(value, (str, type(None))))
+        or (field == "round" and not isinstance(value, (str, bool)))
+    ):
+        return _COLUMNS[field]
+    return "json_extract(data, '$.\"" + field.replace("'", "''") + "\"')"
+
+
+class SQLiteStore(DocumentStore):
+    """sqlite3 전용 스레드 위에서 동작하는 문서 저장소"""
+
+    def __init__(self, path: str = SQLITE_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        # sqlite3 연결은 한 스레드에서만 순서대로 사용
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            logger.info(f"SQLite 저장소 열기: {self.path}")
+        return self._conn
+
+    # ---- 동기 구현 (전용 스레드에서 실행) ----
+
+    def _apply_sync(self, conn: sqlite3.Connection, op: WriteOp) -> str:
+        doc_id = op.doc_id or uuid.uuid4().hex
+        current = None
+        if op.kind != "add":
+            row = conn.execute(
+                "SELECT data FROM documents WHERE collection = ? AND id = ?",
+                (op.collection, doc_id),
+            ).fetchone()
+            current = loads(row[0]) if row else None
+        result = apply_op(current, op)
+        if result is None:
+            conn.execute(
+                "DELETE FROM documents WHERE collection = ? AND id = ?",
+                (op.collection, doc_id),
+            )
+        else:
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (collection, id, data) VALUES (?, ?, ?)",
+                (op.collection, doc_id, dumps(result)),
+            )
+        return doc_id
+
+    def _commit_sync(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        conn = self._connection()
+        # with 블록: 모두 성공하면 커밋, 예외가 나면 롤백
+        with conn:
+            return [self._apply_sync(conn, op) for op in ops]
+
+    def _get_sync(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT data FROM documents WHERE collection = ? AND id = ?",
+                (collection, doc_id),
+            )
+            .fetchone()
+        )
+        return loads(row[0]) if row else None
+
+    @staticmethod
+    def _where(
+        collection: str, filters: Sequence[Filter]
+    ) -> Tuple[List[str], List[Any]]:
+        conditions, params = ["collection = ?"], [collection]
+        for field, op, value in filters:
+            if op == "in":
+                values = list(value)
+                expr = _field_expr(field, values[0] if values else None)
+                placeholders = ", ".join("?" for _ in values) or "NULL"
+                conditions.append(f"{expr} IN ({placeholders})")
+                params.extend(_sql_value(v) for v in values)
+            elif op in _OPERATORS:
+                conditions.append(f"{_field_expr(field, value)} {_OPERATORS[op]} ?")
+                params.append(_sql_value(value))
+            else:
+                raise ValueError(f"지원하지 않는 조건 연산자입니다: {op}")
+        return conditions, params
+
+    def _query_sync(
+        self,
+        collection: str,
+        filters: Sequence[Filter],
+        order_by: Sequence[str],
+        limit: Optional[int],
+        start_after: Optional[str],
+        select: Optional[Sequence[str]],
+    ) -> List[Document]:
+        conn = self._connection()
+        conditions, params = self._where(collection, filters)
+        terms = [(_field_expr(f.lstrip("-")), f.startswith("-")) for f in order_by]
+        if not any(expr == "id" for expr, _ in terms):
+            terms.append(("id", False))
+        # Firestore 처럼 정렬 필드가 없는 문서는 제외
+        for expr, _ in terms:
+            if expr != "id":
+                conditions.append(f"{expr} IS NOT NULL")
+
+        if start_after is not None:
+            exprs = ", ".join(expr for expr, _ in terms)
+            cursor_row = conn.execute(
+                f"SELECT {exprs} FROM documents WHERE collection = ? AND id = ?",
+                (collection, start_after),
+            ).fetchone()
+            if cursor_row is None:
+                raise ValueError(f"커서 문서를 찾을 수 없습니다: {start_after}")
+            # (a, b, id) > (x, y, z) 를 정렬 방향별로 풀어 쓴 조건
+            alternatives = []
+            for i, (expr, descending) in enumerate(terms):
+                parts = [f"{terms[j][0]} = ?" for j in range(i)]
+                parts.append(f"{expr} {'<' if descending else '>'} ?")
+                alternatives.append("(" + " AND ".join(parts) + ")")
+                params.extend(cursor_row[: i + 1])
+            conditions.append("(" + " OR ".join(alternatives) + ")")
+
+        order_sql = ", ".join(
+            f"{expr} DESC" if descending else expr for expr, descending in terms
+        )
+        sql = (
+            f"SELECT id, data FROM documents WHERE {' AND '.join(conditions)}"
+            f" ORDER BY {order_sql}"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        docs = []
+        for doc_id, raw in conn.execute(sql, params):
+            data = loads(raw)
+            if select is not None:
+                data = {k: data[k] for k in select if k in data}
+            docs.append(Document(doc_id, data))
+        return docs
+
+    def _count_sync(self, collection: str, filters: Sequence[Filter]) -> int:
+        conditions, params = self._where(collection, filters)
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT count(*) FROM documents WHERE {' AND '.join(conditions)}",
+                params,
+            )
+            .fetchone()
+        )
+        return row[0]
+
+    def _close_sync(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ---- 비동기 인터페이스 ----
+
+    async def connect(self) -> None:
+        await self._run(self._connection)
+
+    async def add(self, collection: str, data: Dict[str, Any]) -> str:
+        """문서를 추가하고 생성된 문서 ID를 반환"""
+        (doc_id,) = await self._run(
+            self._commit_sync, [WriteOp("add", collection, None, data)]
+        )
+        return doc_id
+
+    async def get(self, collection: str, doc_id: str) -> Optional[Dict[str, Any]]:
+        """문서 하나를 조회 (없으면 None)"""
+        return await self._run(self._get_sync, collection, doc_id)
+
+    async def set(
+        self,
+        collection: str,
+        doc_id: str,
+        data: Dict[str, Any],
+        merge: bool = False,
+    ) -> None:
+        await self._run(
+            self._commit_sync, [WriteOp("set", collection, doc_id, data, merge)]
+        )
+
+    async def update(self, collection: str, doc_id: str, data: Dict[str, Any]) -> None:
+        await self._run(
+            self._commit_sync, [WriteOp("update", collection, doc_id, data)]
+        )
+
+    async def delete(self, collection: str, doc_id: str) -> None:
+        await self._run(self._commit_sync, [WriteOp("delete", collection, doc_id)])
+
+    async def query(
+        self,
+        collection: str,
+        filters: Sequence[Filter] = (),
+        order_by: Sequence[str] = (),
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None,
+        select: Optional[Sequence[str]] = None,
+    ) -> List[Document]:
+        """조건에 맞는 문서 목록을 조회
+
+        ``start_after`` 는 이전 페이지 마지막 문서 ID, ``select`` 는 가져올 필드 목록.
+        """
+        return await self._run(
+            self._query_sync, collection, filters, order_by, limit, start_after, select
+        )
+
+    async def count(self, collection: str, filters: Sequence[Filter] = ()) -> int:
+        """조건에 맞는 문서 수"""
+        return await self._run(self._count_sync, collection, filters)
+
+    async def commit_batch(self, ops: Sequence[WriteOp]) -> List[Optional[str]]:
+        """여러 쓰기 연산을 하나의 트랜잭션으로 커밋하고 각 문서 ID를 반환"""
+        if len(ops) > MAX_BATCH_OPS:
+            raise ValueError(f"배치 연산은 최대 {MAX_BATCH_OPS}개까지 가능합니다")
+        return await self._run(self._commit_sync, ops)
+
+    async def close(self) -> None:
+        await self._run(self._close_sync)
+        self._executor.shutdown(wait=False)
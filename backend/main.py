@@ -1,19 +1,44 @@
-from fastapi import FastAPI, Request, HTTPException, status, Depends
+from fastapi import FastAPI, Depends
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from routers import game, user, match, message, report, consent
-from core.firebase import init_firebase, verify_id_token
+from core.firebase import init_firebase
+from core.auth import get_current_user, token_cache, token_verifier
+from db import (
+    DB_BACKEND,
+    close_store,
+    get_group_writer,
+    get_repositories,
+    get_store,
+    open_store,
+)
+from db.migrations import run_migrations
+from services.game_sessions import session_engine
+from services.message_engine import message_engine
 
 
 # Lifespan context manager (startup/shutdown)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Firebase 초기화
-    init_firebase()
+    # Firebase 초기화 (Firestore 백엔드에서만 필요)
+    if DB_BACKEND == "firestore":
+        init_firebase()
+    # 저장소 연결 준비 (PostgreSQL 은 연결 풀 생성과 스키마 확인)
+    await open_store()
+    # 1회성 데이터 마이그레이션 (완료 표시가 있으면 건너뜀)
+    await run_migrations(get_store(), get_repositories())
+    # ID 토큰 서명 키 로드 및 백그라운드 갱신 시작
+    # (로컬 백엔드는 시작 시 키를 가져오지 않고 첫 토큰 검증 때 가져옴)
+    await token_verifier.start(eager=DB_BACKEND not in ("memory", "sqlite"))
     yield
-    # TODO: 리소스 정리
+    # 리소스 정리
+    await token_verifier.stop()
+    # 남은 게임 세션 스냅샷을 저장한 뒤 저장소 종료
+    await session_engine.close()
+    await message_engine.close()
+    await close_store()
 
 
 app = FastAPI(lifespan=lifespan, title="EcoPlay API", version="0.1.0")
@@ -33,21 +58,16 @@ async def health_check():
     return JSONResponse({"status": "ok"})
 
 
-# 인증 의존성 예시
-async def get_current_user(request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid token"
-        )
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Firebase token"
-        )
+@app.get("/metrics", tags=["system"])
+async def metrics():
+    return {
+        "token_cache": token_cache.stats(),
+        "token_verifier": token_verifier.stats(),
+        "group_commit": get_group_writer().stats(),
+        "report_cache": report.report_cache.stats(),
+        "game_sessions": session_engine.stats(),
+        "message_engine": message_engine.stats(),
+    }
 
 
 # 예시: 인증이 필요한 엔드포인트
@@ -1,18 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends
 from datetime import datetime
 from pydantic import BaseModel
-import os
 
 # 스키마 임시 제거 - 인라인으로 정의
-from core.firebase import get_firestore_client, verify_id_token
+from core.auth import get_current_user_optional
+from db import get_repositories, get_store
+from services.participant_registry import consent_registry_op
 
 router = APIRouter(prefix="/consent", tags=["consent"])
 
-# 개발 환경 확인
-DEVELOPMENT = os.getenv("ENVIRONMENT", "development") == "development"
-
 
 # 동의서 스키마
 class ConsentDetails(BaseModel):
@@ -28,52 +24,12 @@ class ConsentRequest(BaseModel):
     consentDetails: ConsentDetails
 
 
-# 옵셔널 인증 의존성 (개발 환경에서는 우회 가능)
-async def get_current_user_optional(request: Request) -> Optional[dict]:
-    auth_header = request.headers.get("Authorization")
-
-    if DEVELOPMENT and not auth_header:
-        # 개발 환경에서 토큰이 없으면 더미 사용자 반환
-        return {
-            "uid": "12345678",
-            "email": "12345678@eco.play",
-            "auth_time": 1234567890,
-            "iss": "https://securetoken.google.com/ecoplay-6fd53",
-            "aud": "ecoplay-6fd53",
-        }
-
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Invalid Firebase token: {str(e)}")
-
-
-# 인증 의존성
-async def get_current_user(request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid Firebase token")
-
-
 @router.post("/submit")
 async def submit_consent(
     request: ConsentRequest, current_user=Depends(get_current_user_optional)
 ):
     """동의서 제출"""
     try:
-        db = get_firestore_client()
-
         consent_data = {
             "user_id": request.medicalRecordNumber,
             "user_email": f"{request.medicalRecordNumber}@eco.play",
@@ -84,11 +40,21 @@ async def submit_consent(
             "firebase_uid": current_user["uid"],
         }
 
-        doc_ref = db.collection("basic_info").add(consent_data)
+        # 동의서 기록(이력), 현재 동의서, 참여자 레지스트리를 하나의 배치로 기록
+        store = get_store()
+        consents = get_repositories().consents
+        document_id = consents.new_document_id()
+        await store.commit_batch(
+            [
+                consents.record_op(document_id, consent_data),
+                consents.current_op(document_id, consent_data),
+                await consent_registry_op(store, request.medicalRecordNumber),
+            ]
+        )
 
         return {
             "success": True,
-            "document_id": doc_ref[1].id,
+            "document_id": document_id,
             "message": "동의서가 성공적으로 제출되었습니다.",
         }
 
@@ -100,28 +66,19 @@ async def submit_consent(
 async def check_consent(
     medical_record_number: str, current_user=Depends(get_current_user_optional)
 ):
-    """동의서 상태 확인"""
+    """동의서 상태 확인 (현재 동의서 문서 한 번 조회)"""
     try:
-        db = get_firestore_client()
+        current = await get_repositories().consents.current(medical_record_number)
 
-        query = db.collection("basic_info").where(
-            "user_id", "==", medical_record_number
-        )
-        docs = list(query.stream())
-
-        if not docs:
+        if current is None:
             return {"exists": False, "message": "동의서가 제출되지 않았습니다."}
 
-        # 가장 최근 동의서 가져오기
-        latest_doc = docs[0]
-        data = latest_doc.to_dict()
-
         return {
             "exists": True,
-            "consent_given": data.get("consent_given", False),
-            "consent_details": data.get("consent_details", {}),
-            "consent_timestamp": data.get("consent_timestamp"),
-            "document_id": latest_doc.id,
+            "consent_given": current.get("consent_given", False),
+            "consent_details": current.get("consent_details", {}),
+            "consent_timestamp": current.get("consent_timestamp"),
+            "document_id": current.get("document_id"),
         }
 
     except Exception as e:
@@ -132,17 +89,14 @@ async def check_consent(
 async def get_consent_list(current_user=Depends(get_current_user_optional)):
     """사용자의 모든 동의서 목록 조회"""
     try:
-        db = get_firestore_client()
-
         # Firebase UID로 조회
-        query = db.collection("basic_info").where(
-            "firebase_uid", "==", current_user["uid"]
+        docs = await get_repositories().consents.list_for_firebase_uid(
+            current_user["uid"]
         )
-        docs = query.stream()
 
         consents = []
         for doc in docs:
-            data = doc.to_dict()
+            data = doc.data
             consents.append(
                 {
                     "document_id": doc.id,
@@ -173,17 +127,15 @@ async def update_consent(
 ):
     """동의서 수정"""
     try:
-        db = get_firestore_client()
+        consents = get_repositories().consents
 
         # 문서 존재 확인
-        doc_ref = db.collection("basic_info").document(document_id)
-        doc = doc_ref.get()
+        doc_data = await consents.get(document_id)
 
-        if not doc.exists:
+        if doc_data is None:
             raise HTTPException(status_code=404, detail="동의서를 찾을 수 없습니다.")
 
         # 권한 확인 (본인의 동의서인지)
-        doc_data = doc.to_dict()
         if doc_data.get("firebase_uid") != current_user["uid"]:
             raise HTTPException(status_code=403, detail="동의서 수정 권한이 없습니다.")
 
@@ -194,7 +146,18 @@ async def update_consent(
             "updated_at": datetime.utcnow(),
         }
 
-        doc_ref.update(update_data)
+        ops = [consents.update_record_op(document_id, update_data)]
+
+        # 수정한 동의서가 현재 동의서면 함께 갱신
+        medical_record_number = doc_data.get("user_id")
+        if medical_record_number:
+            current = await consents.current(medical_record_number)
+            if current and current.get("document_id") == document_id:
+                ops.append(
+                    consents.current_op(document_id, {**doc_data, **update_data})
+                )
+
+        await get_store().commit_batch(ops)
 
         return {
             "success": True,
@@ -212,21 +175,34 @@ async def delete_consent(
 ):
     """동의서 삭제"""
     try:
-        db = get_firestore_client()
+        consents = get_repositories().consents
 
         # 문서 존재 확인
-        doc_ref = db.collection("basic_info").document(document_id)
-        doc = doc_ref.get()
+        doc_data = await consents.get(document_id)
 
-        if not doc.exists:
+        if doc_data is None:
             raise HTTPException(status_code=404, detail="동의서를 찾을 수 없습니다.")
 
         # 권한 확인 (본인의 동의서인지)
-        doc_data = doc.to_dict()
         if doc_data.get("firebase_uid") != current_user["uid"]:
             raise HTTPException(status_code=403, detail="동의서 삭제 권한이 없습니다.")
 
-        doc_ref.delete()
+        ops = [consents.delete_record_op(document_id)]
+
+        # 삭제한 동의서가 현재 동의서면 남은 이력 중 가장 최근 것으로 교체
+        medical_record_number = doc_data.get("user_id")
+        if medical_record_number:
+            current = await consents.current(medical_record_number)
+            if current and current.get("document_id") == document_id:
+                latest = await consents.latest_for_medical_record_number(
+                    medical_record_number, exclude=document_id
+                )
+                if latest is None:
+                    ops.append(consents.clear_current_op(medical_record_number))
+                else:
+                    ops.append(consents.current_op(latest.id, latest.data))
+
+        await get_store().commit_batch(ops)
 
         return {
             "success": True,
@@ -1,30 +1,101 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from typing import List, Dict, Any, Optional
-import random
+from pydantic import ValidationError
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
+import asyncio
+import logging
 from datetime import datetime
-import os
 
 from schemas.game import (
-    PublicGoodsGameRound,
-    TrustGameRound,
     PublicGoodsGameRequest,
     TrustGameRequest,
+    PublicGoodsBatchRequest,
+    TrustGameBatchRequest,
+    TrustGameBatchRound,
+    GameSessionStartRequest,
+    GameSessionState,
     GameResult,
 )
-from core.firebase import get_firestore_client, verify_id_token
-from routers.match import OPPONENT_PERSONALITIES
+from core.auth import (
+    authenticate_websocket,
+    get_current_user_optional,
+    get_medical_record_number,
+)
+from core.ws_channel import WebSocketChannel
+from db import DOCUMENT_ID, get_group_writer, get_repositories, get_store
+from db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    query_page,
+)
+from routers.report import report_cache
+from services.game_rules import (
+    DEFAULT_OPPONENT_PERSONALITY,
+    INITIAL_POINTS,
+    TOTAL_ROUNDS,
+    public_goods_outcome,
+    simulate_other_donations,
+    trust_game_outcome,
+)
+from services.message_engine import message_engine
+from services.trust_engine import draw_return_rate
+from services.opponent_schedule import (
+    Opponent,
+    SeedNotAllowedError,
+    client_seed,
+    generate_opponent_schedule,
+    opponent_for,
+)
+from services.game_sessions import (
+    SessionNotFoundError,
+    SessionStateError,
+    session_engine,
+)
+from services.participant_registry import (
+    PARTICIPANTS_COLLECTION,
+    rebuild_registry,
+    round_registry_op,
+)
+from services.report_rows import history_rows
+from services.report_summary import summary_increment_op, sum_increments
 
 router = APIRouter(prefix="/game", tags=["game"])
-
-# Public Goods Game 상수
-TOTAL_ROUNDS = 10
-INITIAL_POINTS = 100
-NUM_PLAYERS = 5
-MULTIPLIER = 1.5
-
-# 개발 환경 확인
-DEVELOPMENT = os.getenv("ENVIRONMENT", "development") == "development"
+logger = logging.getLogger(__name__)
+
+# 게임 기록 응답 형태별로 Firestore에서 가져올 필드
+HISTORY_FIELDS = {
+    "public_goods": [
+        "round",
+        "human_contribution",
+        "new_balance",
+        "computer_contributions",
+        "timestamp",
+    ],
+    "trust_game_receiver": [
+        "round",
+        "received_amount",
+        "decision",
+        "new_balance",
+        "timestamp",
+    ],
+    "trust_game_trustee": [
+        "round",
+        "decision",
+        "returned_amount",
+        "new_balance",
+        "timestamp",
+    ],
+}
 
 
 @router.get("/public-goods/example")
@@ -37,42 +108,224 @@ async def trust_game_example():
     return JSONResponse({"message": "Trust Game endpoint (예시)"})
 
 
-# 옵셔널 인증 의존성 (개발 환경에서는 우회 가능)
-async def get_current_user_optional(request: Request) -> Optional[dict]:
-    auth_header = request.headers.get("Authorization")
+def _user_email(current_user) -> str:
+    return current_user.get("email", f"{current_user['uid']}@eco.play")
 
-    if DEVELOPMENT and not auth_header:
-        # 개발 환경에서 토큰이 없으면 더미 사용자 반환
-        return {
-            "uid": "12345678",
-            "email": "12345678@eco.play",
-            "auth_time": 1234567890,
-            "iss": "https://securetoken.google.com/ecoplay-6fd53",
-            "aud": "ecoplay-6fd53",
-        }
 
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Invalid Firebase token: {str(e)}")
+def _public_goods_round(
+    current_user,
+    round_number: int,
+    donation: int,
+    current_balance: float,
+    opponent: Opponent,
+) -> Tuple[Dict[str, Any], GameResult]:
+    """Public Goods Game 라운드 하나의 저장 문서와 응답
 
-
-# 인증 의존성 (항상 인증 필요)
-async def get_current_user(request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid Firebase token")
+    다른 플레이어들의 기부는 ``opponent`` 스케줄의 이번 라운드 값을 쓴다 (스케줄에
+    없으면 요청별 난수로 시뮬레이션).
+    """
+    scheduled = opponent.round(round_number)
+    if scheduled:
+        other_donations = list(scheduled["other_donations"])
+    else:
+        # 다른 플레이어들의 기부 시뮬레이션 (0-25% 범위)
+        other_donations = simulate_other_donations(opponent.rng)
+    outcome = public_goods_outcome(donation, other_donations, current_balance)
+    total_donated = outcome.total_donated
+    common_pot = outcome.common_pot
+    share_per_player = outcome.share_per_player
+    payoff = outcome.payoff
+    new_balance = outcome.new_balance
+
+    game_data = {
+        # 리포트/기록/요약과 같은 키 (동의서 기록과 같이 UID 는 firebase_uid 에)
+        "user_id": get_medical_record_number(current_user),
+        "firebase_uid": current_user["uid"],
+        "user_email": _user_email(current_user),
+        "game_name": "public goods game",
+        "round": round_number,
+        "human_contribution": donation,
+        "human_payoff": payoff,
+        "computer_contributions": other_donations,
+        "total_donated": total_donated,
+        "common_pot": common_pot,
+        "share_received": share_per_player,
+        "new_balance": new_balance,
+        "game_began_at": datetime.utcnow(),
+        "timestamp": datetime.utcnow(),
+        "response_time": 0,  # 프론트엔드에서 제공하도록 스키마 수정 필요
+    }
+    result = GameResult(
+        success=True,
+        payoff=payoff,
+        new_balance=new_balance,
+        message=f"기부: {donation}, 총 기부: {total_donated}, 공통 자금: {common_pot:.1f}, 받은 몫: {share_per_player:.1f}",
+        round=round_number,
+        user_donation=donation,
+        other_donations=other_donations,
+        total_donated=total_donated,
+        common_pot=common_pot,
+        share_per_player=share_per_player,
+    )
+    return game_data, result
+
+
+def _trust_game_round(
+    current_user,
+    request: Union[TrustGameRequest, TrustGameBatchRound],
+    current_balance: float,
+    opponent: Opponent,
+) -> Tuple[Dict[str, Any], GameResult]:
+    """Trust Game 라운드 하나의 저장 문서와 응답
+
+    투자 라운드에서는 ``opponent`` 스케줄의 반환율(없으면 매칭된 성격의 반환율
+    범위에서 요청별 난수로 뽑은 값)로 상대가 돌려주는 금액을 같은 요청 안에서
+    계산한다. 매칭도 요청의 ``personality`` 도 없으면 기본 성격
+    (``DEFAULT_OPPONENT_PERSONALITY``)을 쓴다.
+    """
+    return_rate = None
+    if request.role == "trustee":
+        scheduled = opponent.round(request.round)
+        if scheduled:
+            return_rate = scheduled["return_rate"]
+        else:
+            personality = (
+                opponent.personality
+                or request.personality
+                or DEFAULT_OPPONENT_PERSONALITY
+            )
+            return_rate = draw_return_rate(personality, opponent.rng)
+    outcome = trust_game_outcome(
+        request.role,
+        current_balance,
+        received_amount=request.received_amount,
+        return_amount=request.return_amount,
+        investment=request.investment,
+        return_rate=return_rate,
+    )
+    game_data = {
+        # 리포트/기록/요약과 같은 키 (동의서 기록과 같이 UID 는 firebase_uid 에)
+        "user_id": get_medical_record_number(current_user),
+        "firebase_uid": current_user["uid"],
+        "user_email": _user_email(current_user),
+        "game_name": "trust game",
+        "round": request.round,
+        "role": outcome.role,  # 표준 용어: trustor(투자) / trustee(반환)
+        "decision": outcome.decision,
+        "received_amount": outcome.received_amount,
+        "multiplied_amount": outcome.multiplied_amount,
+        "points_kept": outcome.points_kept,
+        "new_balance": outcome.new_balance,
+        "game_began_at": datetime.utcnow(),
+        "timestamp": datetime.utcnow(),
+        "response_time": 0,
+        "session_id": "",
+        "partner_id": "",
+    }
+    if return_rate is not None:
+        # 상대가 돌려준 금액과 사용한 반환율 (세션 재현/분석용)
+        game_data["returned_amount"] = outcome.received_amount
+        game_data["partner_return_rate"] = return_rate
+    result = GameResult(
+        success=True,
+        payoff=outcome.payoff,
+        new_balance=outcome.new_balance,
+        message=outcome.message,
+        round=request.round,
+        returned_amount=outcome.received_amount if return_rate is not None else None,
+    )
+    return game_data, result
+
+
+async def _save_rounds(game: str, current_user, rounds: List[Dict[str, Any]]) -> None:
+    """라운드 문서들과 리포트 요약/레지스트리 갱신을 하나의 배치로 원자적으로 저장
+
+    동시에 제출된 다른 요청의 쓰기와 함께 그룹 커밋된다. 요약은 리포트가 읽는
+    MRN 문서에 더하고, 라운드에는 요약에 반영됐다는 표시(``summarized``)를 남긴다.
+    """
+    user_id = current_user["uid"]
+    medical_record_number = get_medical_record_number(current_user)
+    for game_data in rounds:
+        game_data["summarized"] = True
+
+    round_repository = get_repositories().rounds
+    await get_group_writer().submit(
+        [
+            *(round_repository.add_op(game, game_data) for game_data in rounds),
+            summary_increment_op(medical_record_number, sum_increments(game, rounds)),
+            await round_registry_op(
+                get_store(), medical_record_number, game, len(rounds)
+            ),
+        ]
+    )
+    report_cache.invalidate(user_id, medical_record_number)
+
+
+async def _play_rounds(
+    game: str,
+    current_user,
+    session_id: Optional[str],
+    current_balance: Optional[float],
+    game_rounds: List[Any],
+    play: Callable[[Any, float, Opponent], Tuple[Dict[str, Any], GameResult]],
+) -> List[GameResult]:
+    """라운드들을 순서대로 계산하고 하나의 배치로 저장
+
+    세션이 있으면 시작 잔액과 라운드 번호는 세션 상태를 따르고(클라이언트 값 무시),
+    없으면 요청의 ``current_balance`` 에서 시작한다. 상대 행동은 세션 스케줄을 따르고,
+    세션이 없으면 요청마다 새로 뽑는다 (투자 라운드만 현재 매칭의 성격을 조회).
+    """
+    session = None
+    if session_id:
+        session = await session_engine.get(session_id, current_user["uid"])
+        if session.game != game:
+            raise SessionStateError("다른 게임의 세션입니다")
+        opponent = opponent_for(session.schedule)
+    elif current_balance is None:
+        raise SessionStateError("session_id 또는 current_balance 가 필요합니다")
+    elif any(
+        getattr(game_round, "role", None) == "trustee" for game_round in game_rounds
+    ):
+        match = await get_repositories().matches.current(current_user["uid"])
+        opponent = opponent_for(
+            None, match.get("matched_personality") if match else None
+        )
+    else:
+        opponent = opponent_for(None)
+
+    async def play_all() -> List[GameResult]:
+        balance = session.balance if session else current_balance
+        rounds, results = [], []
+        for game_round in game_rounds:
+            game_data, result = play(game_round, balance, opponent)
+            balance = result.new_balance
+            if session:
+                game_data["session_id"] = session.session_id
+                result.session_id = session.session_id
+            rounds.append(game_data)
+            results.append(result)
+
+        await _save_rounds(game, current_user, rounds)
+        if session:
+            session_engine.record_rounds(session, rounds)
+        return results
+
+    if session is None:
+        return await play_all()
+    # 같은 세션의 동시 제출은 순서대로 검증/계산/저장
+    async with session.lock:
+        session.check_rounds([game_round.round for game_round in game_rounds])
+        return await play_all()
+
+
+def _game_error(e: Exception) -> HTTPException:
+    if isinstance(e, SeedNotAllowedError):
+        return HTTPException(status_code=403, detail=str(e))
+    if isinstance(e, SessionNotFoundError):
+        return HTTPException(status_code=404, detail=str(e))
+    if isinstance(e, SessionStateError):
+        return HTTPException(status_code=409, detail=str(e))
+    return HTTPException(status_code=500, detail=f"게임 처리 중 오류: {str(e)}")
 
 
 @router.post("/public-goods/submit", response_model=GameResult)
@@ -81,52 +334,54 @@ async def submit_public_goods_round(
 ):
     """Public Goods Game 라운드 제출 및 결과 계산"""
     try:
-        # 다른 플레이어들의 기부 시뮬레이션 (0-25% 범위)
-        other_donations = [
-            random.randint(0, int(INITIAL_POINTS * 0.25))
-            for _ in range(NUM_PLAYERS - 1)
-        ]
+        # 라운드 문서와 리포트 요약 증가를 동시에 제출된 다른 라운드와 함께 배치로 커밋
+        results = await _play_rounds(
+            "public_goods",
+            current_user,
+            request.session_id,
+            request.current_balance,
+            [request],
+            lambda game_round, balance, opponent: _public_goods_round(
+                current_user,
+                game_round.round,
+                game_round.donation,
+                balance,
+                opponent,
+            ),
+        )
+        return results[0]
 
-        total_donated = request.donation + sum(other_donations)
-        common_pot = total_donated * MULTIPLIER
-        share_per_player = common_pot / NUM_PLAYERS
-        payoff = share_per_player - request.donation
-        new_balance = request.current_balance + payoff
-
-        # Firestore에 저장
-        db = get_firestore_client()
-        game_data = {
-            "user_id": current_user["uid"],
-            "user_email": current_user.get("email", f"{current_user['uid']}@eco.play"),
-            "game_name": "public goods game",
-            "round": request.round,
-            "human_contribution": request.donation,
-            "human_payoff": payoff,
-            "computer_contributions": other_donations,
-            "total_donated": total_donated,
-            "common_pot": common_pot,
-            "share_received": share_per_player,
-            "new_balance": new_balance,
-            "game_began_at": datetime.utcnow(),
-            "timestamp": datetime.utcnow(),
-            "response_time": 0,  # 프론트엔드에서 제공하도록 스키마 수정 필요
-        }
-        db.collection("public_goods_game").add(game_data)
-
-        return GameResult(
-            success=True,
-            payoff=payoff,
-            new_balance=new_balance,
-            message=f"기부: {request.donation}, 총 기부: {total_donated}, 공통 자금: {common_pot:.1f}, 받은 몫: {share_per_player:.1f}",
-            user_donation=request.donation,
-            other_donations=other_donations,
-            total_donated=total_donated,
-            common_pot=common_pot,
-            share_per_player=share_per_player,
+    except Exception as e:
+        raise _game_error(e)
+
+
+@router.post("/public-goods/submit-batch", response_model=List[GameResult])
+async def submit_public_goods_rounds(
+    request: PublicGoodsBatchRequest, current_user=Depends(get_current_user_optional)
+):
+    """여러 Public Goods Game 라운드를 순서대로 계산하고 한 번에 저장
+
+    각 라운드의 시작 잔액은 직전 라운드의 결과 잔액이며, 라운드 문서는 모두
+    하나의 배치로 커밋된다 (전부 저장되거나 전부 실패).
+    """
+    try:
+        return await _play_rounds(
+            "public_goods",
+            current_user,
+            request.session_id,
+            request.current_balance,
+            request.rounds,
+            lambda game_round, balance, opponent: _public_goods_round(
+                current_user,
+                game_round.round,
+                game_round.donation,
+                balance,
+                opponent,
+            ),
         )
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"게임 처리 중 오류: {str(e)}")
+        raise _game_error(e)
 
 
 @router.post("/trust-game/submit", response_model=GameResult)
@@ -135,159 +390,352 @@ async def submit_trust_game_round(
 ):
     """Trust Game 라운드 제출 및 결과 계산"""
     try:
-        if request.role == "receiver":
-            # 수신자: 반환할 금액 결정
-            points_kept = request.received_amount - request.return_amount
-            new_balance = request.current_balance + points_kept
-
-            game_data = {
-                "user_id": current_user["uid"],
-                "user_email": current_user.get(
-                    "email", f"{current_user['uid']}@eco.play"
-                ),
-                "game_name": "trust game",
-                "round": request.round,
-                "role": "trustee",  # 표준 용어: 받아서 돌려주는 사람
-                "decision": request.return_amount,
-                "received_amount": request.received_amount,
-                "multiplied_amount": request.received_amount,
-                "points_kept": points_kept,
-                "new_balance": new_balance,
-                "game_began_at": datetime.utcnow(),
-                "timestamp": datetime.utcnow(),
-                "response_time": 0,
-                "session_id": "",
-                "partner_id": "",
-            }
+        # Firestore에 저장 (리포트 요약 증가와 함께, 동시 제출분과 배치 커밋)
+        results = await _play_rounds(
+            "trust_game",
+            current_user,
+            request.session_id,
+            request.current_balance,
+            [request],
+            lambda game_round, balance, opponent: _trust_game_round(
+                current_user, game_round, balance, opponent
+            ),
+        )
+        return results[0]
 
-            message = f"받은 금액: {request.received_amount}, 반환: {request.return_amount}, 보유: {points_kept}"
-            payoff = points_kept
-
-        elif request.role == "trustee":
-            # 신탁자: 투자할 금액 결정
-            investment = request.investment
-            new_balance = request.current_balance - investment
-
-            game_data = {
-                "user_id": current_user["uid"],
-                "user_email": current_user.get(
-                    "email", f"{current_user['uid']}@eco.play"
-                ),
-                "game_name": "trust game",
-                "round": request.round,
-                "role": "trustor",  # 표준 용어: 투자하는 사람
-                "decision": investment,
-                "received_amount": 0,  # 투자자는 이 라운드에서 받지 않음
-                "multiplied_amount": investment * 3,
-                "points_kept": -investment,  # 투자한 만큼 차감
-                "new_balance": new_balance,
-                "game_began_at": datetime.utcnow(),
-                "timestamp": datetime.utcnow(),
-                "response_time": 0,
-                "session_id": "",
-                "partner_id": "",
-            }
+    except Exception as e:
+        raise _game_error(e)
 
-            message = f"투자 금액: {investment}, 상대가 받은 금액: {investment * 3}"
-            payoff = -investment  # 투자한 만큼 손실 (단순화)
 
-        # Firestore에 저장
-        db = get_firestore_client()
-        db.collection("trust_game").add(game_data)
+@router.post("/trust-game/submit-batch", response_model=List[GameResult])
+async def submit_trust_game_rounds(
+    request: TrustGameBatchRequest, current_user=Depends(get_current_user_optional)
+):
+    """여러 Trust Game 라운드를 순서대로 계산하고 한 번에 저장
 
-        return GameResult(
-            success=True,
-            payoff=payoff,
-            new_balance=new_balance,
-            message=message,
+    각 라운드의 시작 잔액은 직전 라운드의 결과 잔액이며, 라운드 문서는 모두
+    하나의 배치로 커밋된다 (전부 저장되거나 전부 실패).
+    """
+    try:
+        return await _play_rounds(
+            "trust_game",
+            current_user,
+            request.session_id,
+            request.current_balance,
+            request.rounds,
+            lambda game_round, balance, opponent: _trust_game_round(
+                current_user, game_round, balance, opponent
+            ),
         )
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"게임 처리 중 오류: {str(e)}")
+        raise _game_error(e)
+
+
+# ---- 게임 세션 ----
+
+
+async def _start_session(current_user, request: GameSessionStartRequest):
+    """세션 시작 (match_id 가 있으면 매칭 때 만든 상대 행동 스케줄을 이어서 사용)"""
+    total_rounds = request.total_rounds or TOTAL_ROUNDS
+    seed, personality = client_seed(request.seed), None
+    if request.match_id:
+        match = await get_repositories().matches.get(request.match_id)
+        if match is None or match.get("user_id") != current_user["uid"]:
+            raise SessionNotFoundError("매칭을 찾을 수 없습니다")
+        match_schedule = match.get("opponent_schedule") or {}
+        seed = match_schedule.get("seed", seed)
+        personality = match.get("matched_personality")
+    schedule = generate_opponent_schedule(
+        seed=seed, rounds=total_rounds, personality=personality
+    )
+    return session_engine.start(
+        current_user["uid"],
+        get_medical_record_number(current_user),
+        request.game,
+        initial_balance=INITIAL_POINTS
+        if request.initial_balance is None
+        else request.initial_balance,
+        total_rounds=total_rounds,
+        schedule=schedule,
+        match_id=request.match_id,
+    )
+
+
+@router.post("/session/start", response_model=GameSessionState)
+async def start_game_session(
+    request: GameSessionStartRequest, current_user=Depends(get_current_user_optional)
+):
+    """게임 세션 시작 (이후 라운드 제출에 session_id 를 넘기면 서버가 잔액/라운드를 관리)"""
+    try:
+        session = await _start_session(current_user, request)
+        return session.state()
+    except Exception as e:
+        raise _game_error(e)
 
 
-@router.get("/history/{game_type}")
-async def get_game_history(
-    game_type: str, current_user=Depends(get_current_user_optional)
+@router.get("/session/{session_id}", response_model=GameSessionState)
+async def get_game_session(
+    session_id: str, current_user=Depends(get_current_user_optional)
 ):
-    """사용자의 게임 기록 조회"""
+    """현재 세션 상태 조회 (캐시에 있으면 저장소를 조회하지 않음)"""
     try:
-        # 이메일에서 Medical Record Number 추출
-        email = current_user.get("email", "")
-        if "@eco.play" in email:
-            medical_record_number = email.replace("@eco.play", "")
-        else:
-            medical_record_number = current_user["uid"]  # fallback to UID
+        session = await session_engine.get(session_id, current_user["uid"])
+        return session.state()
+    except Exception as e:
+        raise _game_error(e)
 
-        print(f"게임 기록 조회 - Medical Record Number: {medical_record_number}")
 
-        db = get_firestore_client()
+@router.post("/session/{session_id}/complete", response_model=GameSessionState)
+async def complete_game_session(
+    session_id: str, current_user=Depends(get_current_user_optional)
+):
+    """세션을 완료 처리 (마지막 라운드를 제출하면 자동으로 완료됨)"""
+    try:
+        session = await session_engine.get(session_id, current_user["uid"])
+        async with session.lock:
+            session_engine.complete(session)
+        return session.state()
+    except Exception as e:
+        raise _game_error(e)
+
+
+# ---- WebSocket ----
+
+_WS_SUBMIT_REQUESTS = {
+    "public_goods": PublicGoodsGameRequest,
+    "trust_game": TrustGameRequest,
+}
 
-        # 게임 타입에 따른 컬렉션 선택
-        if game_type == "public_goods":
-            collection_name = "public_goods_game"
-        elif game_type in ["trust_game_receiver", "trust_game_trustee"]:
-            collection_name = "trust_game"
-            role = "receiver" if game_type == "trust_game_receiver" else "trustee"
-        else:
-            raise HTTPException(status_code=400, detail="지원하지 않는 게임 타입입니다")
 
-        query = db.collection(collection_name).where(
-            "user_id",
-            "==",
-            medical_record_number,  # UID 대신 Medical Record Number 사용
+def _ws_error(request_id, status_code: int, detail: Any) -> Dict[str, Any]:
+    return {
+        "type": "error",
+        "request_id": request_id,
+        "status": status_code,
+        "detail": detail,
+    }
+
+
+async def _ws_submit(
+    channel: WebSocketChannel, current_user, message: Dict[str, Any], request_id
+) -> None:
+    """라운드 하나를 처리하고 결과 → 상대 행동 → 안내 메시지 순으로 전송"""
+    game = message.get("game")
+    if game not in _WS_SUBMIT_REQUESTS:
+        await channel.send(_ws_error(request_id, 400, "지원하지 않는 게임 타입입니다"))
+        return
+    request = _WS_SUBMIT_REQUESTS[game].model_validate(message)
+
+    if game == "public_goods":
+
+        def play(game_round, balance, opponent):
+            return _public_goods_round(
+                current_user,
+                game_round.round,
+                game_round.donation,
+                balance,
+                opponent,
+            )
+
+        guidance_type = "public_goods"
+    else:
+
+        def play(game_round, balance, opponent):
+            return _trust_game_round(current_user, game_round, balance, opponent)
+
+        guidance_type = (
+            "trust_game_receiver"
+            if request.role == "receiver"
+            else "trust_game_trustee"
+        )
+    results = await _play_rounds(
+        game,
+        current_user,
+        request.session_id,
+        request.current_balance,
+        [request],
+        play,
+    )
+    result = results[0]
+    await channel.send(
+        {"type": "result", "request_id": request_id, "game": game, "result": result}
+    )
+
+    # 상대 플레이어 행동
+    if game == "public_goods":
+        await channel.send(
+            {
+                "type": "opponent",
+                "request_id": request_id,
+                "round": result.round,
+                "other_donations": result.other_donations,
+            }
+        )
+    elif request.role == "receiver":
+        await channel.send(
+            {
+                "type": "opponent",
+                "request_id": request_id,
+                "round": result.round,
+                "investment_received": request.received_amount,
+            }
+        )
+    else:
+        await channel.send(
+            {
+                "type": "opponent",
+                "request_id": request_id,
+                "round": result.round,
+                "returned_amount": result.returned_amount,
+            }
         )
 
-        if game_type in ["trust_game_receiver", "trust_game_trustee"]:
-            query = query.where("role", "==", role)
+    if message.get("guidance", True):
+        # 저장은 메시지 엔진이 백그라운드에서 수행
+        guidance = await message_engine.generate(
+            current_user["uid"],
+            guidance_type,
+            result.round,
+            {"balance": result.new_balance},
+        )
+        await channel.send({"type": "guidance", "request_id": request_id, **guidance})
 
-        docs = query.stream()
 
-        history = []
-        for doc in docs:
-            data = doc.to_dict()
+@router.websocket("/ws")
+async def game_websocket(websocket: WebSocket):
+    """실시간 게임 연결 (연결당 한 번 인증)
 
-            if game_type == "public_goods":
-                history.append(
+    클라이언트 메시지 (JSON, ``request_id`` 는 응답에 그대로 돌려줌):
+    - ``{"type": "auth", "token": ...}``: 첫 메시지 (``Authorization`` 헤더가 없을 때)
+    - ``{"type": "start_session", "game": ...}``: 세션 시작 → ``session``
+    - ``{"type": "submit", "game": "public_goods" | "trust_game", ...}``: 라운드 제출
+      (필드는 HTTP 제출 요청과 같음) → ``result``, ``opponent``, ``guidance``
+      (``"guidance": false`` 면 안내 메시지 생략)
+    - ``{"type": "ping"}`` → ``pong``
+
+    실패한 요청은 연결을 유지한 채 ``{"type": "error", "status": ..., "detail": ...}``
+    로 응답한다.
+    """
+    await websocket.accept()
+    try:
+        current_user = await authenticate_websocket(websocket)
+    except PermissionError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    except WebSocketDisconnect:
+        return
+
+    channel = WebSocketChannel(websocket)
+
+    async def handle(message: Optional[Dict[str, Any]]) -> None:
+        if not isinstance(message, dict):
+            await channel.send(_ws_error(None, 400, "메시지는 JSON 객체여야 합니다"))
+            return
+        request_id = message.get("request_id")
+        kind = message.get("type")
+        try:
+            if kind == "submit":
+                await _ws_submit(channel, current_user, message, request_id)
+            elif kind == "start_session":
+                request = GameSessionStartRequest.model_validate(message)
+                session = await _start_session(current_user, request)
+                await channel.send(
                     {
-                        "round": data.get("round"),
-                        "donation": data.get("human_contribution"),
-                        "current_balance": data.get("new_balance"),
-                        "partner_contribution": sum(
-                            data.get("computer_contributions", [])
-                        ),
-                        "timestamp": data.get("timestamp"),
+                        "type": "session",
+                        "request_id": request_id,
+                        "session": session.state(),
                     }
                 )
-            else:  # trust game
-                if role == "receiver":
-                    history.append(
-                        {
-                            "round": data.get("round"),
-                            "received": data.get("received_amount"),
-                            "returned": data.get("decision"),
-                            "current_balance": data.get("new_balance"),
-                            "timestamp": data.get("timestamp"),
-                        }
-                    )
-                else:  # trustee
-                    history.append(
-                        {
-                            "round": data.get("round"),
-                            "invested": data.get("decision"),
-                            "received_back": data.get("returned_amount"),
-                            "current_balance": data.get("new_balance"),
-                            "timestamp": data.get("timestamp"),
-                        }
+            elif kind == "ping":
+                await channel.send({"type": "pong", "request_id": request_id})
+            else:
+                await channel.send(
+                    _ws_error(
+                        request_id, 400, f"지원하지 않는 메시지 타입입니다: {kind}"
                     )
+                )
+        except ValidationError as e:
+            await channel.send(_ws_error(request_id, 422, jsonable_encoder(e.errors())))
+        except (WebSocketDisconnect, asyncio.TimeoutError):
+            raise
+        except Exception as e:
+            error = _game_error(e)
+            await channel.send(_ws_error(request_id, error.status_code, error.detail))
+
+    await channel.send({"type": "ready", "user_id": current_user["uid"]})
+    await channel.run(handle)
+
+
+@router.get("/history/{game_type}")
+async def get_game_history(
+    game_type: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    session_id: Optional[str] = None,
+    current_user=Depends(get_current_user_optional),
+):
+    """사용자의 게임 기록 조회 (라운드 순, 커서 기반 페이지)
+
+    ``session_id`` 를 주면 해당 세션의 라운드와 현재 상태를 세션 캐시에서 바로
+    반환한다 (세션 라운드 수가 적으므로 페이지를 나누지 않음).
+    """
+    try:
+        start_after = decode_cursor(cursor).get("after")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        medical_record_number = get_medical_record_number(current_user)
+
+        logger.debug(f"게임 기록 조회 - Medical Record Number: {medical_record_number}")
+
+        # 게임 타입에 따른 컬렉션 선택
+        role = None
+        if game_type == "public_goods":
+            game = "public_goods"
+        elif game_type in ["trust_game_receiver", "trust_game_trustee"]:
+            game = "trust_game"
+            # 라운드 문서는 표준 용어로 저장됨 (수신자 → trustee, 투자자 → trustor)
+            role = "trustee" if game_type == "trust_game_receiver" else "trustor"
+        else:
+            raise HTTPException(status_code=400, detail="지원하지 않는 게임 타입입니다")
+
+        if session_id:
+            session = await session_engine.get(session_id, current_user["uid"])
+            if session.game != game:
+                raise SessionStateError("다른 게임의 세션입니다")
+            session_rounds = [
+                data for data in session.rounds if not role or data.get("role") == role
+            ]
+            return {
+                "history": history_rows(game_type, session_rounds),
+                "next_cursor": None,
+                "session": GameSessionState(**session.state()),
+            }
 
-        # 라운드별로 정렬
-        history.sort(key=lambda x: x.get("round", 0))
+        # UID 대신 Medical Record Number 사용
+        # 라운드 순 정렬과 필드 선택은 저장소에서 수행
+        docs, next_after = await get_repositories().rounds.page_for_user(
+            game,
+            medical_record_number,
+            role=role,
+            limit=limit,
+            start_after=start_after,
+            select=HISTORY_FIELDS[game_type],
+        )
 
-        print(f"조회된 기록 수: {len(history)}")
+        history = history_rows(game_type, (doc.data for doc in docs))
 
-        return {"history": history}
+        logger.debug(f"조회된 기록 수: {len(history)}")
+
+        return {
+            "history": history,
+            "next_cursor": encode_cursor({"after": next_after}) if next_after else None,
+        }
 
+    except (SessionNotFoundError, SessionStateError) as e:
+        raise _game_error(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"기록 조회 중 오류: {str(e)}")
 
@@ -296,23 +744,17 @@ async def get_game_history(
 async def debug_user_data(user_id: str):
     """특정 사용자의 Firebase 데이터를 직접 조회 (디버깅용)"""
     try:
-        db = get_firestore_client()
+        repositories = get_repositories()
 
-        # Public Goods Game 데이터 조회
-        pg_docs = (
-            db.collection("public_goods_game").where("user_id", "==", user_id).stream()
+        # Public Goods Game / Trust Game / 동의서 데이터 동시 조회
+        pg_docs, tg_docs, consent_docs = await asyncio.gather(
+            repositories.rounds.list_for_user("public_goods", user_id),
+            repositories.rounds.list_for_user("trust_game", user_id),
+            repositories.consents.list_for_medical_record_number(user_id),
         )
-        pg_data = [doc.to_dict() for doc in pg_docs]
-
-        # Trust Game 데이터 조회
-        tg_docs = db.collection("trust_game").where("user_id", "==", user_id).stream()
-        tg_data = [doc.to_dict() for doc in tg_docs]
-
-        # 동의서 데이터 조회
-        consent_docs = (
-            db.collection("basic_info").where("user_id", "==", user_id).stream()
-        )
-        consent_data = [doc.to_dict() for doc in consent_docs]
+        pg_data = [doc.data for doc in pg_docs]
+        tg_data = [doc.data for doc in tg_docs]
+        consent_data = [doc.data for doc in consent_docs]
 
         return {
             "user_id": user_id,
@@ -325,40 +767,49 @@ async def debug_user_data(user_id: str):
 
 
 @router.get("/debug/all-users")
-async def debug_all_users():
-    """모든 사용자 ID를 조회 (디버깅용)"""
+async def debug_all_users(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+):
+    """참여자 레지스트리를 페이지 단위로 조회 (디버깅용)"""
     try:
-        db = get_firestore_client()
-
-        # 모든 컬렉션에서 user_id 수집
-        all_user_ids = set()
-
-        # Public Goods Game에서 user_id 수집
-        pg_docs = db.collection("public_goods_game").stream()
-        for doc in pg_docs:
-            data = doc.to_dict()
-            if data.get("user_id"):
-                all_user_ids.add(data["user_id"])
-
-        # Trust Game에서 user_id 수집
-        tg_docs = db.collection("trust_game").stream()
-        for doc in tg_docs:
-            data = doc.to_dict()
-            if data.get("user_id"):
-                all_user_ids.add(data["user_id"])
-
-        # Consent에서 user_id 수집
-        consent_docs = db.collection("basic_info").stream()
-        for doc in consent_docs:
-            data = doc.to_dict()
-            if data.get("user_id"):
-                all_user_ids.add(data["user_id"])
+        start_after = decode_cursor(cursor).get("after")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        store = get_store()
+
+        (docs, next_after), total = await asyncio.gather(
+            query_page(
+                store,
+                PARTICIPANTS_COLLECTION,
+                order_by=[DOCUMENT_ID],
+                limit=limit,
+                start_after=start_after,
+            ),
+            store.count(PARTICIPANTS_COLLECTION),
+        )
 
         return {
-            "all_user_ids": sorted(list(all_user_ids)),
-            "total_unique_users": len(all_user_ids),
+            "all_user_ids": [doc.id for doc in docs],
+            "participants": [{"id": doc.id, **doc.data} for doc in docs],
+            "total_unique_users": total,
+            "next_cursor": encode_cursor({"after": next_after}) if next_after else None,
         }
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"모든 사용자 조회 중 오류: {str(e)}"
         )
+
+
+@router.post("/debug/participants/rebuild")
+async def debug_rebuild_participants():
+    """기존 게임/동의서 기록으로 참여자 레지스트리 재구성 (디버깅용, 전체 조회)"""
+    try:
+        rebuilt = await rebuild_registry(get_store())
+        return {"success": True, "participants": rebuilt}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"참여자 레지스트리 재구성 중 오류: {str(e)}"
+        )
@@ -1,58 +1,20 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import JSONResponse
-from typing import Dict, List
-import random
 from datetime import datetime
 
 from schemas.match import MatchRequest, MatchResult
-from core.firebase import get_firestore_client, verify_id_token
-
-
-# 인증 의존성 (순환 import 방지)
-async def get_current_user(request):
-    from fastapi import HTTPException, status
-
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid token"
-        )
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Firebase token"
-        )
+from core.auth import get_current_user
+from db import get_repositories
+from services.game_rules import OPPONENT_PERSONALITIES
+from services.opponent_schedule import (
+    SeedNotAllowedError,
+    client_seed,
+    generate_opponent_schedule,
+)
 
 
 router = APIRouter(prefix="/match", tags=["match"])
 
-# Trust Game 상대방 성격 유형
-OPPONENT_PERSONALITIES = [
-    {
-        "name": "Cautious Receiver",
-        "description": "신중한 수신자 - 적게 반환 (10-30%)",
-        "return_rate_range": (0.1, 0.3),
-    },
-    {
-        "name": "Fair Receiver",
-        "description": "공정한 수신자 - 적당히 반환 (40-60%)",
-        "return_rate_range": (0.4, 0.6),
-    },
-    {
-        "name": "Generous Receiver",
-        "description": "관대한 수신자 - 많이 반환 (70-90%)",
-        "return_rate_range": (0.7, 0.9),
-    },
-    {
-        "name": "Unpredictable Receiver",
-        "description": "예측 불가능한 수신자 - 랜덤 반환 (10-90%)",
-        "return_rate_range": (0.1, 0.9),
-    },
-]
-
 
 @router.get("/example")
 async def match_example():
@@ -68,22 +30,26 @@ async def match_trust_game_opponent(
         if request.game_type != "trust-game":
             raise HTTPException(status_code=400, detail="지원하지 않는 게임 타입입니다")
 
-        # 랜덤하게 상대방 성격 선택
-        selected_personality = random.choice(OPPONENT_PERSONALITIES)
+        # 상대방 성격과 전체 라운드의 상대 행동을 시드 하나로 미리 생성
+        schedule = generate_opponent_schedule(
+            seed=client_seed(request.seed), personality=request.personality
+        )
+        selected_personality = next(
+            p for p in OPPONENT_PERSONALITIES if p["name"] == schedule["personality"]
+        )
 
-        # 매칭 결과를 Firestore에 저장
-        db = get_firestore_client()
+        # 매칭 결과를 저장소에 저장 (스케줄 포함, 세션 시작 시 match_id 로 사용)
         match_data = {
             "user_id": user["uid"],
             "game_type": request.game_type,
             "matched_personality": selected_personality["name"],
             "personality_description": selected_personality["description"],
             "return_rate_range": selected_personality["return_rate_range"],
+            "opponent_schedule": schedule,
             "timestamp": datetime.utcnow().isoformat(),
         }
 
-        match_ref = db.collection("game_matches").add(match_data)
-        match_id = match_ref[1].id
+        match_id = await get_repositories().matches.add(match_data)
 
         return MatchResult(
             user_id=user["uid"],
@@ -93,6 +59,8 @@ async def match_trust_game_opponent(
             description=selected_personality["description"],
         )
 
+    except SeedNotAllowedError as e:
+        raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"매칭 중 오류: {str(e)}")
 
@@ -107,14 +75,18 @@ async def get_available_personalities():
 async def get_match_history(user=Depends(get_current_user)):
     """사용자의 매칭 기록 조회"""
     try:
-        db = get_firestore_client()
-        query = db.collection("game_matches").where("user_id", "==", user["uid"])
-        docs = query.stream()
+        docs = await get_repositories().matches.list_for_user(user["uid"])
 
+        # 상대 행동 스케줄(시드 포함)은 서버에만 둔다
         history = []
         for doc in docs:
-            data = doc.to_dict()
-            history.append(data)
+            history.append(
+                {
+                    key: value
+                    for key, value in doc.data.items()
+                    if key != "opponent_schedule"
+                }
+            )
 
         return {"match_history": history}
 
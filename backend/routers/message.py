@@ -1,56 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import JSONResponse
-from typing import List
-import random
-from datetime import datetime
-
-from schemas.message import LLMMessage, MessageRequest, MessageResponse
-from core.firebase import get_firestore_client, verify_id_token
-
-
-# 인증 의존성 (순환 import 방지)
-async def get_current_user(request):
-    from fastapi import HTTPException, status
-
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing or invalid token"
-        )
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Firebase token"
-        )
+import json
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional
+from datetime import datetime, timezone
+
+from schemas.message import MessageRequest, MessageResponse
+from core.auth import get_current_user
+from db import get_group_writer, get_repositories
+from db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
+from services.message_engine import (
+    GAME_MESSAGES,
+    MESSAGE_LONG_POLL_MAX_SECONDS,
+    message_engine,
+)
+from services.feedback_counters import (
+    counter_ops,
+    helpfulness,
+    sum_shards,
+    template_stats,
+)
 
 
 router = APIRouter(prefix="/message", tags=["message"])
 
-# 게임별 LLM 메시지 템플릿
-GAME_MESSAGES = {
-    "public_goods": [
-        "다른 플레이어들과의 협력이 모두에게 도움이 될 수 있습니다.",
-        "개인의 이익과 집단의 이익 사이의 균형을 고려해보세요.",
-        "기부는 전체 그룹의 이익을 증가시킵니다.",
-        "다른 사람들의 기부 패턴을 관찰해보세요.",
-    ],
-    "trust_game_receiver": [
-        "신뢰는 상호적입니다. 적절한 반환이 중요합니다.",
-        "상대방의 투자에 감사하며 공정하게 반환해보세요.",
-        "장기적인 관계를 고려한 결정을 내려보세요.",
-        "신뢰를 쌓는 것은 시간이 걸리지만 깨뜨리는 것은 순간입니다.",
-    ],
-    "trust_game_trustee": [
-        "상대방의 성격을 파악하여 투자 전략을 세워보세요.",
-        "적절한 투자로 상호 이익을 추구해보세요.",
-        "과도한 투자는 위험할 수 있습니다.",
-        "상대방의 반응을 통해 신뢰도를 측정해보세요.",
-    ],
-}
-
 
 @router.get("/example")
 async def message_example():
@@ -67,68 +45,128 @@ async def generate_game_message(
         if request.game_type not in GAME_MESSAGES:
             raise HTTPException(status_code=400, detail="지원하지 않는 게임 타입입니다")
 
-        # 라운드와 상황에 따른 메시지 선택 로직
-        messages = GAME_MESSAGES[request.game_type]
-
-        # 간단한 규칙 기반 메시지 선택 (실제로는 더 복잡한 LLM 로직 사용 가능)
-        if request.round <= 3:
-            # 초반 라운드: 기본 전략 안내
-            selected_message = messages[0]
-        elif request.round <= 7:
-            # 중반 라운드: 상황 분석 안내
-            selected_message = messages[1] if len(messages) > 1 else messages[0]
-        else:
-            # 후반 라운드: 고급 전략 안내
-            selected_message = random.choice(messages)
-
-        # 개인화된 메시지 추가
-        if request.performance_data:
-            if request.performance_data.get("balance", 0) > 100:
-                selected_message += " 현재 좋은 성과를 보이고 있습니다!"
-            elif request.performance_data.get("balance", 0) < 50:
-                selected_message += " 전략을 재검토해보는 것이 좋겠습니다."
-
-        # 메시지를 Firestore에 저장
-        db = get_firestore_client()
-        message_data = {
-            "user_id": user["uid"],
-            "game_type": request.game_type,
-            "round": request.round,
-            "content": selected_message,
-            "role": "assistant",
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-
-        db.collection("llm_messages").add(message_data)
+        # 같은 상황의 메시지는 캐시에서 바로 반환, 저장은 백그라운드에서 수행
+        message_data = await message_engine.generate(
+            user["uid"], request.game_type, request.round, request.performance_data
+        )
 
         return MessageResponse(
-            content=selected_message,
-            role="assistant",
-            timestamp=datetime.utcnow().isoformat(),
+            content=message_data["content"],
+            role=message_data["role"],
+            timestamp=message_data["timestamp"],
+            message_id=message_data["message_id"],
+            template_id=message_data["template_id"],
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"메시지 생성 중 오류: {str(e)}")
 
 
+def _sse(event: str, data: dict) -> str:
+    """Server-Sent Events 형식의 이벤트 하나"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/generate/stream")
+async def stream_game_message(request: MessageRequest, user=Depends(get_current_user)):
+    """게임 상황에 맞는 LLM 메시지를 SSE 로 스트리밍
+
+    ``start`` (message_id) → ``chunk`` (text) 여러 개 → ``done`` (전체 메시지) 순서로
+    보내고, 도중에 실패하면 ``error`` 이벤트로 끝낸다. 전체 메시지는 스트림이 끝난
+    뒤 저장된다.
+    """
+    if request.game_type not in GAME_MESSAGES:
+        raise HTTPException(status_code=400, detail="지원하지 않는 게임 타입입니다")
+
+    async def events():
+        try:
+            async for event, data in message_engine.stream(
+                user["uid"], request.game_type, request.round, request.performance_data
+            ):
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse("error", {"detail": f"메시지 생성 중 오류: {str(e)}"})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # 프록시 버퍼링 없이 조각을 바로 전달
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _since_timestamp(since: str) -> str:
+    """ISO 8601 시각을 저장 형식(UTC, 시간대 표기 없음)으로 정규화"""
+    try:
+        parsed = datetime.fromisoformat(since)
+    except ValueError:
+        raise ValueError("since 는 ISO 8601 시각이어야 합니다")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
 @router.get("/history")
-async def get_message_history(game_type: str = None, user=Depends(get_current_user)):
-    """사용자의 메시지 기록 조회"""
+async def get_message_history(
+    game_type: str = None,
+    since: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    wait: float = Query(0, ge=0, le=MESSAGE_LONG_POLL_MAX_SECONDS),
+    user=Depends(get_current_user),
+):
+    """사용자의 메시지 기록 조회 (시간 순, 증분 조회)
+
+    ``since`` (ISO 시각) 이후 또는 ``cursor`` 이후의 메시지만 최대 ``limit`` 개
+    반환한다. 응답의 ``next_cursor`` 는 마지막으로 받은 메시지 위치이므로 다음
+    요청에 그대로 넘기면 새 메시지만 받는다. ``wait`` 초를 주면 새 메시지가 없을 때
+    그 시간까지 기다렸다가 응답한다 (long-poll).
+    """
     try:
-        db = get_firestore_client()
-        query = db.collection("llm_messages").where("user_id", "==", user["uid"])
+        state = decode_cursor(cursor)
+        start_after = state.get("after")
+        if since:
+            since = _since_timestamp(since)
+        else:
+            since = state.get("since")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        if game_type:
-            query = query.where("game_type", "==", game_type)
+    try:
 
-        docs = query.order_by("timestamp").stream()
+        async def fetch():
+            return await get_repositories().messages.page_for_user(
+                user["uid"],
+                game_type,
+                since=since,
+                limit=limit,
+                start_after=start_after,
+            )
+
+        if wait:
+            docs, next_after = await message_engine.long_poll(user["uid"], fetch, wait)
+        else:
+            docs, next_after = await fetch()
 
         messages = []
         for doc in docs:
-            data = doc.to_dict()
-            messages.append(data)
+            messages.append(doc.data)
+
+        # 새 메시지가 없으면 받은 위치를 그대로 유지
+        if docs:
+            next_cursor = encode_cursor({"after": docs[-1].id})
+        elif start_after or since:
+            next_cursor = encode_cursor(
+                {"after": start_after} if start_after else {"since": since}
+            )
+        else:
+            next_cursor = None
 
-        return {"messages": messages}
+        return {
+            "messages": messages,
+            "next_cursor": next_cursor,
+            "has_more": next_after is not None,
+        }
 
     except Exception as e:
         raise HTTPException(
@@ -140,19 +178,63 @@ async def get_message_history(game_type: str = None, user=Depends(get_current_us
 async def save_user_feedback(
     message_id: str, helpful: bool, user=Depends(get_current_user)
 ):
-    """사용자 피드백 저장"""
+    """사용자 피드백 저장 (원본 피드백과 메시지별/템플릿별 카운터를 한 배치로)"""
     try:
-        db = get_firestore_client()
+        repositories = get_repositories()
+
+        # 템플릿 카운터를 위해 메시지의 템플릿 확인 (엔진 도입 이전 메시지는 없음).
+        # '/' 가 든 ID는 문서 경로를 깨므로 조회하지 않는다 (그런 메시지는 없음)
+        message = {}
+        if "/" not in message_id:
+            message = await repositories.messages.get(message_id) or {}
+        template_id = message.get("template_id")
+        game_type = message.get("game_type")
+
         feedback_data = {
             "user_id": user["uid"],
             "message_id": message_id,
             "helpful": helpful,
+            "template_id": template_id,
+            "game_type": game_type,
             "timestamp": datetime.utcnow().isoformat(),
         }
 
-        db.collection("message_feedback").add(feedback_data)
+        await get_group_writer().submit(
+            [
+                repositories.feedback.add_op(feedback_data),
+                *counter_ops(message_id, helpful, template_id, game_type),
+            ]
+        )
 
         return {"success": True, "message": "피드백이 저장되었습니다"}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"피드백 저장 중 오류: {str(e)}")
+
+
+@router.get("/feedback/stats")
+async def get_feedback_stats(
+    message_id: Optional[str] = None, user=Depends(get_current_user)
+):
+    """게임 타입별, 템플릿별 피드백 도움 비율 (카운터 샤드만 합산)
+
+    ``message_id`` 를 주면 해당 메시지의 집계도 함께 반환한다.
+    """
+    try:
+        feedback = get_repositories().feedback
+        stats = template_stats(await feedback.counter_shards("template"))
+
+        if message_id:
+            shards = await feedback.counter_shards("message", message_id)
+            counts = sum_shards(shards).get(message_id, {})
+            stats["message"] = {
+                "message_id": message_id,
+                **helpfulness(counts.get("helpful", 0), counts.get("not_helpful", 0)),
+            }
+
+        return stats
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"피드백 집계 조회 중 오류: {str(e)}"
+        )
@@ -1,185 +1,216 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import Dict, Any, Optional
+import asyncio
+import logging
 import os
 
-from core.firebase import get_firestore_client, verify_id_token
+from core.auth import get_current_user_optional, get_medical_record_number
+from core.response_cache import ResponseCache, Uncacheable
+from db import get_repositories
+from db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+)
+from services.report_rows import public_goods_report_rows, trust_game_report_rows
+from services.report_summary import (
+    load_summary_fields,
+    public_goods_summary,
+    trust_game_summary,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/report", tags=["report"])
 
-# 개발 환경 확인
-DEVELOPMENT = os.getenv("ENVIRONMENT", "development") == "development"
-
-
-# 옵셔널 인증 의존성 (개발 환경에서는 우회 가능)
-async def get_current_user_optional(request: Request) -> Optional[dict]:
-    auth_header = request.headers.get("Authorization")
-
-    if DEVELOPMENT and not auth_header:
-        # 개발 환경에서 토큰이 없으면 더미 사용자 반환
-        return {
-            "uid": "12345678",
-            "email": "12345678@eco.play",
-            "auth_time": 1234567890,
-            "iss": "https://securetoken.google.com/ecoplay-6fd53",
-            "aud": "ecoplay-6fd53",
-        }
-
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception as e:
-        raise HTTPException(status_code=401, detail=f"Invalid Firebase token: {str(e)}")
-
-
-# 인증 의존성
-async def get_current_user(request: Request):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-    id_token = auth_header.split(" ", 1)[1]
-    try:
-        decoded_token = verify_id_token(id_token)
-        return decoded_token
-    except Exception:
-        raise HTTPException(status_code=401, detail="Invalid Firebase token")
-
-
-@router.get("/games")
-async def get_game_report(
-    game_type: Optional[str] = None, current_user=Depends(get_current_user_optional)
+# /report/all 에서 게임별 섹션 하나에 허용하는 최대 시간(초)
+REPORT_SECTION_TIMEOUT = float(os.getenv("REPORT_SECTION_TIMEOUT", "5"))
+
+# 사용자별 리포트 응답 캐시 (라운드 제출 시 무효화)
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "2048"))
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL", "300"))
+
+# 리포트 응답에 필요한 필드만 저장소에서 가져온다 (라운드 순 정렬도 저장소에서 수행)
+PUBLIC_GOODS_REPORT_FIELDS = [
+    "round",
+    "human_contribution",
+    "human_payoff",
+    "computer_contributions",
+    "total_donated",
+    "common_pot",
+    "share_received",
+    "timestamp",
+]
+TRUST_GAME_REPORT_FIELDS = [
+    "round",
+    "role",
+    "decision",
+    "received_amount",
+    "multiplied_amount",
+    "response_time",
+    "partner_id",
+    "game_name",
+    "timestamp",
+]
+
+report_cache = ResponseCache(
+    max_entries=REPORT_CACHE_SIZE, ttl_seconds=REPORT_CACHE_TTL
+)
+
+
+async def _game_report(
+    game_type: Optional[str],
+    current_user: dict,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor_state: Optional[Dict[str, Any]] = None,
 ):
-    """게임별 리포트 조회"""
+    """게임별 리포트 조회 (라운드 순, 커서 기반 페이지)"""
+    cursor_state = cursor_state or {}
     try:
-        # 이메일에서 Medical Record Number 추출
-        email = current_user.get("email", "")
-        if "@eco.play" in email:
-            medical_record_number = email.replace("@eco.play", "")
-        else:
-            medical_record_number = current_user["uid"]  # fallback to UID
+        medical_record_number = get_medical_record_number(current_user)
 
-        db = get_firestore_client()
+        rounds = get_repositories().rounds
+        # UID 대신 Medical Record Number 사용
 
         if game_type:
             if game_type == "public_goods":
-                collection_name = "public_goods_game"
+                game = "public_goods"
             elif game_type in [
                 "trust_game",
                 "trust_game_receiver",
                 "trust_game_trustee",
             ]:
-                collection_name = "trust_game"
+                game = "trust_game"
             else:
                 raise HTTPException(
                     status_code=400, detail="지원하지 않는 게임 타입입니다"
                 )
 
-            query = db.collection(collection_name).where(
-                "user_id",
-                "==",
-                medical_record_number,  # UID 대신 Medical Record Number 사용
+            docs, next_after = await rounds.page_for_user(
+                game,
+                medical_record_number,
+                limit=limit,
+                start_after=cursor_state.get("after"),
             )
-            docs = query.stream()
 
             games = []
             for doc in docs:
-                data = doc.to_dict()
-                games.append(data)
-
-            return {"game_type": game_type, "games": games}
+                games.append(doc.data)
+
+            return {
+                "game_type": game_type,
+                "games": games,
+                "next_cursor": encode_cursor({"after": next_after})
+                if next_after
+                else None,
+            }
         else:
-            # 모든 게임 타입 조회
+            # 모든 게임 타입 조회: 컬렉션별 커서를 하나의 커서에 담는다
             all_games = {}
+            next_state = {}
+
+            async def fetch_section(name: str):
+                section_state = cursor_state.get(name)
+                if not isinstance(section_state, dict):
+                    section_state = {}
+                if section_state.get("done"):
+                    return name, [], None
+                docs, next_after = await rounds.page_for_user(
+                    name,
+                    medical_record_number,
+                    limit=limit,
+                    start_after=section_state.get("after"),
+                )
+                return name, docs, next_after
 
-            # Public Goods Game
-            pg_query = db.collection("public_goods_game").where(
-                "user_id",
-                "==",
-                medical_record_number,  # UID 대신 Medical Record Number 사용
+            # Public Goods Game / Trust Game 동시 조회
+            sections = await asyncio.gather(
+                fetch_section("public_goods"),
+                fetch_section("trust_game"),
             )
-            pg_docs = pg_query.stream()
-            all_games["public_goods"] = [doc.to_dict() for doc in pg_docs]
-
-            # Trust Game
-            tg_query = db.collection("trust_game").where(
-                "user_id",
-                "==",
-                medical_record_number,  # UID 대신 Medical Record Number 사용
-            )
-            tg_docs = tg_query.stream()
-            all_games["trust_game"] = [doc.to_dict() for doc in tg_docs]
+            for name, docs, next_after in sections:
+                all_games[name] = [doc.data for doc in docs]
+                next_state[name] = (
+                    {"after": next_after} if next_after else {"done": True}
+                )
 
-            return {"games": all_games}
+            has_more = any("after" in state for state in next_state.values())
+            return {
+                "games": all_games,
+                "next_cursor": encode_cursor(next_state) if has_more else None,
+            }
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"리포트 조회 중 오류: {str(e)}")
 
 
-@router.get("/public-goods")
-async def get_public_goods_report(current_user=Depends(get_current_user_optional)):
-    """공공재 게임 상세 리포트"""
+async def _report_rounds(
+    game: str,
+    medical_record_number: str,
+    role: Optional[str],
+    limit: Optional[int],
+    start_after: Optional[str],
+):
+    """리포트 행 (라운드 순, ``limit`` 이 있으면 한 페이지와 다음 커서)"""
+    fields = (
+        PUBLIC_GOODS_REPORT_FIELDS
+        if game == "public_goods"
+        else TRUST_GAME_REPORT_FIELDS
+    )
+    rounds = get_repositories().rounds
+    if limit is None:
+        docs = await rounds.list_for_user(
+            game, medical_record_number, role=role, select=fields
+        )
+        next_after = None
+    else:
+        docs, next_after = await rounds.page_for_user(
+            game,
+            medical_record_number,
+            role=role,
+            limit=limit,
+            start_after=start_after,
+            select=fields,
+        )
+    build_rows = (
+        public_goods_report_rows if game == "public_goods" else trust_game_report_rows
+    )
+    rows, _ = build_rows(doc.data for doc in docs)
+    return rows, encode_cursor({"after": next_after}) if next_after else None
+
+
+async def _public_goods_report(
+    current_user: dict,
+    include_rounds: bool = True,
+    limit: Optional[int] = None,
+    start_after: Optional[str] = None,
+):
+    """공공재 게임 상세 리포트
+
+    요약은 요약 문서 하나로 계산하고, 라운드 행은 ``include_rounds`` 일 때
+    전부(``limit`` 을 주면 한 페이지씩) 함께 반환한다.
+    """
     try:
-        # 이메일에서 Medical Record Number 추출
-        email = current_user.get("email", "")
-        if "@eco.play" in email:
-            medical_record_number = email.replace("@eco.play", "")
-        else:
-            medical_record_number = current_user["uid"]  # fallback to UID
+        medical_record_number = get_medical_record_number(current_user)
 
-        db = get_firestore_client()
-        query = db.collection("public_goods_game").where(
-            "user_id",
-            "==",
-            medical_record_number,  # UID 대신 Medical Record Number 사용
+        summary_task = load_summary_fields(
+            get_repositories().rounds, "public_goods", medical_record_number
+        )
+        if not include_rounds:
+            return {"summary": public_goods_summary(await summary_task)}
+
+        summary_fields, (rounds, next_cursor) = await asyncio.gather(
+            summary_task,
+            _report_rounds(
+                "public_goods", medical_record_number, None, limit, start_after
+            ),
         )
-        docs = query.stream()
-
-        rounds = []
-        total_contribution = 0
-        total_payoff = 0
-
-        for doc in docs:
-            data = doc.to_dict()
-            round_data = {
-                "round": data.get("round"),
-                "donation": data.get(
-                    "human_contribution"
-                ),  # 프론트엔드가 기대하는 필드명
-                "current_balance": data.get(
-                    "human_payoff"
-                ),  # 프론트엔드가 기대하는 필드명
-                "human_contribution": data.get("human_contribution"),
-                "computer_contributions": data.get("computer_contributions", []),
-                "human_payoff": data.get("human_payoff"),
-                "total_donated": data.get("total_donated"),
-                "common_pot": data.get("common_pot"),
-                "share_received": data.get("share_received"),
-                "partner_contribution": sum(
-                    data.get("computer_contributions", [])
-                ),  # 다른 플레이어들의 기부액 합계
-                "timestamp": data.get("timestamp"),
-            }
-            rounds.append(round_data)
-            total_contribution += data.get("human_contribution", 0)
-            total_payoff += data.get("human_payoff", 0)
-
-        # 라운드별 정렬
-        rounds.sort(key=lambda x: x.get("round", 0))
-
-        summary = {
-            "total_rounds": len(rounds),
-            "total_contribution": total_contribution,
-            "total_payoff": total_payoff,
-            "average_contribution": total_contribution / len(rounds) if rounds else 0,
-            "average_payoff": total_payoff / len(rounds) if rounds else 0,
-        }
 
-        return {"summary": summary, "rounds": rounds}
+        report = {"summary": public_goods_summary(summary_fields), "rounds": rounds}
+        if limit is not None:
+            report["next_cursor"] = next_cursor
+        return report
 
     except Exception as e:
         raise HTTPException(
@@ -187,161 +218,35 @@ async def get_public_goods_report(current_user=Depends(get_current_user_optional
         )
 
 
-@router.get("/trust-game")
-async def get_trust_game_report(
-    role: Optional[str] = None, current_user=Depends(get_current_user_optional)
+async def _trust_game_report(
+    role: Optional[str],
+    current_user: dict,
+    include_rounds: bool = True,
+    limit: Optional[int] = None,
+    start_after: Optional[str] = None,
 ):
-    """신뢰 게임 상세 리포트"""
+    """신뢰 게임 상세 리포트 (요약은 요약 문서, ``limit`` 을 주면 라운드 행은 페이지 단위)"""
     try:
-        # 이메일에서 Medical Record Number 추출
-        email = current_user.get("email", "")
-        if "@eco.play" in email:
-            medical_record_number = email.replace("@eco.play", "")
-        else:
-            medical_record_number = current_user["uid"]  # fallback to UID
-
-        db = get_firestore_client()
-        query = db.collection("trust_game").where(
-            "user_id", "==", medical_record_number
-        )  # UID 대신 Medical Record Number 사용
-
-        if role:
-            query = query.where("role", "==", role)
-
-        docs = query.stream()
-
-        rounds = []
-
-        for doc in docs:
-            data = doc.to_dict()
-
-            try:
-                # 프론트엔드가 기대하는 형태로 데이터 변환
-                role = data.get("role")
-
-                # 역할별로 다른 매핑 적용
-                if role == "trustor":  # 투자하는 사람
-                    # trustor의 손익 = 받은 금액 - 투자한 금액
-                    investment = data.get("decision", 0)
-                    received_back = data.get(
-                        "received_amount", 0
-                    )  # Firebase에는 received_amount 필드 존재
-                    profit = received_back - investment
-
-                    round_data = {
-                        "round": data.get("round"),
-                        "role": "trustor",  # 표준 용어 사용
-                        "investment": investment,  # 투자한 금액
-                        "received_amount": received_back,  # 돌려받은 금액
-                        "return_amount": 0,  # trustor는 돌려주지 않음
-                        "current_balance": profit,  # 순손익
-                        "multiplied_amount": data.get("multiplied_amount", 0),
-                        "response_time": data.get("response_time"),
-                        "partner_id": data.get("partner_id"),
-                        "game_name": data.get("game_name"),
-                        "timestamp": data.get("timestamp"),
-                    }
-                elif role == "trustee":  # 받아서 돌려주는 사람
-                    # trustee의 수익 = 받은 금액 - 돌려준 금액
-                    received = data.get("received_amount", 0)
-                    returned = data.get("decision", 0)
-                    profit = received - returned
-
-                    round_data = {
-                        "round": data.get("round"),
-                        "role": "trustee",  # 표준 용어 사용
-                        "investment": 0,  # trustee는 투자하지 않음
-                        "received_amount": received,  # 받은 금액
-                        "return_amount": returned,  # 돌려준 금액
-                        "current_balance": profit,  # 순수익
-                        "multiplied_amount": data.get("multiplied_amount", 0),
-                        "response_time": data.get("response_time"),
-                        "partner_id": data.get("partner_id"),
-                        "game_name": data.get("game_name"),
-                        "timestamp": data.get("timestamp"),
-                    }
-                else:
-                    # 기본값 (예상치 못한 역할)
-                    round_data = {
-                        "round": data.get("round"),
-                        "role": role,
-                        "investment": data.get("decision", 0),
-                        "received_amount": data.get("received_amount", 0),
-                        "return_amount": data.get("decision", 0),
-                        "current_balance": 0,  # 기본값
-                        "multiplied_amount": data.get("multiplied_amount", 0),
-                        "response_time": data.get("response_time"),
-                        "partner_id": data.get("partner_id"),
-                        "game_name": data.get("game_name"),
-                        "timestamp": data.get("timestamp"),
-                    }
-                rounds.append(round_data)
-
-            except Exception as doc_error:
-                raise doc_error
-
-        # 라운드별 정렬
-        rounds.sort(key=lambda x: x.get("round", 0))
-
-        # 변환된 역할로 통계 계산
-        trustor_rounds = [
-            r for r in rounds if r.get("role") == "trustor"
-        ]  # 투자하는 사람
-        trustee_rounds = [
-            r for r in rounds if r.get("role") == "trustee"
-        ]  # 받아서 돌려주는 사람
-
-        summary = {
-            "total_rounds": len(rounds),
-            "trustor_stats": {
-                "rounds": len(trustor_rounds),
-                "total_investment": sum(
-                    r.get("investment", 0)
-                    for r in trustor_rounds
-                    if r.get("investment") is not None
-                ),
-                "average_investment": (
-                    sum(
-                        r.get("investment", 0)
-                        for r in trustor_rounds
-                        if r.get("investment") is not None
-                    )
-                    / len(trustor_rounds)
-                )
-                if trustor_rounds
-                else 0,
-            },
-            "trustee_stats": {
-                "rounds": len(trustee_rounds),
-                "total_received": sum(
-                    r.get("received_amount", 0)
-                    for r in trustee_rounds
-                    if r.get("received_amount") is not None
-                ),
-                "total_returned": sum(
-                    r.get("return_amount", 0)
-                    for r in trustee_rounds
-                    if r.get("return_amount") is not None
-                ),
-                "average_return_rate": (
-                    sum(
-                        (
-                            r.get("return_amount", 0) / r.get("received_amount", 1)
-                            if r.get("received_amount", 0) > 0
-                            else 0
-                        )
-                        for r in trustee_rounds
-                        if r.get("return_amount") is not None
-                        and r.get("received_amount") is not None
-                    )
-                    / len(trustee_rounds)
-                )
-                if trustee_rounds
-                else 0,
-            },
-        }
+        # UID 대신 Medical Record Number 사용
+        medical_record_number = get_medical_record_number(current_user)
 
-        return {"summary": summary, "rounds": rounds}
+        summary_task = load_summary_fields(
+            get_repositories().rounds, "trust_game", medical_record_number
+        )
+        if not include_rounds:
+            return {"summary": trust_game_summary(await summary_task, role)}
+
+        summary_fields, (rounds, next_cursor) = await asyncio.gather(
+            summary_task,
+            _report_rounds(
+                "trust_game", medical_record_number, role, limit, start_after
+            ),
+        )
+
+        report = {"summary": trust_game_summary(summary_fields, role), "rounds": rounds}
+        if limit is not None:
+            report["next_cursor"] = next_cursor
+        return report
 
     except Exception as e:
         raise HTTPException(
@@ -349,35 +254,152 @@ async def get_trust_game_report(
         )
 
 
-@router.get("/all")
-async def get_all_games_report(current_user=Depends(get_current_user_optional)):
-    """모든 게임의 종합 리포트"""
+async def _report_section(name: str, coro) -> Dict[str, Any]:
+    """섹션 하나를 시간 제한과 함께 실행하고, 실패하면 실패 표시를 반환"""
     try:
-        # 각 게임별 리포트 가져오기
-        public_goods_report = await get_public_goods_report(current_user)
-        trust_game_report = await get_trust_game_report(None, current_user)
+        return await asyncio.wait_for(coro, timeout=REPORT_SECTION_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(f"{name} 리포트 시간 초과 ({REPORT_SECTION_TIMEOUT}초)")
+        return {"status": "failed", "error": "timeout"}
+    except HTTPException as e:
+        logger.error(f"{name} 리포트 실패: {e.detail}")
+        return {"status": "failed", "error": e.detail}
+    except Exception as e:
+        logger.error(f"{name} 리포트 실패: {str(e)}")
+        return {"status": "failed", "error": str(e)}
 
-        total_rounds = (
-            public_goods_report["summary"]["total_rounds"]
-            + trust_game_report["summary"]["total_rounds"]
+
+async def _all_games_report(current_user: dict, include_rounds: bool = True):
+    """모든 게임의 종합 리포트 (``include_rounds=False`` 면 요약만)"""
+    try:
+        # 각 게임별 리포트를 동시에 가져오기 (섹션별 시간 제한)
+        public_goods_report, trust_game_report = await asyncio.gather(
+            _report_section(
+                "public_goods", _public_goods_report(current_user, include_rounds)
+            ),
+            _report_section(
+                "trust_game", _trust_game_report(None, current_user, include_rounds)
+            ),
         )
 
+        sections = {
+            "public_goods": public_goods_report,
+            "trust_game": trust_game_report,
+        }
+        failed_sections = [
+            name for name, report in sections.items() if "summary" not in report
+        ]
+
+        # 실패한 섹션은 0으로 집계
+        games_played = {
+            name: report.get("summary", {}).get("total_rounds", 0)
+            for name, report in sections.items()
+        }
+
         overall_summary = {
-            "total_rounds": total_rounds,
-            "public_goods_payoff": public_goods_report["summary"]["total_payoff"],
-            "games_played": {
-                "public_goods": public_goods_report["summary"]["total_rounds"],
-                "trust_game": trust_game_report["summary"]["total_rounds"],
-            },
+            "total_rounds": sum(games_played.values()),
+            "public_goods_payoff": public_goods_report.get("summary", {}).get(
+                "total_payoff", 0
+            ),
+            "games_played": games_played,
+            "failed_sections": failed_sections,
         }
 
-        return {
+        report = {
             "overall_summary": overall_summary,
             "public_goods": public_goods_report,
             "trust_game": trust_game_report,
         }
+        # 일부 섹션이 실패한 응답은 캐시하지 않는다 (다음 요청에서 다시 시도)
+        return Uncacheable(report) if failed_sections else report
 
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"종합 리포트 조회 중 오류: {str(e)}"
         )
+
+
+# ---- 엔드포인트 (사용자별 캐시 + ETag) ----
+
+
+@router.get("/games")
+async def get_game_report(
+    request: Request,
+    game_type: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user=Depends(get_current_user_optional),
+):
+    """게임별 리포트 조회"""
+    try:
+        cursor_state = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await report_cache.respond(
+        request,
+        get_medical_record_number(current_user),
+        lambda: _game_report(game_type, current_user, limit, cursor_state),
+    )
+
+
+def _page(limit: Optional[int], cursor: Optional[str]):
+    """선택적 페이지 조회 인자 (둘 다 없으면 전체 행, 커서만 있으면 기본 페이지 크기)"""
+    try:
+        start_after = decode_cursor(cursor).get("after")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if limit is None and cursor:
+        limit = DEFAULT_PAGE_SIZE
+    return limit, start_after
+
+
+@router.get("/public-goods")
+async def get_public_goods_report(
+    request: Request,
+    include_rounds: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user=Depends(get_current_user_optional),
+):
+    """공공재 게임 상세 리포트 (``limit``/``cursor`` 를 주면 라운드 행은 페이지 단위)"""
+    limit, start_after = _page(limit, cursor)
+    return await report_cache.respond(
+        request,
+        get_medical_record_number(current_user),
+        lambda: _public_goods_report(current_user, include_rounds, limit, start_after),
+    )
+
+
+@router.get("/trust-game")
+async def get_trust_game_report(
+    request: Request,
+    role: Optional[str] = None,
+    include_rounds: bool = True,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user=Depends(get_current_user_optional),
+):
+    """신뢰 게임 상세 리포트 (``limit``/``cursor`` 를 주면 라운드 행은 페이지 단위)"""
+    limit, start_after = _page(limit, cursor)
+    return await report_cache.respond(
+        request,
+        get_medical_record_number(current_user),
+        lambda: _trust_game_report(
+            role, current_user, include_rounds, limit, start_after
+        ),
+    )
+
+
+@router.get("/all")
+async def get_all_games_report(
+    request: Request,
+    include_rounds: bool = True,
+    current_user=Depends(get_current_user_optional),
+):
+    """모든 게임의 종합 리포트"""
+    return await report_cache.respond(
+        request,
+        get_medical_record_number(current_user),
+        lambda: _all_games_report(current_user, include_rounds),
+    )
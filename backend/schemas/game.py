@@ -1,5 +1,15 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, List
+from datetime import datetime
+
+
+# 상대 성격 이름 (services.game_rules.OPPONENT_PERSONALITIES 와 같아야 함)
+OpponentPersonality = Literal[
+    "Cautious Receiver",
+    "Fair Receiver",
+    "Generous Receiver",
+    "Unpredictable Receiver",
+]
 
 
 class PublicGoodsGameRound(BaseModel):
@@ -23,18 +33,87 @@ class TrustGameRound(BaseModel):
 class PublicGoodsGameRequest(BaseModel):
     round: int
     donation: int
-    current_balance: float
+    # 세션 없이 제출할 때만 사용 (세션이 있으면 서버의 세션 잔액 사용)
+    current_balance: Optional[float] = None
+    session_id: Optional[str] = None
 
 
 class TrustGameRequest(BaseModel):
     round: int
     role: str  # 'trustor' or 'trustee'
-    current_balance: float
+    # 세션 없이 제출할 때만 사용 (세션이 있으면 서버의 세션 잔액 사용)
+    current_balance: Optional[float] = None
+    session_id: Optional[str] = None
     # For trustee (받아서 돌려주는 사람)
     received_amount: Optional[int] = None
     return_amount: Optional[int] = None
     # For trustor (투자하는 사람)
     investment: Optional[int] = None
+    # 매칭된 상대 성격 (세션 스케줄이 없을 때 상대 반환율 모델로 사용)
+    personality: Optional[OpponentPersonality] = None
+
+
+# 배치 제출 한 번에 받을 수 있는 최대 라운드 수
+MAX_BATCH_ROUNDS = 50
+# 상대 행동 스케줄 시드 최대값 (JavaScript Number 로 정확히 표현되는 범위)
+MAX_SEED = 2**53 - 1
+
+
+class PublicGoodsBatchRound(BaseModel):
+    round: int
+    donation: int
+
+
+class PublicGoodsBatchRequest(BaseModel):
+    # 첫 라운드 시작 잔액 (이후는 서버에서 이어서 계산, 세션이 있으면 세션 잔액 사용)
+    current_balance: Optional[float] = None
+    session_id: Optional[str] = None
+    rounds: List[PublicGoodsBatchRound] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_ROUNDS
+    )
+
+
+class TrustGameBatchRound(BaseModel):
+    round: int
+    role: str  # 'receiver' or 'trustee'
+    received_amount: Optional[int] = None
+    return_amount: Optional[int] = None
+    investment: Optional[int] = None
+    personality: Optional[OpponentPersonality] = None
+
+
+class TrustGameBatchRequest(BaseModel):
+    # 첫 라운드 시작 잔액 (이후는 서버에서 이어서 계산, 세션이 있으면 세션 잔액 사용)
+    current_balance: Optional[float] = None
+    session_id: Optional[str] = None
+    rounds: List[TrustGameBatchRound] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_ROUNDS
+    )
+
+
+class GameSessionStartRequest(BaseModel):
+    game: str  # 'public_goods' | 'trust_game'
+    initial_balance: Optional[float] = None
+    total_rounds: Optional[int] = Field(None, ge=1, le=MAX_BATCH_ROUNDS)
+    # 매칭 결과의 상대 행동 스케줄을 사용 (없으면 새로 생성)
+    match_id: Optional[str] = None
+    # 새 스케줄의 시드 (ALLOW_CLIENT_SEED 환경에서만, 지정하면 같은 세션을 재현)
+    seed: Optional[int] = Field(None, ge=0, le=MAX_SEED)
+
+
+class GameSessionState(BaseModel):
+    session_id: str
+    game: str
+    status: str  # 'active' | 'completed'
+    round: int  # 마지막으로 완료한 라운드
+    next_round: Optional[int] = None
+    total_rounds: int
+    balance: float
+    initial_balance: float
+    started_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+    match_id: Optional[str] = None
 
 
 class GameResult(BaseModel):
@@ -42,9 +121,13 @@ class GameResult(BaseModel):
     payoff: float
     new_balance: float
     message: str
+    round: Optional[int] = None
+    session_id: Optional[str] = None
     # Public Goods Game 상세 정보
     user_donation: Optional[int] = None
     other_donations: Optional[List[int]] = None
     total_donated: Optional[int] = None
     common_pot: Optional[float] = None
     share_per_player: Optional[float] = None
+    # Trust Game 투자 라운드에서 상대가 돌려준 금액
+    returned_amount: Optional[int] = None
@@ -1,11 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
+from schemas.game import MAX_SEED, OpponentPersonality
+
 
 class MatchRequest(BaseModel):
     user_id: str
     game_type: str  # e.g., 'trust-game'
-    personality: Optional[str] = None
+    personality: Optional[OpponentPersonality] = None
+    # 상대 행동 스케줄 시드 (ALLOW_CLIENT_SEED 환경에서만, 지정하면 같은 스케줄을 재현)
+    seed: Optional[int] = Field(None, ge=0, le=MAX_SEED)
 
 
 class MatchResult(BaseModel):
@@ -19,3 +19,5 @@ class MessageResponse(BaseModel):
     content: str
     role: str
     timestamp: str
+    message_id: Optional[str] = None
+    template_id: Optional[str] = None
@@ -0,0 +1,111 @@
+"""안내 메시지 피드백 집계 (샤딩 카운터).
+
+피드백이 들어올 때마다 원본 ``message_feedback`` 문서와 같은 배치에서 메시지별,
+템플릿별 카운터의 샤드 하나를 원자적으로 증가시킨다. 샤드는 무작위로 골라 같은
+문서에 쓰기가 몰리지 않게 하고(Firestore 문서당 쓰기 한도), 읽을 때는 샤드 문서만
+합산하므로 조회 비용이 피드백 수와 상관없이 일정하다.
+
+카운터 문서 ID는 ``{scope}:{sha256(key) 앞 32자}:{shard}`` 이다 (scope: 'message' |
+'template'). 키는 사용자가 보낸 메시지 ID일 수 있어 '/' 처럼 문서 경로를 깨는 문자가
+들어올 수 있으므로 해시로 바꾸고, 원래 키는 문서의 ``key`` 필드에 둔다 (조회와 합산은
+``scope``/``key`` 필드로 하므로 문서 ID 형식과 무관하다).
+"""
+
+import hashlib
+import os
+import random
+from typing import Any, Dict, Iterable, List, Optional
+
+from db import Document, WriteOp, increment_op
+from db.repositories import FEEDBACK_COUNTERS_COLLECTION
+
+# 카운터당 샤드 수 (늘리는 것은 언제든 가능, 줄이면 남은 샤드도 계속 합산됨)
+FEEDBACK_COUNTER_SHARDS = int(os.getenv("FEEDBACK_COUNTER_SHARDS", "10"))
+
+
+def counter_doc_id(scope: str, key: str, shard: int) -> str:
+    """카운터 샤드 문서 ID (키를 해시해 어떤 문자열이 와도 유효한 문서 ID가 되게)"""
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return f"{scope}:{digest}:{shard}"
+
+
+def counter_ops(
+    message_id: str,
+    helpful: bool,
+    template_id: Optional[str] = None,
+    game_type: Optional[str] = None,
+    shards: int = FEEDBACK_COUNTER_SHARDS,
+) -> List[WriteOp]:
+    """피드백 한 건의 카운터 증가 연산 (템플릿을 모르면 메시지 카운터만)"""
+    shard = random.randrange(shards)
+    increments = {"helpful": 1} if helpful else {"not_helpful": 1}
+    scopes = [("message", message_id)]
+    if template_id:
+        scopes.append(("template", template_id))
+
+    ops = []
+    for scope, key in scopes:
+        data = {
+            "scope": scope,
+            "key": key,
+            "shard": shard,
+            "template_id": template_id,
+            "game_type": game_type,
+        }
+        ops.append(
+            increment_op(
+                FEEDBACK_COUNTERS_COLLECTION,
+                counter_doc_id(scope, key, shard),
+                increments,
+                data,
+            )
+        )
+    return ops
+
+
+def helpfulness(helpful: int, not_helpful: int) -> Dict[str, Any]:
+    total = helpful + not_helpful
+    return {
+        "helpful": helpful,
+        "not_helpful": not_helpful,
+        "total": total,
+        "helpful_rate": helpful / total if total else None,
+    }
+
+
+def sum_shards(docs: Iterable[Document]) -> Dict[str, Dict[str, Any]]:
+    """카운터 샤드 문서를 키(메시지 ID 또는 템플릿 ID)별로 합산"""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for doc in docs:
+        data = doc.data
+        entry = totals.setdefault(
+            data["key"],
+            {"game_type": data.get("game_type"), "helpful": 0, "not_helpful": 0},
+        )
+        entry["helpful"] += int(data.get("helpful", 0))
+        entry["not_helpful"] += int(data.get("not_helpful", 0))
+    return totals
+
+
+def template_stats(docs: Iterable[Document]) -> Dict[str, Any]:
+    """템플릿 카운터 샤드로 템플릿별, 게임 타입별 도움 비율 계산"""
+    templates = []
+    game_types: Dict[str, List[int]] = {}
+    for template_id, entry in sorted(sum_shards(docs).items()):
+        templates.append(
+            {
+                "template_id": template_id,
+                "game_type": entry["game_type"],
+                **helpfulness(entry["helpful"], entry["not_helpful"]),
+            }
+        )
+        counts = game_types.setdefault(entry["game_type"], [0, 0])
+        counts[0] += entry["helpful"]
+        counts[1] += entry["not_helpful"]
+
+    return {
+        "templates": templates,
+        "game_types": {
+            game_type: helpfulness(*counts) for game_type, counts in game_types.items()
+        },
+    }
@@ -0,0 +1,161 @@
+"""게임 규칙 (라운드 하나의 보상/잔액 계산).
+
+라우터와 벤치마크, 시뮬레이션이 같은 규칙을 쓰도록 저장소나 요청 객체에
+의존하지 않는 순수 함수로 둔다.
+"""
+
+import os
+import random
+from typing import List, NamedTuple, Optional, Sequence
+
+# Public Goods Game 상수
+TOTAL_ROUNDS = 10
+INITIAL_POINTS = 100
+NUM_PLAYERS = 5
+MULTIPLIER = 1.5
+# 다른 플레이어 기부 범위 (초기 포인트 대비 비율)
+OTHER_DONATION_MAX_RATIO = 0.25
+
+# Trust Game: 투자금이 상대에게 전달될 때 곱해지는 배수
+TRUST_MULTIPLIER = 3
+
+# Trust Game 상대방 성격 유형
+OPPONENT_PERSONALITIES = [
+    {
+        "name": "Cautious Receiver",
+        "description": "신중한 수신자 - 적게 반환 (10-30%)",
+        "return_rate_range": (0.1, 0.3),
+    },
+    {
+        "name": "Fair Receiver",
+        "description": "공정한 수신자 - 적당히 반환 (40-60%)",
+        "return_rate_range": (0.4, 0.6),
+    },
+    {
+        "name": "Generous Receiver",
+        "description": "관대한 수신자 - 많이 반환 (70-90%)",
+        "return_rate_range": (0.7, 0.9),
+    },
+    {
+        "name": "Unpredictable Receiver",
+        "description": "예측 불가능한 수신자 - 랜덤 반환 (10-90%)",
+        "return_rate_range": (0.1, 0.9),
+    },
+]
+# 매칭 없이 투자 라운드를 제출했을 때 쓰는 상대 성격
+DEFAULT_OPPONENT_PERSONALITY = os.getenv(
+    "DEFAULT_OPPONENT_PERSONALITY", "Fair Receiver"
+)
+
+
+class PublicGoodsOutcome(NamedTuple):
+    total_donated: int
+    common_pot: float
+    share_per_player: float
+    payoff: float
+    new_balance: float
+
+
+class TrustGameOutcome(NamedTuple):
+    role: str  # 저장용 표준 용어: 'trustor' | 'trustee'
+    decision: int
+    received_amount: int
+    multiplied_amount: int
+    points_kept: int
+    payoff: float
+    new_balance: float
+    message: str
+
+
+def simulate_other_donations(
+    rng: random.Random,
+    num_players: int = NUM_PLAYERS,
+    initial_points: int = INITIAL_POINTS,
+) -> List[int]:
+    """다른 플레이어들의 기부 시뮬레이션 (0-25% 범위)"""
+    return [
+        rng.randint(0, int(initial_points * OTHER_DONATION_MAX_RATIO))
+        for _ in range(num_players - 1)
+    ]
+
+
+def public_goods_outcome(
+    donation: int,
+    other_donations: Sequence[int],
+    current_balance: float,
+    multiplier: float = MULTIPLIER,
+    num_players: int = NUM_PLAYERS,
+) -> PublicGoodsOutcome:
+    total_donated = donation + sum(other_donations)
+    common_pot = total_donated * multiplier
+    share_per_player = common_pot / num_players
+    payoff = share_per_player - donation
+    return PublicGoodsOutcome(
+        total_donated,
+        common_pot,
+        share_per_player,
+        payoff,
+        current_balance + payoff,
+    )
+
+
+def trustee_return_amount(investment: int, return_rate: float) -> int:
+    """상대가 3배가 된 투자금 중 돌려주는 금액 (정수, 반올림)"""
+    return int(round(investment * TRUST_MULTIPLIER * return_rate))
+
+
+def trust_game_outcome(
+    role: str,
+    current_balance: float,
+    received_amount: Optional[int] = None,
+    return_amount: Optional[int] = None,
+    investment: Optional[int] = None,
+    return_rate: Optional[float] = None,
+) -> TrustGameOutcome:
+    """요청 역할별 Trust Game 라운드 결과
+
+    요청의 'receiver' 는 받아서 돌려주는 사람(trustee), 'trustee' 는 투자하는
+    사람(trustor)으로 저장한다. 투자자 라운드의 ``return_rate`` 는 상대(컴퓨터)가
+    3배가 된 투자금 중 돌려주는 비율이다.
+    """
+    if role == "receiver":
+        # 수신자: 반환할 금액 결정
+        points_kept = received_amount - return_amount
+        return TrustGameOutcome(
+            role="trustee",
+            decision=return_amount,
+            received_amount=received_amount,
+            multiplied_amount=received_amount,
+            points_kept=points_kept,
+            payoff=points_kept,
+            new_balance=current_balance + points_kept,
+            message=f"받은 금액: {received_amount}, 반환: {return_amount}, 보유: {points_kept}",
+        )
+    if role == "trustee":
+        # 신탁자: 투자할 금액 결정, 상대는 3배가 된 금액 중 반환율만큼 돌려줌
+        multiplied_amount = investment * TRUST_MULTIPLIER
+        if return_rate is None:
+            # 상대 반환 모델 없음: 투자한 만큼 손실 (단순화)
+            return TrustGameOutcome(
+                role="trustor",
+                decision=investment,
+                received_amount=0,
+                multiplied_amount=multiplied_amount,
+                points_kept=-investment,
+                payoff=-investment,
+                new_balance=current_balance - investment,
+                message=f"투자 금액: {investment}, 상대가 받은 금액: {multiplied_amount}",
+            )
+        returned = trustee_return_amount(investment, return_rate)
+        payoff = returned - investment
+        return TrustGameOutcome(
+            role="trustor",
+            decision=investment,
+            received_amount=returned,  # 상대가 돌려준 금액
+            multiplied_amount=multiplied_amount,
+            points_kept=payoff,
+            payoff=payoff,
+            new_balance=current_balance + payoff,
+            message=f"투자 금액: {investment}, 상대가 받은 금액: {multiplied_amount}, 돌려받은 금액: {returned}",
+        )
+    raise ValueError(f"지원하지 않는 역할입니다: {role}")
@@ -0,0 +1,389 @@
+"""게임 세션 엔진.
+
+세션 시작 → 라운드 진행 → 완료 상태를 서버가 직접 관리한다. 활성 세션은
+프로세스 메모리의 LRU(+TTL) 캐시에 두고, 잔액과 다음 라운드 번호는 클라이언트가
+보낸 값 대신 세션 상태로 계산한다. 세션 상태는 ``game_sessions/{session_id}``
+스냅샷으로 비동기 저장되며(라운드 응답을 기다리게 하지 않음), 캐시에서 밀려난
+세션이나 재시작 이후의 세션은 스냅샷에서 다시 읽는다.
+
+라운드 문서 자체는 제출 요청 안에서 동기적으로 저장되므로, 스냅샷이 잠시 늦어도
+게임 기록은 유실되지 않는다.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from db import get_group_writer, get_repositories
+from db.batch import MAX_BATCH_OPS
+from services.game_rules import INITIAL_POINTS, TOTAL_ROUNDS
+
+logger = logging.getLogger(__name__)
+
+# 메모리에 유지할 최대 세션 수
+GAME_SESSION_CACHE_SIZE = int(os.getenv("GAME_SESSION_CACHE_SIZE", "10000"))
+# 마지막 사용 후 캐시에 유지할 시간(초)
+GAME_SESSION_TTL_SECONDS = float(os.getenv("GAME_SESSION_TTL_SECONDS", "3600"))
+# 스냅샷 쓰기를 모으는 대기 시간(ms)
+GAME_SESSION_SNAPSHOT_DELAY_MS = float(
+    os.getenv("GAME_SESSION_SNAPSHOT_DELAY_MS", "50")
+)
+# 스냅샷 저장 실패 후 재시도 대기 시간의 상한(ms), 실패할 때마다 두 배로 늘어남
+GAME_SESSION_SNAPSHOT_RETRY_MAX_MS = float(
+    os.getenv("GAME_SESSION_SNAPSHOT_RETRY_MAX_MS", "30000")
+)
+
+GAMES = ("public_goods", "trust_game")
+
+
+class SessionNotFoundError(LookupError):
+    pass
+
+
+class SessionStateError(ValueError):
+    """세션 상태와 맞지 않는 요청 (완료된 세션, 라운드 번호 불일치 등)"""
+
+
+class GameSession:
+    def __init__(
+        self,
+        session_id: str,
+        user_id: str,
+        medical_record_number: str,
+        game: str,
+        initial_balance: float,
+        total_rounds: int,
+        balance: Optional[float] = None,
+        round: int = 0,
+        status: str = "active",
+        rounds: Optional[List[Dict[str, Any]]] = None,
+        started_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        completed_at: Optional[datetime] = None,
+        schedule: Optional[Dict[str, Any]] = None,
+        match_id: Optional[str] = None,
+    ):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.medical_record_number = medical_record_number
+        self.game = game
+        self.initial_balance = initial_balance
+        self.total_rounds = total_rounds
+        self.balance = initial_balance if balance is None else balance
+        self.round = round  # 마지막으로 완료한 라운드 번호
+        self.status = status  # 'active' | 'completed'
+        self.rounds = rounds or []  # 이번 세션의 라운드 문서 (라운드 순)
+        self.started_at = started_at or datetime.utcnow()
+        self.updated_at = updated_at or self.started_at
+        self.completed_at = completed_at
+        # 상대 행동 스케줄 (services.opponent_schedule)
+        self.schedule = schedule
+        self.match_id = match_id
+        # 같은 세션의 라운드 제출을 순서대로 처리
+        self.lock = asyncio.Lock()
+
+    @property
+    def next_round(self) -> int:
+        return self.round + 1
+
+    @property
+    def active(self) -> bool:
+        return self.status == "active"
+
+    def check_rounds(self, round_numbers: List[int]) -> None:
+        """제출된 라운드 번호들이 다음 라운드부터 차례대로인지 확인"""
+        if not self.active:
+            raise SessionStateError("이미 완료된 세션입니다")
+        for offset, round_number in enumerate(round_numbers):
+            expected = self.next_round + offset
+            if round_number != expected:
+                raise SessionStateError(
+                    f"라운드 번호가 맞지 않습니다 (기대: {expected}, 요청: {round_number})"
+                )
+        if round_numbers and round_numbers[-1] > self.total_rounds:
+            raise SessionStateError(
+                f"세션의 라운드 수({self.total_rounds})를 넘었습니다"
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "medical_record_number": self.medical_record_number,
+            "game": self.game,
+            "status": self.status,
+            "initial_balance": self.initial_balance,
+            "balance": self.balance,
+            "round": self.round,
+            "total_rounds": self.total_rounds,
+            "rounds": list(self.rounds),
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+            "completed_at": self.completed_at,
+            "schedule": self.schedule,
+            "match_id": self.match_id,
+        }
+
+    @classmethod
+    def from_snapshot(cls, session_id: str, data: Dict[str, Any]) -> "GameSession":
+        return cls(
+            session_id,
+            data["user_id"],
+            data.get("medical_record_number", data["user_id"]),
+            data["game"],
+            data.get("initial_balance", INITIAL_POINTS),
+            data.get("total_rounds", TOTAL_ROUNDS),
+            balance=data.get("balance"),
+            round=data.get("round", 0),
+            status=data.get("status", "active"),
+            rounds=data.get("rounds"),
+            started_at=data.get("started_at"),
+            updated_at=data.get("updated_at"),
+            completed_at=data.get("completed_at"),
+            schedule=data.get("schedule"),
+            match_id=data.get("match_id"),
+        )
+
+    def state(self) -> Dict[str, Any]:
+        """API 응답용 세션 상태 (라운드 문서 제외)"""
+        return {
+            "session_id": self.session_id,
+            "game": self.game,
+            "status": self.status,
+            "round": self.round,
+            "next_round": self.next_round if self.active else None,
+            "total_rounds": self.total_rounds,
+            "balance": self.balance,
+            "initial_balance": self.initial_balance,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+            "completed_at": self.completed_at,
+            "match_id": self.match_id,
+        }
+
+
+class GameSessionEngine:
+    def __init__(
+        self,
+        max_sessions: int = GAME_SESSION_CACHE_SIZE,
+        ttl_seconds: float = GAME_SESSION_TTL_SECONDS,
+        snapshot_delay_ms: float = GAME_SESSION_SNAPSHOT_DELAY_MS,
+        retry_max_ms: float = GAME_SESSION_SNAPSHOT_RETRY_MAX_MS,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl_seconds
+        self.snapshot_delay = snapshot_delay_ms / 1000
+        self.retry_max_delay = retry_max_ms / 1000
+        # session_id -> (세션, 만료 시각)
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        # 저장을 기다리는 세션
+        self._dirty: Dict[str, GameSession] = {}
+        # 지금 저장 중인 세션
+        self._flushing: Dict[str, GameSession] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # 연속 저장 실패 횟수 (재시도 대기 시간 계산용)
+        self._failed_flushes = 0
+        self._closing = False
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.snapshots_written = 0
+        self.snapshot_failures = 0
+
+    # ---- 캐시 ----
+
+    def _cache(self, session: GameSession) -> None:
+        self._sessions[session.session_id] = (session, time.time() + self.ttl)
+        self._sessions.move_to_end(session.session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def _cached(self, session_id: str) -> Optional[GameSession]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        session, expires_at = entry
+        if expires_at <= time.time():
+            del self._sessions[session_id]
+            self.evictions += 1
+            return None
+        return session
+
+    # ---- 세션 수명 ----
+
+    def start(
+        self,
+        user_id: str,
+        medical_record_number: str,
+        game: str,
+        initial_balance: float = INITIAL_POINTS,
+        total_rounds: int = TOTAL_ROUNDS,
+        schedule: Optional[Dict[str, Any]] = None,
+        match_id: Optional[str] = None,
+    ) -> GameSession:
+        if game not in GAMES:
+            raise SessionStateError(f"지원하지 않는 게임입니다: {game}")
+        session = GameSession(
+            uuid.uuid4().hex,
+            user_id,
+            medical_record_number,
+            game,
+            initial_balance,
+            total_rounds,
+            schedule=schedule,
+            match_id=match_id,
+        )
+        self._cache(session)
+        self._mark_dirty(session)
+        return session
+
+    async def get(self, session_id: str, user_id: str) -> GameSession:
+        """세션 조회 (캐시에 없으면 스냅샷에서 복원), 다른 사용자의 세션은 찾지 못한 것으로 처리"""
+        session = (
+            self._cached(session_id)
+            # 캐시에서 밀려났어도 아직 저장 전이면 메모리의 최신 상태를 사용
+            or self._dirty.get(session_id)
+            or self._flushing.get(session_id)
+        )
+        if session is None:
+            self.misses += 1
+            data = await get_repositories().sessions.get(session_id)
+            if data is None:
+                raise SessionNotFoundError("세션을 찾을 수 없습니다")
+            # 조회하는 동안 다른 요청이 먼저 복원했으면 그 객체를 사용
+            session = self._cached(session_id) or GameSession.from_snapshot(
+                session_id, data
+            )
+        else:
+            self.hits += 1
+        if session.user_id != user_id:
+            raise SessionNotFoundError("세션을 찾을 수 없습니다")
+        self._cache(session)
+        return session
+
+    def record_rounds(self, session: GameSession, rounds: List[Dict[str, Any]]) -> None:
+        """저장이 끝난 라운드 문서를 세션 상태에 반영 (마지막 라운드면 완료)"""
+        for game_data in rounds:
+            session.rounds.append(
+                {
+                    key: value
+                    for key, value in game_data.items()
+                    if key not in ("user_id", "firebase_uid", "user_email")
+                }
+            )
+            session.round = game_data["round"]
+            session.balance = game_data["new_balance"]
+        session.updated_at = datetime.utcnow()
+        if session.round >= session.total_rounds:
+            self._complete(session)
+        self._cache(session)
+        self._mark_dirty(session)
+
+    def complete(self, session: GameSession) -> None:
+        if session.active:
+            self._complete(session)
+            self._mark_dirty(session)
+
+    @staticmethod
+    def _complete(session: GameSession) -> None:
+        session.status = "completed"
+        session.completed_at = session.updated_at = datetime.utcnow()
+
+    # ---- 비동기 스냅샷 ----
+
+    def _mark_dirty(self, session: GameSession) -> None:
+        self._dirty[session.session_id] = session
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(
+                self._flush_later(self.snapshot_delay)
+            )
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    def _retry_delay(self) -> float:
+        """연속 실패 횟수에 따른 재시도 대기 시간 (지수 백오프, 상한 있음)"""
+        return min(self.snapshot_delay * 2**self._failed_flushes, self.retry_max_delay)
+
+    def _schedule_retry(self) -> float:
+        delay = self._retry_delay()
+        task = self._flush_task
+        # 대기 중인 다른 저장 작업이 있으면 그 작업이 다시 시도한다
+        if task is None or task.done() or task is asyncio.current_task():
+            self._flush_task = asyncio.create_task(self._flush_later(delay))
+        return delay
+
+    def _requeue(self, sessions: Dict[str, GameSession]) -> None:
+        # 저장하는 동안 다시 바뀐 세션은 이미 _dirty 에 최신 객체가 있음
+        for session_id, session in sessions.items():
+            self._dirty.setdefault(session_id, session)
+
+    async def flush(self) -> None:
+        """저장을 기다리는 세션 스냅샷을 모두 기록 (실패하면 백오프 후 재시도 예약)"""
+        while self._dirty:
+            dirty, self._dirty = self._dirty, {}
+            self._flushing = dirty
+            repository = get_repositories().sessions
+            ops = [
+                repository.save_op(session_id, session.snapshot())
+                for session_id, session in dirty.items()
+            ]
+            try:
+                for start in range(0, len(ops), MAX_BATCH_OPS):
+                    await get_group_writer().submit(ops[start : start + MAX_BATCH_OPS])
+                self.snapshots_written += len(ops)
+                self._failed_flushes = 0
+            except asyncio.CancelledError:
+                self._requeue(dirty)
+                raise
+            except Exception as e:
+                self.snapshot_failures += 1
+                self._failed_flushes += 1
+                self._requeue(dirty)
+                if self._closing:
+                    logger.error(f"게임 세션 스냅샷 저장 실패: {str(e)}")
+                else:
+                    delay = self._schedule_retry()
+                    logger.error(
+                        f"게임 세션 스냅샷 저장 실패 ({delay:.2f}초 후 재시도): {str(e)}"
+                    )
+                return
+            finally:
+                self._flushing = {}
+
+    async def close(self) -> None:
+        """종료 시 남은 스냅샷 저장 (재시도 대기 중이면 기다리지 않고 바로 저장)"""
+        self._closing = True
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            # 취소된 저장 작업의 세션은 _dirty 로 돌아오므로 아래에서 다시 기록
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "pending_snapshots": len(self._dirty),
+            "snapshots_written": self.snapshots_written,
+            "snapshot_failures": self.snapshot_failures,
+            "snapshot_retry_delay": self._retry_delay() if self._failed_flushes else 0,
+        }
+
+
+session_engine = GameSessionEngine()
@@ -0,0 +1,453 @@
+"""게임 안내 메시지 엔진.
+
+메시지는 (게임 타입, 라운드 단계, 성과 구간)으로 정규화한 상황에 따라 정해지므로
+같은 상황의 메시지는 LRU(+TTL) 캐시에서 바로 꺼낸다. 생성기는 교체할 수 있고
+(``MESSAGE_GENERATOR``), 기본값은 기존 규칙 기반 템플릿 생성기다. 만들어진
+메시지는 응답을 기다리게 하지 않고 백그라운드에서 ``llm_messages`` 에 저장한다.
+
+스트리밍(``MessageEngine.stream``)은 생성기의 ``stream`` 비동기 제너레이터가 내는
+조각을 그대로 전달하고, 스트림이 끝난 뒤 전체 메시지를 캐시하고 저장한다.
+
+템플릿 생성기는 후반 라운드 메시지를 고를 때 템플릿별 피드백 도움 비율을 가중치로
+쓴다 (``message_feedback_counters``, ``MESSAGE_FEEDBACK_TTL`` 마다 갱신).
+
+메시지 기록 long-poll(``MessageEngine.long_poll``)은 이 프로세스에서 해당 사용자의
+메시지 저장이 끝나면 바로 깨어나고, 다른 워커에서 저장된 메시지를 위해 일정
+간격으로도 다시 조회한다.
+"""
+
+import asyncio
+import importlib
+import logging
+import os
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from db import get_group_writer, get_repositories
+from services.feedback_counters import sum_shards
+
+logger = logging.getLogger(__name__)
+
+# 안내 메시지 생성기: 'template', 'fake_stream' 또는 '모듈경로:팩토리'
+# (팩토리는 인자 없이 호출해 생성기를 반환)
+MESSAGE_GENERATOR = os.getenv("MESSAGE_GENERATOR", "template")
+# 상황별 메시지 캐시
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", "1024"))
+MESSAGE_CACHE_TTL = float(os.getenv("MESSAGE_CACHE_TTL", "600"))
+# fake_stream 생성기의 조각 사이 지연(ms)
+MESSAGE_FAKE_CHUNK_DELAY_MS = float(os.getenv("MESSAGE_FAKE_CHUNK_DELAY_MS", "50"))
+# 템플릿별 피드백 집계를 다시 읽는 간격(초)
+MESSAGE_FEEDBACK_TTL = float(os.getenv("MESSAGE_FEEDBACK_TTL", "60"))
+# 메시지 기록 long-poll 최대 대기 시간과 대기 중 재조회 간격(초)
+MESSAGE_LONG_POLL_MAX_SECONDS = float(os.getenv("MESSAGE_LONG_POLL_MAX_SECONDS", "25"))
+MESSAGE_LONG_POLL_RECHECK_SECONDS = float(
+    os.getenv("MESSAGE_LONG_POLL_RECHECK_SECONDS", "2")
+)
+
+# 게임별 LLM 메시지 템플릿
+GAME_MESSAGES = {
+    "public_goods": [
+        "다른 플레이어들과의 협력이 모두에게 도움이 될 수 있습니다.",
+        "개인의 이익과 집단의 이익 사이의 균형을 고려해보세요.",
+        "기부는 전체 그룹의 이익을 증가시킵니다.",
+        "다른 사람들의 기부 패턴을 관찰해보세요.",
+    ],
+    "trust_game_receiver": [
+        "신뢰는 상호적입니다. 적절한 반환이 중요합니다.",
+        "상대방의 투자에 감사하며 공정하게 반환해보세요.",
+        "장기적인 관계를 고려한 결정을 내려보세요.",
+        "신뢰를 쌓는 것은 시간이 걸리지만 깨뜨리는 것은 순간입니다.",
+    ],
+    "trust_game_trustee": [
+        "상대방의 성격을 파악하여 투자 전략을 세워보세요.",
+        "적절한 투자로 상호 이익을 추구해보세요.",
+        "과도한 투자는 위험할 수 있습니다.",
+        "상대방의 반응을 통해 신뢰도를 측정해보세요.",
+    ],
+}
+
+# 성과 구간별로 덧붙이는 문장
+_BAND_SUFFIXES = {
+    "high": " 현재 좋은 성과를 보이고 있습니다!",
+    "low": " 전략을 재검토해보는 것이 좋겠습니다.",
+    "neutral": "",
+}
+
+
+class Situation(NamedTuple):
+    game_type: str
+    phase: str  # 'early' | 'middle' | 'late'
+    band: str  # 'high' | 'low' | 'neutral'
+
+
+class GeneratedMessage(NamedTuple):
+    content: str  # 스트리밍에서는 조각 하나
+    template_id: Optional[str]
+
+
+def situation_for(
+    game_type: str, round: int, performance_data: Optional[Dict[str, Any]] = None
+) -> Situation:
+    """요청을 캐시 키가 되는 상황으로 정규화"""
+    if game_type not in GAME_MESSAGES:
+        raise ValueError(f"지원하지 않는 게임 타입입니다: {game_type}")
+    if round <= 3:
+        phase = "early"
+    elif round <= 7:
+        phase = "middle"
+    else:
+        phase = "late"
+
+    band = "neutral"
+    if performance_data:
+        balance = performance_data.get("balance", 0)
+        if balance > 100:
+            band = "high"
+        elif balance < 50:
+            band = "low"
+    return Situation(game_type, phase, band)
+
+
+class MessageGenerator(ABC):
+    """안내 메시지 생성기 인터페이스 (언어 모델 백엔드는 이 클래스를 구현)"""
+
+    @abstractmethod
+    async def generate(self, situation: Situation) -> GeneratedMessage:
+        """상황에 맞는 안내 메시지 하나를 생성"""
+
+    async def stream(self, situation: Situation) -> AsyncIterator[GeneratedMessage]:
+        """생성되는 대로 조각을 내보냄 (기본 구현: 전체 메시지 한 조각)"""
+        yield await self.generate(situation)
+
+    def use_feedback(self, template_counts: Dict[str, Dict[str, Any]]) -> None:
+        """템플릿별 피드백 집계 ({template_id: {"helpful", "not_helpful"}}) 반영 (선택)"""
+
+
+class TemplateMessageGenerator(MessageGenerator):
+    """규칙 기반 템플릿 생성기 (``rng`` 에 시드를 주면 결정적)"""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+        self.template_counts: Dict[str, Dict[str, Any]] = {}
+
+    def use_feedback(self, template_counts: Dict[str, Dict[str, Any]]) -> None:
+        self.template_counts = template_counts
+
+    def _weight(self, template_id: str) -> float:
+        # 라플라스 평활화한 도움 비율 (피드백이 없으면 0.5)
+        counts = self.template_counts.get(template_id, {})
+        helpful = counts.get("helpful", 0)
+        return (helpful + 1) / (helpful + counts.get("not_helpful", 0) + 2)
+
+    async def generate(self, situation: Situation) -> GeneratedMessage:
+        messages = GAME_MESSAGES[situation.game_type]
+        if situation.phase == "early":
+            # 초반 라운드: 기본 전략 안내
+            index = 0
+        elif situation.phase == "middle":
+            # 중반 라운드: 상황 분석 안내
+            index = 1 if len(messages) > 1 else 0
+        else:
+            # 후반 라운드: 고급 전략 안내 (피드백이 좋은 템플릿일수록 자주)
+            weights = [
+                self._weight(f"{situation.game_type}:{i}") for i in range(len(messages))
+            ]
+            index = self.rng.choices(range(len(messages)), weights)[0]
+        return GeneratedMessage(
+            messages[index] + _BAND_SUFFIXES[situation.band],
+            f"{situation.game_type}:{index}",
+        )
+
+
+class FakeStreamingMessageGenerator(TemplateMessageGenerator):
+    """템플릿 메시지를 단어 단위로 일정 간격마다 내보내는 가짜 스트리밍 백엔드 (테스트용)"""
+
+    def __init__(
+        self,
+        chunk_delay_ms: float = MESSAGE_FAKE_CHUNK_DELAY_MS,
+        rng: Optional[random.Random] = None,
+    ):
+        super().__init__(rng)
+        self.chunk_delay = chunk_delay_ms / 1000
+
+    async def stream(self, situation: Situation) -> AsyncIterator[GeneratedMessage]:
+        message = await self.generate(situation)
+        words = message.content.split(" ")
+        for index, word in enumerate(words):
+            await asyncio.sleep(self.chunk_delay)
+            piece = word if index == len(words) - 1 else word + " "
+            yield GeneratedMessage(piece, message.template_id)
+
+
+def load_generator(spec: str = MESSAGE_GENERATOR) -> MessageGenerator:
+    if spec == "template":
+        return TemplateMessageGenerator()
+    if spec == "fake_stream":
+        return FakeStreamingMessageGenerator()
+    module_name, _, factory = spec.partition(":")
+    return getattr(importlib.import_module(module_name), factory)()
+
+
+class MessageEngine:
+    def __init__(
+        self,
+        generator: Optional[MessageGenerator] = None,
+        cache_size: int = MESSAGE_CACHE_SIZE,
+        cache_ttl: float = MESSAGE_CACHE_TTL,
+    ):
+        self._generator = generator
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache: "OrderedDict[Situation, tuple]" = OrderedDict()
+        # 같은 상황의 동시 요청은 생성을 한 번만 수행
+        self._inflight: Dict[Situation, asyncio.Future] = {}
+        self._pending_writes: Set[asyncio.Task] = set()
+        # 사용자별 long-poll 대기자
+        self._watchers: Dict[str, Set[asyncio.Event]] = {}
+        self._feedback_expires = 0.0
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.persisted = 0
+        self.persist_failures = 0
+
+    @property
+    def generator(self) -> MessageGenerator:
+        if self._generator is None:
+            self._generator = load_generator()
+        return self._generator
+
+    @generator.setter
+    def generator(self, generator: MessageGenerator) -> None:
+        self._generator = generator
+        self._cache.clear()
+
+    def _cached(self, situation: Situation) -> Optional[GeneratedMessage]:
+        entry = self._cache.get(situation)
+        if entry is None or entry[1] <= time.time():
+            return None
+        self._cache.move_to_end(situation)
+        return entry[0]
+
+    def _remember(self, situation: Situation, message: GeneratedMessage) -> None:
+        self._cache[situation] = (message, time.time() + self.cache_ttl)
+        self._cache.move_to_end(situation)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def message_for(self, situation: Situation) -> GeneratedMessage:
+        """상황별 메시지 (캐시 → 진행 중인 생성 → 새로 생성)"""
+        cached = self._cached(situation)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get(situation)
+        if inflight is not None:
+            self.hits += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[situation] = future
+        try:
+            await self._refresh_feedback()
+            message = await self.generator.generate(situation)
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 경고가 남지 않도록 예외를 소비
+            future.exception()
+            raise
+        finally:
+            del self._inflight[situation]
+
+        future.set_result(message)
+        self._remember(situation, message)
+        return message
+
+    async def _refresh_feedback(self) -> None:
+        """템플릿별 피드백 집계를 생성기에 반영 (TTL 동안은 다시 읽지 않음)"""
+        if self._feedback_expires > time.time():
+            return
+        self._feedback_expires = time.time() + MESSAGE_FEEDBACK_TTL
+        try:
+            shards = await get_repositories().feedback.counter_shards("template")
+        except Exception as e:
+            # 집계를 못 읽어도 메시지 생성은 계속 (이전 가중치 유지)
+            logger.warning(f"피드백 집계 조회 실패: {str(e)}")
+            return
+        self.generator.use_feedback(sum_shards(shards))
+
+    @staticmethod
+    def _message_data(
+        user_id: str, game_type: str, round: int, message: GeneratedMessage
+    ) -> Dict[str, Any]:
+        return {
+            "message_id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "game_type": game_type,
+            "round": round,
+            "content": message.content,
+            "template_id": message.template_id,
+            "role": "assistant",
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+    async def generate(
+        self,
+        user_id: str,
+        game_type: str,
+        round: int,
+        performance_data: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """안내 메시지를 만들고 저장을 예약한 뒤 메시지 문서를 반환 (``message_id`` 포함)"""
+        message = await self.message_for(
+            situation_for(game_type, round, performance_data)
+        )
+        message_data = self._message_data(user_id, game_type, round, message)
+        self.persist(message_data)
+        return message_data
+
+    async def stream(
+        self,
+        user_id: str,
+        game_type: str,
+        round: int,
+        performance_data: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """(이벤트, 데이터) 를 차례로 내보냄: ``start`` → ``chunk``... → ``done``
+
+        캐시된 상황이면 전체 메시지를 한 조각으로 보낸다. 스트림이 끝까지 전달된
+        경우에만 메시지를 캐시하고 저장한다 (중간에 끊기면 저장하지 않음).
+        """
+        situation = situation_for(game_type, round, performance_data)
+        message_data = self._message_data(
+            user_id, game_type, round, GeneratedMessage("", None)
+        )
+        yield (
+            "start",
+            {
+                "message_id": message_data["message_id"],
+                "timestamp": message_data["timestamp"],
+            },
+        )
+
+        message = self._cached(situation)
+        if message is not None:
+            self.hits += 1
+            yield "chunk", {"text": message.content}
+        else:
+            self.misses += 1
+            await self._refresh_feedback()
+            pieces = []
+            template_id = None
+            async for chunk in self.generator.stream(situation):
+                pieces.append(chunk.content)
+                template_id = template_id or chunk.template_id
+                yield "chunk", {"text": chunk.content}
+            message = GeneratedMessage("".join(pieces), template_id)
+            self._remember(situation, message)
+
+        message_data["content"] = message.content
+        message_data["template_id"] = message.template_id
+        self.persist(message_data)
+        yield "done", message_data
+
+    def persist(self, message_data: Dict[str, Any]) -> None:
+        """``llm_messages/{message_id}`` 저장을 백그라운드로 예약"""
+        task = asyncio.create_task(self._write(message_data))
+        self._pending_writes.add(task)
+        task.add_done_callback(self._pending_writes.discard)
+
+    async def _write(self, message_data: Dict[str, Any]) -> None:
+        try:
+            await get_group_writer().submit(
+                [
+                    get_repositories().messages.save_op(
+                        message_data["message_id"], message_data
+                    )
+                ]
+            )
+            self.persisted += 1
+        except Exception as e:
+            self.persist_failures += 1
+            logger.error(f"메시지 저장 실패: {str(e)}")
+            return
+        for event in self._watchers.get(message_data["user_id"], ()):
+            event.set()
+
+    async def long_poll(
+        self,
+        user_id: str,
+        fetch: Callable[[], Awaitable[Tuple[List, Any]]],
+        timeout: float,
+        recheck: float = MESSAGE_LONG_POLL_RECHECK_SECONDS,
+    ) -> Tuple[List, Any]:
+        """``fetch()`` 의 문서 목록이 비어 있으면 새 메시지를 최대 ``timeout`` 초 기다림
+
+        ``fetch`` 는 (문서 목록, 다음 커서) 를 반환하는 조회 함수다. 이 사용자의
+        메시지가 저장되거나 ``recheck`` 초가 지날 때마다 다시 조회하고, 끝까지
+        없으면 마지막 (빈) 결과를 반환한다.
+        """
+        event = asyncio.Event()
+        watchers = self._watchers.setdefault(user_id, set())
+        # 조회 전에 등록해 조회와 대기 사이에 저장된 메시지를 놓치지 않음
+        watchers.add(event)
+        try:
+            result = await fetch()
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while not result[0]:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(event.wait(), min(remaining, recheck))
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+                result = await fetch()
+            return result
+        finally:
+            watchers.discard(event)
+            if not watchers:
+                self._watchers.pop(user_id, None)
+
+    async def close(self) -> None:
+        """종료 시 남은 메시지 저장을 기다림"""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generator": type(self.generator).__name__,
+            "cache_size": len(self._cache),
+            "max_entries": self.cache_size,
+            "ttl_seconds": self.cache_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "pending_writes": len(self._pending_writes),
+            "long_poll_waiters": sum(len(w) for w in self._watchers.values()),
+            "persisted": self.persisted,
+            "persist_failures": self.persist_failures,
+        }
+
+
+message_engine = MessageEngine()
@@ -0,0 +1,134 @@
+"""세션별 상대 플레이어 행동 스케줄.
+
+매칭(또는 세션 시작) 시점에 시드 하나로 Trust Game 상대 성격, 라운드별 반환율,
+Public Goods Game 다른 플레이어들의 라운드별 기부액을 한 번에 뽑아 둔다. 라운드
+처리기는 프로세스 전역 ``random`` 을 쓰지 않고 이 스케줄에서 값을 찾아 쓰므로,
+같은 시드로 세션을 그대로 재현할 수 있다. 스케줄과 시드는 참여자가 상대 행동을 미리
+알 수 없도록 서버에만 두고 응답에 포함하지 않는다. 세션 없는 제출이나 스케줄 범위를 벗어난
+라운드는 요청마다 새로 만든 ``random.Random`` 으로 뽑는다 (``Opponent``).
+
+저장 형식은 Firestore 가 중첩 배열을 허용하지 않으므로 라운드별 map 의 배열이다::
+
+    {"seed": ..., "personality": ..., "return_rate_range": [lo, hi],
+     "rounds": [{"round": 1, "other_donations": [...], "return_rate": 0.42}, ...]}
+"""
+
+import os
+import random
+import secrets
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from services.game_rules import (
+    INITIAL_POINTS,
+    NUM_PLAYERS,
+    OPPONENT_PERSONALITIES,
+    OTHER_DONATION_MAX_RATIO,
+    TOTAL_ROUNDS,
+)
+
+Schedule = Dict[str, Any]
+
+# 요청에서 시드 지정 허용 여부 (연구용 재현/부하 테스트 환경에서만 켠다)
+ALLOW_CLIENT_SEED = os.getenv("ALLOW_CLIENT_SEED", "false").lower() == "true"
+
+
+class SeedNotAllowedError(PermissionError):
+    pass
+
+
+def client_seed(seed: Optional[int]) -> Optional[int]:
+    """요청에서 지정한 시드 (허용되지 않은 환경에서 지정하면 SeedNotAllowedError)"""
+    if seed is not None and not ALLOW_CLIENT_SEED:
+        raise SeedNotAllowedError("상대 행동 시드는 지정할 수 없습니다")
+    return seed
+
+
+def new_seed() -> int:
+    # JavaScript Number 로 정확히 표현되는 범위 (schemas.game.MAX_SEED)
+    return secrets.randbits(53)
+
+
+def generate_opponent_schedule(
+    seed: Optional[int] = None,
+    rounds: int = TOTAL_ROUNDS,
+    personality: Optional[str] = None,
+    num_players: int = NUM_PLAYERS,
+    initial_points: int = INITIAL_POINTS,
+) -> Schedule:
+    """시드 하나로 전체 라운드의 상대 행동을 생성 (같은 인자면 같은 결과)
+
+    ``personality`` 를 주면 해당 성격으로 고정하고, 없으면 시드로 고른다.
+    """
+    if seed is None:
+        seed = new_seed()
+    rng = np.random.default_rng(seed)
+
+    # 성격 선택은 고정 여부와 상관없이 항상 뽑아 이후 난수 순서를 맞춘다
+    index = int(rng.integers(len(OPPONENT_PERSONALITIES)))
+    if personality is not None:
+        names = [p["name"] for p in OPPONENT_PERSONALITIES]
+        if personality not in names:
+            raise ValueError(f"알 수 없는 상대 성격입니다: {personality}")
+        index = names.index(personality)
+    selected = OPPONENT_PERSONALITIES[index]
+    low, high = selected["return_rate_range"]
+
+    other_donations = rng.integers(
+        0,
+        int(initial_points * OTHER_DONATION_MAX_RATIO) + 1,
+        size=(rounds, num_players - 1),
+    )
+    return_rates = rng.uniform(low, high, size=rounds).round(4)
+
+    return {
+        "seed": seed,
+        "personality": selected["name"],
+        "return_rate_range": [low, high],
+        "rounds": [
+            {
+                "round": round_number,
+                "other_donations": donations,
+                "return_rate": rate,
+            }
+            for round_number, donations, rate in zip(
+                range(1, rounds + 1), other_donations.tolist(), return_rates.tolist()
+            )
+        ],
+    }
+
+
+def scheduled_round(schedule: Optional[Schedule], round_number: int) -> Optional[Dict]:
+    """스케줄에서 해당 라운드의 상대 행동 (없으면 None)"""
+    if not schedule:
+        return None
+    rounds = schedule.get("rounds") or []
+    if 1 <= round_number <= len(rounds):
+        return rounds[round_number - 1]
+    return None
+
+
+class Opponent(NamedTuple):
+    """라운드 처리기에 넘기는 상대 행동 출처
+
+    ``schedule`` 은 세션의 스케줄(세션 없는 제출이면 None),
+    ``personality`` 는 매칭된 상대 성격, ``rng`` 는 스케줄에 없는 라운드에만 쓰는
+    요청별 난수 생성기다.
+    """
+
+    schedule: Optional[Schedule]
+    personality: Optional[str]
+    rng: random.Random
+
+    def round(self, round_number: int) -> Optional[Dict]:
+        return scheduled_round(self.schedule, round_number)
+
+
+def opponent_for(
+    schedule: Optional[Schedule], personality: Optional[str] = None
+) -> Opponent:
+    """스케줄의 성격(없으면 ``personality``)으로 상대 행동 출처 생성"""
+    if schedule and schedule.get("personality"):
+        personality = schedule["personality"]
+    return Opponent(schedule, personality, random.Random())
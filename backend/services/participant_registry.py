@@ -0,0 +1,119 @@
+"""참여자 레지스트리.
+
+``participants/{medical_record_number}`` 문서 하나에 참여자의 첫/마지막 활동
+시각, 동의서 제출 수, 게임별 라운드 수를 유지한다. 동의서 제출과 라운드 제출
+시 해당 쓰기와 같은 배치로 갱신되므로, 참여자 목록은 게임 기록 전체를 훑지
+않고 이 컬렉션만 페이지 단위로 읽으면 된다.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from db import WriteOp, increment_op, set_op
+
+PARTICIPANTS_COLLECTION = "participants"
+
+# 이 프로세스에서 이미 존재를 확인한 참여자 (first_activity_at 중복 기록 방지)
+_known_participants: set = set()
+# 메모리 사용 상한
+_KNOWN_PARTICIPANTS_LIMIT = 100_000
+
+
+async def _activity_fields(store, medical_record_number: str) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    fields: Dict[str, Any] = {
+        "medical_record_number": medical_record_number,
+        "last_activity_at": now,
+    }
+    if medical_record_number not in _known_participants:
+        if await store.get(PARTICIPANTS_COLLECTION, medical_record_number) is None:
+            fields["first_activity_at"] = now
+        if len(_known_participants) >= _KNOWN_PARTICIPANTS_LIMIT:
+            _known_participants.clear()
+        _known_participants.add(medical_record_number)
+    return fields
+
+
+async def round_registry_op(
+    store, medical_record_number: str, game: str, rounds: int = 1
+) -> WriteOp:
+    """라운드 제출과 같은 배치에 넣을 레지스트리 갱신 연산 (game: 'public_goods' | 'trust_game')"""
+    return increment_op(
+        PARTICIPANTS_COLLECTION,
+        medical_record_number,
+        {f"{game}_rounds": rounds},
+        await _activity_fields(store, medical_record_number),
+    )
+
+
+async def consent_registry_op(store, medical_record_number: str) -> WriteOp:
+    """동의서 제출과 같은 배치에 넣을 레지스트리 갱신 연산"""
+    fields = await _activity_fields(store, medical_record_number)
+    fields["last_consent_at"] = fields["last_activity_at"]
+    return increment_op(
+        PARTICIPANTS_COLLECTION, medical_record_number, {"consent_count": 1}, fields
+    )
+
+
+def _medical_record_number(data: Dict[str, Any]) -> Optional[str]:
+    email = data.get("user_email") or ""
+    if "@eco.play" in email:
+        return email.replace("@eco.play", "")
+    return data.get("user_id")
+
+
+async def rebuild_registry(store) -> int:
+    """기존 게임/동의서 기록 전체로 레지스트리를 재구성 (레지스트리 도입 이전 데이터용)"""
+    collections = {
+        "public_goods_rounds": "public_goods_game",
+        "trust_game_rounds": "trust_game",
+        "consent_count": "basic_info",
+    }
+    results = await asyncio.gather(
+        *(
+            store.query(
+                collection_name,
+                select=["user_id", "user_email", "timestamp", "consent_timestamp"],
+            )
+            for collection_name in collections.values()
+        )
+    )
+
+    registry: Dict[str, Dict[str, Any]] = {}
+    for counter, docs in zip(collections, results):
+        for doc in docs:
+            medical_record_number = _medical_record_number(doc.data)
+            if not medical_record_number:
+                continue
+            entry = registry.setdefault(
+                medical_record_number,
+                {
+                    "medical_record_number": medical_record_number,
+                    "public_goods_rounds": 0,
+                    "trust_game_rounds": 0,
+                    "consent_count": 0,
+                },
+            )
+            entry[counter] += 1
+            timestamp = doc.data.get("timestamp") or doc.data.get("consent_timestamp")
+            if isinstance(timestamp, datetime):
+                timestamp = timestamp.replace(tzinfo=None)
+                if entry.get("first_activity_at") is None or (
+                    timestamp < entry["first_activity_at"]
+                ):
+                    entry["first_activity_at"] = timestamp
+                if entry.get("last_activity_at") is None or (
+                    timestamp > entry["last_activity_at"]
+                ):
+                    entry["last_activity_at"] = timestamp
+
+    ops = [
+        set_op(PARTICIPANTS_COLLECTION, medical_record_number, entry, merge=True)
+        for medical_record_number, entry in registry.items()
+    ]
+    # WriteBatch 한도에 맞춰 나누어 커밋
+    for start in range(0, len(ops), 400):
+        await store.commit_batch(ops[start : start + 400])
+    _known_participants.update(registry)
+    return len(registry)
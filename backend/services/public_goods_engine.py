@@ -0,0 +1,229 @@
+"""Public Goods Game 배치 시뮬레이션 엔진 (NumPy).
+
+``services.game_rules`` 의 라운드 규칙을 (세션 × 라운드) 배열에 한 번에 적용하여,
+연구 전 ``MULTIPLIER``, ``NUM_PLAYERS``, ``INITIAL_POINTS`` 와 다른 플레이어 기부
+범위를 보정하는 파라미터 스윕을 빠르게 돌린다. 세션은 ``chunk_size`` 단위로 나눠
+계산하므로 수백만 세션도 메모리 한도 안에서 처리된다.
+
+실행 (backend 디렉토리에서):
+    python -m services.public_goods_engine --sessions 1000000 --multiplier 1.2 1.5 2.0
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from services.game_rules import (
+    INITIAL_POINTS,
+    MULTIPLIER,
+    NUM_PLAYERS,
+    OTHER_DONATION_MAX_RATIO,
+    TOTAL_ROUNDS,
+)
+
+# 사람 플레이어 기부 정책: 고정값 또는 [low, high] 균등 분포
+DonationPolicy = Union[int, Tuple[int, int]]
+
+DEFAULT_CHUNK_SIZE = 100_000
+# 기본값은 다른 플레이어와 같은 범위
+DEFAULT_HUMAN_DONATION: DonationPolicy = (
+    0,
+    int(INITIAL_POINTS * OTHER_DONATION_MAX_RATIO),
+)
+_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class PublicGoodsParams(NamedTuple):
+    multiplier: float = MULTIPLIER
+    num_players: int = NUM_PLAYERS
+    initial_points: int = INITIAL_POINTS
+    other_donation_max_ratio: float = OTHER_DONATION_MAX_RATIO
+    rounds: int = TOTAL_ROUNDS
+
+    @property
+    def other_donation_max(self) -> int:
+        # 라우터와 같은 규칙: randint(0, int(INITIAL_POINTS * 0.25))
+        return int(self.initial_points * self.other_donation_max_ratio)
+
+
+class SimulationResult(NamedTuple):
+    params: PublicGoodsParams
+    final_balances: np.ndarray  # (sessions,)
+    total_payoffs: np.ndarray  # (sessions,)
+    round_payoff_mean: np.ndarray  # (rounds,)
+    round_balance_mean: np.ndarray  # (rounds,)
+
+    def summary(self) -> Dict[str, Any]:
+        """분포 요약 (JSON 직렬화 가능)"""
+        return {
+            "params": self.params._asdict(),
+            "sessions": int(self.final_balances.size),
+            "final_balance": _distribution(self.final_balances),
+            "total_payoff": _distribution(self.total_payoffs),
+            "round_payoff_mean": self.round_payoff_mean.round(4).tolist(),
+            "round_balance_mean": self.round_balance_mean.round(4).tolist(),
+        }
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    percentiles = np.percentile(values, _PERCENTILES)
+    stats = {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+    for q, value in zip(_PERCENTILES, percentiles):
+        stats[f"p{q}"] = float(value)
+    return stats
+
+
+def _human_donations(
+    rng: np.random.Generator, shape: Tuple[int, int], policy: DonationPolicy
+) -> np.ndarray:
+    if isinstance(policy, tuple):
+        low, high = policy
+        return rng.integers(low, high + 1, size=shape, dtype=np.int64)
+    return np.full(shape, policy, dtype=np.int64)
+
+
+def round_payoffs(
+    human_donations: np.ndarray,
+    other_donations: np.ndarray,
+    params: PublicGoodsParams,
+) -> np.ndarray:
+    """라운드별 보상 (``game_rules.public_goods_outcome`` 의 배열 버전)
+
+    ``human_donations`` 는 (세션, 라운드), ``other_donations`` 는
+    (세션, 라운드, 다른 플레이어) 모양이다.
+    """
+    total_donated = human_donations + other_donations.sum(axis=-1)
+    share_per_player = total_donated * (params.multiplier / params.num_players)
+    return share_per_player - human_donations
+
+
+def simulate_public_goods(
+    sessions: int,
+    params: PublicGoodsParams = PublicGoodsParams(),
+    human_donation: DonationPolicy = DEFAULT_HUMAN_DONATION,
+    seed: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> SimulationResult:
+    """``sessions`` 개 세션 × ``params.rounds`` 라운드를 시뮬레이션
+
+    같은 ``seed`` 와 ``chunk_size`` 면 결과가 같다.
+    """
+    rng = np.random.default_rng(seed)
+    final_balances = np.empty(sessions, dtype=np.float64)
+    total_payoffs = np.empty(sessions, dtype=np.float64)
+    round_payoff_sum = np.zeros(params.rounds, dtype=np.float64)
+    round_balance_sum = np.zeros(params.rounds, dtype=np.float64)
+
+    for start in range(0, sessions, chunk_size):
+        n = min(chunk_size, sessions - start)
+        humans = _human_donations(rng, (n, params.rounds), human_donation)
+        others = rng.integers(
+            0,
+            params.other_donation_max + 1,
+            size=(n, params.rounds, params.num_players - 1),
+            dtype=np.int64,
+        )
+        payoffs = round_payoffs(humans, others, params)
+        balances = params.initial_points + np.cumsum(payoffs, axis=1)
+
+        final_balances[start : start + n] = balances[:, -1]
+        total_payoffs[start : start + n] = balances[:, -1] - params.initial_points
+        round_payoff_sum += payoffs.sum(axis=0)
+        round_balance_sum += balances.sum(axis=0)
+
+    return SimulationResult(
+        params,
+        final_balances,
+        total_payoffs,
+        round_payoff_sum / max(sessions, 1),
+        round_balance_sum / max(sessions, 1),
+    )
+
+
+# ---- CLI (파라미터 스윕) ----
+
+
+def _donation_policy(value: str) -> DonationPolicy:
+    """'10' 또는 '0-25' 형식"""
+    if "-" in value:
+        low, high = value.split("-", 1)
+        return int(low), int(high)
+    return int(value)
+
+
+def main_cli(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Public Goods Game 파라미터 스윕 (조합마다 JSON 한 줄 출력)"
+    )
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[TOTAL_ROUNDS])
+    parser.add_argument("--multiplier", type=float, nargs="+", default=[MULTIPLIER])
+    parser.add_argument("--num-players", type=int, nargs="+", default=[NUM_PLAYERS])
+    parser.add_argument(
+        "--initial-points", type=int, nargs="+", default=[INITIAL_POINTS]
+    )
+    parser.add_argument(
+        "--other-max-ratio",
+        type=float,
+        nargs="+",
+        default=[OTHER_DONATION_MAX_RATIO],
+        help="다른 플레이어 기부 상한 (초기 포인트 대비 비율)",
+    )
+    parser.add_argument(
+        "--human-donation",
+        type=_donation_policy,
+        nargs="+",
+        default=[DEFAULT_HUMAN_DONATION],
+        help="사람 플레이어 기부: 고정값(예: 10) 또는 범위(예: 0-25)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--output", help="결과 JSON Lines 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for (
+            rounds,
+            multiplier,
+            num_players,
+            initial_points,
+            ratio,
+            donation,
+        ) in itertools.product(
+            args.rounds,
+            args.multiplier,
+            args.num_players,
+            args.initial_points,
+            args.other_max_ratio,
+            args.human_donation,
+        ):
+            params = PublicGoodsParams(
+                multiplier, num_players, initial_points, ratio, rounds
+            )
+            started = time.perf_counter()
+            result = simulate_public_goods(
+                args.sessions, params, donation, args.seed, args.chunk_size
+            )
+            summary = result.summary()
+            summary["human_donation"] = donation
+            summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+            out.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main_cli()
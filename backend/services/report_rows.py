@@ -0,0 +1,168 @@
+"""라운드 문서를 리포트/기록 응답 행으로 변환.
+
+리포트 행 함수는 응답 행과 함께 같은 순회로 요약 필드(``report_summary`` 형식)도
+돌려준다. 리포트 요약은 집계 문서에서 읽으므로, 이 값은 집계와 라운드 기록을
+대조하는 용도(벤치마크, 점검)로 쓴다.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+Row = Dict[str, Any]
+Rounds = Iterable[Mapping[str, Any]]
+
+
+# ---- /game/history ----
+
+
+def _public_goods_history_row(data: Mapping[str, Any]) -> Row:
+    return {
+        "round": data.get("round"),
+        "donation": data.get("human_contribution"),
+        "current_balance": data.get("new_balance"),
+        "partner_contribution": sum(data.get("computer_contributions", [])),
+        "timestamp": data.get("timestamp"),
+    }
+
+
+def _trust_game_receiver_history_row(data: Mapping[str, Any]) -> Row:
+    return {
+        "round": data.get("round"),
+        "received": data.get("received_amount"),
+        "returned": data.get("decision"),
+        "current_balance": data.get("new_balance"),
+        "timestamp": data.get("timestamp"),
+    }
+
+
+def _trust_game_trustee_history_row(data: Mapping[str, Any]) -> Row:
+    return {
+        "round": data.get("round"),
+        "invested": data.get("decision"),
+        "received_back": data.get("returned_amount"),
+        "current_balance": data.get("new_balance"),
+        "timestamp": data.get("timestamp"),
+    }
+
+
+_HISTORY_ROWS: Dict[str, Callable[[Mapping[str, Any]], Row]] = {
+    "public_goods": _public_goods_history_row,
+    "trust_game_receiver": _trust_game_receiver_history_row,
+    "trust_game_trustee": _trust_game_trustee_history_row,
+}
+
+
+def history_rows(game_type: str, rounds: Rounds) -> List[Row]:
+    """게임 기록 응답 행 (game_type: 'public_goods' | 'trust_game_receiver' | 'trust_game_trustee')"""
+    row = _HISTORY_ROWS[game_type]
+    return [row(data) for data in rounds]
+
+
+# ---- /report/public-goods ----
+
+
+def public_goods_report_rows(rounds: Rounds) -> Tuple[List[Row], Dict[str, Any]]:
+    """공공재 게임 리포트 행과 요약 필드"""
+    rows = []
+    total_contribution = 0
+    total_payoff = 0
+    for data in rounds:
+        contribution = data.get("human_contribution")
+        payoff = data.get("human_payoff")
+        computer_contributions = data.get("computer_contributions", [])
+        rows.append(
+            {
+                "round": data.get("round"),
+                "donation": contribution,  # 프론트엔드가 기대하는 필드명
+                "current_balance": payoff,  # 프론트엔드가 기대하는 필드명
+                "human_contribution": contribution,
+                "computer_contributions": computer_contributions,
+                "human_payoff": payoff,
+                "total_donated": data.get("total_donated"),
+                "common_pot": data.get("common_pot"),
+                "share_received": data.get("share_received"),
+                # 다른 플레이어들의 기부액 합계
+                "partner_contribution": sum(computer_contributions),
+                "timestamp": data.get("timestamp"),
+            }
+        )
+        total_contribution += contribution or 0
+        total_payoff += payoff or 0
+
+    fields = {
+        "pg_rounds": len(rows),
+        "pg_total_contribution": total_contribution,
+        "pg_total_payoff": total_payoff,
+        "pg_seeded": True,
+    }
+    return rows, fields
+
+
+# ---- /report/trust-game ----
+
+
+def trust_game_report_rows(rounds: Rounds) -> Tuple[List[Row], Dict[str, Any]]:
+    """신뢰 게임 리포트 행과 요약 필드"""
+    rows = []
+    trustor_rounds = trustee_rounds = 0
+    total_investment = total_received = total_returned = return_rate_sum = 0
+    for data in rounds:
+        role = data.get("role")
+        decision = data.get("decision", 0)
+        received_amount = data.get("received_amount", 0)
+
+        # 역할별로 다른 매핑 적용
+        if role == "trustor":  # 투자하는 사람
+            # trustor의 손익 = 받은 금액 - 투자한 금액
+            investment = decision
+            received = received_amount
+            returned = 0  # trustor는 돌려주지 않음
+            profit = received_amount - decision
+            trustor_rounds += 1
+            total_investment += decision or 0
+        elif role == "trustee":  # 받아서 돌려주는 사람
+            # trustee의 수익 = 받은 금액 - 돌려준 금액
+            investment = 0  # trustee는 투자하지 않음
+            received = received_amount
+            returned = decision
+            profit = received_amount - decision
+            trustee_rounds += 1
+            received_value = received_amount or 0
+            returned_value = decision or 0
+            total_received += received_value
+            total_returned += returned_value
+            if received_value > 0:
+                return_rate_sum += returned_value / received_value
+        else:
+            # 기본값 (예상치 못한 역할)
+            investment = decision
+            received = received_amount
+            returned = decision
+            profit = 0
+
+        rows.append(
+            {
+                "round": data.get("round"),
+                "role": role,
+                "investment": investment,
+                "received_amount": received,
+                "return_amount": returned,
+                "current_balance": profit,  # 순손익
+                "multiplied_amount": data.get("multiplied_amount", 0),
+                "response_time": data.get("response_time"),
+                "partner_id": data.get("partner_id"),
+                "game_name": data.get("game_name"),
+                "timestamp": data.get("timestamp"),
+            }
+        )
+
+    fields = {
+        "tg_rounds": len(rows),
+        "tg_trustor_rounds": trustor_rounds,
+        "tg_total_investment": total_investment,
+        "tg_trustee_rounds": trustee_rounds,
+        "tg_total_received": total_received,
+        "tg_total_returned": total_returned,
+        "tg_return_rate_sum": return_rate_sum,
+        "tg_seeded": True,
+    }
+    return rows, fields
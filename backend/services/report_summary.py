@@ -0,0 +1,160 @@
+"""사용자별 리포트 요약 집계.
+
+라운드가 제출될 때마다 ``report_aggregates/{medical_record_number}`` 문서의 누적
+필드를 원자적으로 증가시켜 두고(라운드 문서에는 ``summarized`` 표시), 리포트
+요약은 이 문서 하나를 읽어 계산한다. ``*_seeded`` 플래그가 없는 사용자는 표시가
+없는 라운드(집계 도입 이전 기록)의 합계를 한 번만 더한다.
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from db import WriteOp, increment_op
+from db.repositories import SUMMARY_COLLECTION, RoundRepository
+
+# 게임별 "이전 라운드 반영 완료" 플래그
+SEEDED_FLAGS = {"public_goods": "pg_seeded", "trust_game": "tg_seeded"}
+# 이전 라운드 합계 계산에 필요한 필드
+SEED_FIELDS = {
+    "public_goods": ["human_contribution", "human_payoff", "summarized"],
+    "trust_game": ["role", "decision", "received_amount", "summarized"],
+}
+
+
+def _return_rate(received: float, returned: float) -> float:
+    return returned / received if received > 0 else 0
+
+
+# ---- 라운드 제출 시 증가분 ----
+
+
+def public_goods_increments(contribution: float, payoff: float) -> Dict[str, float]:
+    return {
+        "pg_rounds": 1,
+        "pg_total_contribution": contribution,
+        "pg_total_payoff": payoff,
+    }
+
+
+def trust_game_increments(
+    role: str, decision: float, received_amount: Optional[float]
+) -> Dict[str, float]:
+    increments = {"tg_rounds": 1}
+    if role == "trustor":
+        increments["tg_trustor_rounds"] = 1
+        increments["tg_total_investment"] = decision or 0
+    elif role == "trustee":
+        received = received_amount or 0
+        returned = decision or 0
+        increments["tg_trustee_rounds"] = 1
+        increments["tg_total_received"] = received
+        increments["tg_total_returned"] = returned
+        increments["tg_return_rate_sum"] = _return_rate(received, returned)
+    return increments
+
+
+def round_increments(game: str, data: Mapping[str, Any]) -> Dict[str, float]:
+    """라운드 문서 하나의 요약 증가분"""
+    if game == "public_goods":
+        return public_goods_increments(
+            data.get("human_contribution") or 0, data.get("human_payoff") or 0
+        )
+    return trust_game_increments(
+        data.get("role"), data.get("decision"), data.get("received_amount")
+    )
+
+
+def sum_increments(game: str, rounds: Iterable[Mapping[str, Any]]) -> Dict[str, float]:
+    totals: Dict[str, float] = {}
+    for data in rounds:
+        for field, value in round_increments(game, data).items():
+            totals[field] = totals.get(field, 0) + value
+    return totals
+
+
+def summary_increment_op(
+    medical_record_number: str, increments: Dict[str, float]
+) -> WriteOp:
+    """라운드 문서와 같은 배치에 넣을 요약 증가 연산 (리포트와 같은 MRN 기준)"""
+    return increment_op(SUMMARY_COLLECTION, medical_record_number, increments)
+
+
+async def load_summary_fields(
+    rounds: RoundRepository, game: str, medical_record_number: str
+) -> Dict[str, Any]:
+    """리포트 요약 필드 (보통 문서 한 번 조회, 처음 한 번만 이전 라운드 반영)"""
+    fields = await rounds.summary_fields(game, medical_record_number)
+    if fields.get(SEEDED_FLAGS[game]):
+        return fields
+
+    docs = await rounds.list_for_user(
+        game, medical_record_number, select=SEED_FIELDS[game]
+    )
+    legacy = (doc.data for doc in docs if not doc.data.get("summarized"))
+    await rounds.seed_summary_fields(
+        game,
+        medical_record_number,
+        sum_increments(game, legacy),
+        SEEDED_FLAGS[game],
+    )
+    return await rounds.summary_fields(game, medical_record_number)
+
+
+# ---- 리포트 응답 형태로 변환 ----
+
+
+def public_goods_summary(fields: Mapping[str, Any]) -> Dict[str, Any]:
+    total_rounds = fields.get("pg_rounds", 0)
+    total_contribution = fields.get("pg_total_contribution", 0)
+    total_payoff = fields.get("pg_total_payoff", 0)
+    return {
+        "total_rounds": total_rounds,
+        "total_contribution": total_contribution,
+        "total_payoff": total_payoff,
+        "average_contribution": total_contribution / total_rounds
+        if total_rounds
+        else 0,
+        "average_payoff": total_payoff / total_rounds if total_rounds else 0,
+    }
+
+
+def trust_game_summary(
+    fields: Mapping[str, Any], role: Optional[str] = None
+) -> Dict[str, Any]:
+    trustor_rounds = fields.get("tg_trustor_rounds", 0)
+    trustee_rounds = fields.get("tg_trustee_rounds", 0)
+    total_investment = fields.get("tg_total_investment", 0)
+
+    # role 필터가 있으면 해당 역할의 라운드만 반영
+    if role == "trustor":
+        trustee_rounds = 0
+        total_rounds = trustor_rounds
+    elif role == "trustee":
+        trustor_rounds = 0
+        total_rounds = trustee_rounds
+    elif role:
+        trustor_rounds = trustee_rounds = total_rounds = 0
+    else:
+        total_rounds = fields.get("tg_rounds", 0)
+
+    return {
+        "total_rounds": total_rounds,
+        "trustor_stats": {
+            "rounds": trustor_rounds,
+            "total_investment": total_investment if trustor_rounds else 0,
+            "average_investment": total_investment / trustor_rounds
+            if trustor_rounds
+            else 0,
+        },
+        "trustee_stats": {
+            "rounds": trustee_rounds,
+            "total_received": fields.get("tg_total_received", 0)
+            if trustee_rounds
+            else 0,
+            "total_returned": fields.get("tg_total_returned", 0)
+            if trustee_rounds
+            else 0,
+            "average_return_rate": fields.get("tg_return_rate_sum", 0) / trustee_rounds
+            if trustee_rounds
+            else 0,
+        },
+    }
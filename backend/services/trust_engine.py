@@ -0,0 +1,213 @@
+"""Trust Game 상대(수탁자) 반환 엔진.
+
+매칭된 상대 성격의 ``return_rate_range`` 로 라운드별 반환율을 정하고, 3배가 된
+투자금 중 그 비율만큼 투자자에게 돌려준다. 요청 처리에서는 라운드 하나의
+반환율을 뽑고(``draw_return_rate``), 연구용으로는 투자 전략 × 성격 조합을 수천
+게임씩 NumPy 배열로 한 번에 시뮬레이션한다(``simulate_trust_games``).
+
+실행 (backend 디렉토리에서):
+    python -m services.trust_engine --games 10000 --strategy fixed:10 fraction:0.2
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from services.game_rules import (
+    INITIAL_POINTS,
+    OPPONENT_PERSONALITIES,
+    TOTAL_ROUNDS,
+    TRUST_MULTIPLIER,
+)
+
+_PERSONALITIES = {p["name"]: p for p in OPPONENT_PERSONALITIES}
+_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def personality(name: str) -> Dict[str, Any]:
+    if name not in _PERSONALITIES:
+        raise ValueError(f"알 수 없는 상대 성격입니다: {name}")
+    return _PERSONALITIES[name]
+
+
+def draw_return_rate(personality_name: str, rng: random.Random) -> float:
+    """상대 성격의 반환율 범위에서 반환율 하나"""
+    low, high = personality(personality_name)["return_rate_range"]
+    return round(rng.uniform(low, high), 4)
+
+
+# ---- 배치 시뮬레이션 ----
+
+
+class InvestorStrategy(NamedTuple):
+    """투자 전략: 'fixed' 는 매 라운드 고정 금액, 'fraction' 은 현재 잔액의 비율"""
+
+    kind: str
+    value: float
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}:{self.value:g}"
+
+    def investments(self, balances: np.ndarray) -> np.ndarray:
+        if self.kind == "fixed":
+            amounts = np.full(balances.shape, self.value)
+        elif self.kind == "fraction":
+            amounts = np.floor(balances * self.value)
+        else:
+            raise ValueError(f"알 수 없는 투자 전략입니다: {self.kind}")
+        # 잔액보다 많이 투자할 수 없음
+        return np.clip(np.floor(amounts), 0, np.floor(balances))
+
+    @classmethod
+    def parse(cls, text: str) -> "InvestorStrategy":
+        """'fixed:10' 또는 'fraction:0.2' 형식"""
+        kind, _, value = text.partition(":")
+        strategy = cls(kind, float(value))
+        strategy.investments(np.zeros(1))  # 형식 확인
+        return strategy
+
+
+class TrustSimulationResult(NamedTuple):
+    strategy: InvestorStrategy
+    personality: str
+    final_balances: np.ndarray  # (games,)
+    total_invested: np.ndarray  # (games,)
+    total_returned: np.ndarray  # (games,)
+
+    def summary(self) -> Dict[str, Any]:
+        invested = self.total_invested.sum()
+        return {
+            "strategy": self.strategy.name,
+            "personality": self.personality,
+            "games": int(self.final_balances.size),
+            "final_balance": _distribution(self.final_balances),
+            "mean_total_invested": float(self.total_invested.mean()),
+            "mean_total_returned": float(self.total_returned.mean()),
+            # 투자 1점당 돌려받은 점수
+            "return_per_point": float(self.total_returned.sum() / invested)
+            if invested
+            else 0.0,
+        }
+
+
+def _distribution(values: np.ndarray) -> Dict[str, float]:
+    stats = {
+        "mean": float(values.mean()),
+        "std": float(values.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+    for q, value in zip(_PERCENTILES, np.percentile(values, _PERCENTILES)):
+        stats[f"p{q}"] = float(value)
+    return stats
+
+
+def simulate_trust_games(
+    strategy: InvestorStrategy,
+    personality_name: str,
+    games: int,
+    rounds: int = TOTAL_ROUNDS,
+    initial_points: float = INITIAL_POINTS,
+    seed: Optional[int] = None,
+) -> TrustSimulationResult:
+    """투자 전략 하나를 상대 성격 하나와 ``games`` 번 겨룬 결과
+
+    라운드 사이에는 잔액이 이어지므로 라운드는 순서대로, 게임은 배열로 한 번에
+    계산한다. 반환 금액 계산은 ``game_rules.trustee_return_amount`` 와 같다.
+    """
+    low, high = personality(personality_name)["return_rate_range"]
+    rng = np.random.default_rng(seed)
+    return_rates = rng.uniform(low, high, size=(rounds, games)).round(4)
+
+    balances = np.full(games, float(initial_points))
+    total_invested = np.zeros(games)
+    total_returned = np.zeros(games)
+    for round_index in range(rounds):
+        invested = strategy.investments(balances)
+        returned = np.rint(invested * TRUST_MULTIPLIER * return_rates[round_index])
+        balances += returned - invested
+        total_invested += invested
+        total_returned += returned
+
+    return TrustSimulationResult(
+        strategy, personality_name, balances, total_invested, total_returned
+    )
+
+
+def evaluate_strategies(
+    strategies: Sequence[InvestorStrategy],
+    games: int,
+    personalities: Optional[Sequence[str]] = None,
+    rounds: int = TOTAL_ROUNDS,
+    initial_points: float = INITIAL_POINTS,
+    seed: Optional[int] = None,
+) -> List[TrustSimulationResult]:
+    """전략 × 상대 성격 모든 조합 시뮬레이션 (조합마다 같은 시드로 공정 비교)"""
+    return [
+        simulate_trust_games(strategy, name, games, rounds, initial_points, seed=seed)
+        for strategy, name in itertools.product(
+            strategies, personalities or list(_PERSONALITIES)
+        )
+    ]
+
+
+def main_cli(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Trust Game 투자 전략 평가 (전략 × 상대 성격마다 JSON 한 줄 출력)"
+    )
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=TOTAL_ROUNDS)
+    parser.add_argument("--initial-points", type=float, default=INITIAL_POINTS)
+    parser.add_argument(
+        "--strategy",
+        type=InvestorStrategy.parse,
+        nargs="+",
+        default=[
+            InvestorStrategy("fixed", 0),
+            InvestorStrategy("fixed", 10),
+            InvestorStrategy("fraction", 0.5),
+        ],
+        help="투자 전략: fixed:<금액> 또는 fraction:<잔액 비율>",
+    )
+    parser.add_argument(
+        "--personality",
+        nargs="+",
+        choices=list(_PERSONALITIES),
+        help="평가할 상대 성격 (기본: 전체)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON Lines 파일 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = evaluate_strategies(
+        args.strategy,
+        args.games,
+        args.personality,
+        args.rounds,
+        args.initial_points,
+        args.seed,
+    )
+    print(
+        f"{len(results)}개 조합, {time.perf_counter() - started:.3f}초",
+        file=sys.stderr,
+    )
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for result in results:
+            out.write(json.dumps(result.summary(), ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,34 @@
+"""공용 fixture: 메모리 저장소에 연결한 앱과 테스트 사용자."""
+
+import os
+import uuid
+
+# db 모듈을 불러오기 전에 설정해야 한다 (네트워크/인증 정보 없이 실행)
+os.environ.setdefault("DB_BACKEND", "memory")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from core.auth import get_current_user, get_current_user_optional  # noqa: E402
+
+
+@pytest.fixture
+def user():
+    """테스트마다 새 사용자 (uid 와 MRN 이 다른 실제 Firebase 사용자 형태)"""
+    medical_record_number = uuid.uuid4().hex[:8]
+    return {
+        "uid": f"firebase-{uuid.uuid4().hex}",
+        "email": f"{medical_record_number}@eco.play",
+    }
+
+
+@pytest.fixture
+def client(user):
+    main.app.dependency_overrides[get_current_user] = lambda: dict(user)
+    main.app.dependency_overrides[get_current_user_optional] = lambda: dict(user)
+    try:
+        with TestClient(main.app) as test_client:
+            yield test_client
+    finally:
+        main.app.dependency_overrides.clear()
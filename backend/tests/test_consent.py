@@ -0,0 +1,111 @@
+"""MRN 별 현재 동의서: 제출/수정/삭제 시 갱신과 도입 이전 기록 백필."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from db.memory import MemoryStore
+from db.migrations import run_migrations
+from db.repositories import (
+    CONSENTS_COLLECTION,
+    CURRENT_CONSENTS_COLLECTION,
+    build_repositories,
+)
+
+DETAILS = {
+    "researchParticipation": True,
+    "dataCollection": True,
+    "dataSharing": False,
+    "contactPermission": False,
+}
+
+
+def _submit(client, mrn, given=True):
+    response = client.post(
+        "/consent/submit",
+        json={
+            "medicalRecordNumber": mrn,
+            "consentGiven": given,
+            "consentDetails": DETAILS,
+        },
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["document_id"]
+
+
+def _check(client, mrn):
+    response = client.get(f"/consent/check/{mrn}")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_current_consent_follows_submit_update_delete(client):
+    mrn = uuid.uuid4().hex[:8]
+    assert _check(client, mrn)["exists"] is False
+
+    first = _submit(client, mrn, given=True)
+    second = _submit(client, mrn, given=False)
+    current = _check(client, mrn)
+    assert (current["document_id"], current["consent_given"]) == (second, False)
+
+    # 현재 동의서가 아닌 기록을 고쳐도 현재 동의서는 그대로
+    update = {"medicalRecordNumber": mrn, "consentGiven": False}
+    response = client.put(
+        f"/consent/update/{first}", json={**update, "consentDetails": DETAILS}
+    )
+    assert response.status_code == 200, response.text
+    assert _check(client, mrn)["document_id"] == second
+
+    response = client.put(
+        f"/consent/update/{second}",
+        json={**update, "consentGiven": True, "consentDetails": DETAILS},
+    )
+    assert response.status_code == 200, response.text
+    assert _check(client, mrn)["consent_given"] is True
+
+    # 현재 동의서를 지우면 남은 것 중 가장 최근 기록으로 바뀐다
+    assert client.delete(f"/consent/delete/{second}").status_code == 200
+    current = _check(client, mrn)
+    assert (current["document_id"], current["consent_given"]) == (first, False)
+
+    assert client.delete(f"/consent/delete/{first}").status_code == 200
+    assert _check(client, mrn)["exists"] is False
+
+
+def test_backfill_creates_missing_current_consents_once():
+    async def scenario():
+        store = MemoryStore()
+        repositories = build_repositories(store)
+        now = datetime.utcnow()
+        for doc_id, mrn, age in (
+            ("old", "m1", 2),
+            ("new", "m1", 1),
+            ("only", "m2", 3),
+            ("kept", "m3", 5),
+        ):
+            await store.set(
+                CONSENTS_COLLECTION,
+                doc_id,
+                {
+                    "user_id": mrn,
+                    "consent_given": True,
+                    "created_at": now - timedelta(days=age),
+                },
+            )
+        # 도입 이후 제출로 이미 있는 현재 동의서는 덮어쓰지 않는다
+        await store.set(
+            CURRENT_CONSENTS_COLLECTION, "m3", {"user_id": "m3", "document_id": "x"}
+        )
+
+        await run_migrations(store, repositories)
+        assert (await repositories.consents.current("m1"))["document_id"] == "new"
+        assert (await repositories.consents.current("m2"))["document_id"] == "only"
+        assert (await repositories.consents.current("m3"))["document_id"] == "x"
+        assert (await store.get("schema_migrations", "current_consents"))["result"] == 2
+
+        # 완료 표시가 있으면 다시 실행하지 않는다
+        await store.delete(CURRENT_CONSENTS_COLLECTION, "m2")
+        await run_migrations(store, repositories)
+        assert await repositories.consents.current("m2") is None
+
+    asyncio.run(scenario())
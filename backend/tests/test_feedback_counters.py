@@ -0,0 +1,37 @@
+"""피드백 카운터 샤드 문서 ID와 집계."""
+
+from db import get_repositories
+from services.feedback_counters import counter_doc_id, counter_ops
+
+
+def test_counter_doc_id_is_path_safe():
+    doc_id = counter_doc_id("message", "a/b/../c", 3)
+    assert "/" not in doc_id
+    assert doc_id.startswith("message:") and doc_id.endswith(":3")
+    assert doc_id != counter_doc_id("message", "a/b/../d", 3)
+    assert doc_id == counter_doc_id("message", "a/b/../c", 3)
+
+
+def test_counter_ops_keep_raw_key():
+    ops = counter_ops("msg/1", True, template_id="tpl/1", game_type="trust_game")
+    assert [op.data["key"] for op in ops] == ["msg/1", "tpl/1"]
+    assert all("/" not in op.doc_id for op in ops)
+
+
+def test_feedback_with_slash_in_message_id(client):
+    for helpful in (True, True, False):
+        response = client.post(
+            "/message/feedback",
+            params={"message_id": "weird/../id", "helpful": helpful},
+        )
+        assert response.status_code == 200
+
+    stats = client.get("/message/feedback/stats", params={"message_id": "weird/../id"})
+    assert stats.status_code == 200
+    message = stats.json()["message"]
+    assert (message["helpful"], message["not_helpful"], message["total"]) == (2, 1, 3)
+
+    shards = client.portal.call(
+        get_repositories().feedback.counter_shards, "message", "weird/../id"
+    )
+    assert shards and all("/" not in doc.id for doc in shards)
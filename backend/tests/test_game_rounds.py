@@ -0,0 +1,93 @@
+"""라운드 제출: 상대 행동 출처 (세션 스케줄, 매칭 성격, 기본 성격)."""
+
+from services.game_rules import DEFAULT_OPPONENT_PERSONALITY, OPPONENT_PERSONALITIES
+
+RANGES = {p["name"]: p["return_rate_range"] for p in OPPONENT_PERSONALITIES}
+
+
+def _invest(client, round_number=1, **extra):
+    return client.post(
+        "/game/trust-game/submit",
+        json={
+            "round": round_number,
+            "role": "trustee",
+            "investment": 10,
+            "current_balance": 100,
+            **extra,
+        },
+    )
+
+
+def _assert_returned_within(result, personality):
+    low, high = RANGES[personality]
+    # 3배가 된 투자금(30) 중 반환율만큼 (정수로 내림)
+    assert int(30 * low) <= result["returned_amount"] <= 30 * high
+
+
+def test_invest_without_match_uses_default_personality(client):
+    response = _invest(client)
+    assert response.status_code == 200, response.text
+    _assert_returned_within(response.json(), DEFAULT_OPPONENT_PERSONALITY)
+
+
+def test_invest_without_match_uses_requested_personality(client):
+    response = _invest(client, personality="Generous Receiver")
+    assert response.status_code == 200, response.text
+    _assert_returned_within(response.json(), "Generous Receiver")
+
+
+def test_invest_after_match_uses_matched_personality(client, user):
+    match = client.post(
+        "/match/trust-game",
+        json={
+            "user_id": user["uid"],
+            "game_type": "trust-game",
+            "personality": "Cautious Receiver",
+        },
+    )
+    assert match.status_code == 200, match.text
+
+    response = _invest(client, personality="Generous Receiver")
+    assert response.status_code == 200, response.text
+    _assert_returned_within(response.json(), "Cautious Receiver")
+
+
+def _donations(client, round_number):
+    response = client.post(
+        "/game/public-goods/submit",
+        json={"round": round_number, "donation": 10, "current_balance": 100},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["other_donations"]
+
+
+def test_plain_replays_do_not_reuse_match_schedule(client, user):
+    client.post(
+        "/match/trust-game", json={"user_id": user["uid"], "game_type": "trust-game"}
+    )
+    # 같은 라운드를 여러 번 다시 해도 다른 플레이어 기부가 매번 같지는 않다
+    replays = [tuple(_donations(client, 1)) for _ in range(8)]
+    assert len(set(replays)) > 1
+
+
+def test_session_rounds_follow_session_schedule(client, user):
+    from services.game_sessions import session_engine
+
+    session = client.post("/game/session/start", json={"game": "public_goods"}).json()
+    schedule = client.portal.call(
+        session_engine.get, session["session_id"], user["uid"]
+    ).schedule
+    for round_number in (1, 2):
+        response = client.post(
+            "/game/public-goods/submit",
+            json={
+                "round": round_number,
+                "donation": 10,
+                "session_id": session["session_id"],
+            },
+        )
+        assert response.status_code == 200, response.text
+        assert (
+            response.json()["other_donations"]
+            == schedule["rounds"][round_number - 1]["other_donations"]
+        )
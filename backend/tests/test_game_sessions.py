@@ -0,0 +1,196 @@
+"""게임 세션 엔진: LRU+TTL 캐시, 스냅샷 저장 재시도와 복원, 세션 잠금 순서."""
+
+import asyncio
+import time
+import types
+
+import pytest
+from fastapi import HTTPException
+
+from routers import game
+from schemas.game import PublicGoodsGameRequest
+from services import game_sessions
+from services.game_sessions import GameSessionEngine, session_engine
+
+
+class _Writer:
+    """처음 ``failures`` 번은 실패하는 그룹 커밋 대역"""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.ops = []
+
+    async def submit(self, ops):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("저장소 오류")
+        self.ops.extend(ops)
+        return [op.doc_id for op in ops]
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    writer = _Writer()
+    monkeypatch.setattr(game_sessions, "get_group_writer", lambda: writer)
+    return writer
+
+
+async def _wait_for(condition, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "시간 초과"
+        await asyncio.sleep(0.005)
+
+
+def test_lru_evicts_least_recently_used(writer):
+    async def scenario():
+        engine = GameSessionEngine(max_sessions=2)
+        first = engine.start("u1", "m1", "public_goods")
+        second = engine.start("u1", "m1", "public_goods")
+        # first 를 최근 사용으로 만들면 second 가 밀려난다
+        assert await engine.get(first.session_id, "u1") is first
+        engine.start("u1", "m1", "public_goods")
+
+        assert engine._cached(first.session_id) is first
+        assert engine._cached(second.session_id) is None
+        assert engine.stats()["evictions"] == 1
+        # 밀려났어도 저장 전이면 메모리의 최신 상태를 그대로 사용
+        assert await engine.get(second.session_id, "u1") is second
+        await engine.close()
+
+    asyncio.run(scenario())
+
+
+def test_ttl_expires_idle_sessions(writer, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(
+        game_sessions, "time", types.SimpleNamespace(time=lambda: clock[0])
+    )
+
+    async def scenario():
+        engine = GameSessionEngine(ttl_seconds=60)
+        session = engine.start("u1", "m1", "trust_game")
+        clock[0] += 59
+        assert engine._cached(session.session_id) is session
+        # 조회하면 만료 시각이 다시 늘어난다
+        await engine.get(session.session_id, "u1")
+        clock[0] += 59
+        assert engine._cached(session.session_id) is session
+        clock[0] += 61
+        assert engine._cached(session.session_id) is None
+        assert engine.stats()["evictions"] == 1
+        await engine.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_is_retried_with_backoff(writer):
+    writer.failures = 3
+
+    async def scenario():
+        engine = GameSessionEngine(snapshot_delay_ms=1, retry_max_ms=4)
+        session = engine.start("u1", "m1", "public_goods")
+        await _wait_for(lambda: writer.ops)
+
+        assert [op.doc_id for op in writer.ops] == [session.session_id]
+        stats = engine.stats()
+        assert stats["snapshot_failures"] == 3
+        assert stats["snapshots_written"] == 1
+        assert stats["pending_snapshots"] == 0
+        assert stats["snapshot_retry_delay"] == 0
+        await engine.close()
+
+    asyncio.run(scenario())
+
+
+def test_retry_delay_doubles_up_to_limit():
+    engine = GameSessionEngine(snapshot_delay_ms=10, retry_max_ms=50)
+    delays = []
+    for failures in range(1, 5):
+        engine._failed_flushes = failures
+        delays.append(engine._retry_delay())
+    assert delays == [0.02, 0.04, 0.05, 0.05]
+
+
+def test_close_does_not_wait_for_pending_flush(writer):
+    writer.failures = 1
+
+    async def scenario():
+        engine = GameSessionEngine(snapshot_delay_ms=10_000, retry_max_ms=60_000)
+        session = engine.start("u1", "m1", "public_goods")
+        await engine.flush()
+        assert engine.stats()["pending_snapshots"] == 1
+
+        started = time.monotonic()
+        await engine.close()
+        assert time.monotonic() - started < 1
+        assert [op.doc_id for op in writer.ops] == [session.session_id]
+        assert engine.stats()["pending_snapshots"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_evicted_session_is_restored_from_snapshot(client, user):
+    async def scenario():
+        engine = GameSessionEngine(max_sessions=1)
+        session = engine.start(user["uid"], "mrn-1", "trust_game", total_rounds=3)
+        engine.record_rounds(
+            session, [{"round": 1, "new_balance": 120.0, "user_id": "mrn-1"}]
+        )
+        engine.start(user["uid"], "mrn-1", "trust_game")
+        await engine.flush()
+        assert engine._cached(session.session_id) is None
+
+        restored = await engine.get(session.session_id, user["uid"])
+        assert restored is not session
+        assert restored.state() == session.state()
+        assert restored.schedule == session.schedule
+        assert restored.rounds == [{"round": 1, "new_balance": 120.0}]
+        assert engine.stats()["misses"] == 1
+
+        # 재시작한 것처럼 새 엔진에서도 같은 상태로 복원
+        fresh = await GameSessionEngine().get(session.session_id, user["uid"])
+        assert fresh.state() == session.state()
+        # 다른 사용자는 찾지 못한 것으로 처리
+        with pytest.raises(game_sessions.SessionNotFoundError):
+            await GameSessionEngine().get(session.session_id, "someone-else")
+        await engine.close()
+
+    client.portal.call(scenario)
+
+
+def _submit(user, session_id, round_number):
+    return game.submit_public_goods_round(
+        PublicGoodsGameRequest(round=round_number, donation=10, session_id=session_id),
+        dict(user),
+    )
+
+
+def test_session_lock_orders_concurrent_submits(client, user):
+    session_id = client.post(
+        "/game/session/start", json={"game": "public_goods"}
+    ).json()["session_id"]
+
+    async def scenario():
+        # 동시에 들어온 라운드 1, 2 는 도착 순서대로 처리된다
+        results = await asyncio.gather(
+            _submit(user, session_id, 1), _submit(user, session_id, 2)
+        )
+        assert [result.round for result in results] == [1, 2]
+        assert results[1].new_balance == results[0].new_balance + results[1].payoff
+
+        # 같은 라운드를 동시에 두 번 내면 하나만 저장된다
+        outcomes = await asyncio.gather(
+            _submit(user, session_id, 3),
+            _submit(user, session_id, 3),
+            return_exceptions=True,
+        )
+        assert outcomes[0].round == 3
+        assert isinstance(outcomes[1], HTTPException)
+        assert outcomes[1].status_code == 409
+
+        session = await session_engine.get(session_id, user["uid"])
+        assert [r["round"] for r in session.rounds] == [1, 2, 3]
+        assert session.balance == outcomes[0].new_balance
+
+    client.portal.call(scenario)
@@ -0,0 +1,95 @@
+"""그룹 커밋: 대기 시간 안의 요청 묶기, 연산 수 한도, 실패한 요청만 실패."""
+
+import asyncio
+
+import pytest
+
+from db.batch import DocumentExistsError, create_op, increment_op, set_op
+from db.group_commit import GroupCommitWriter
+from db.memory import MemoryStore
+
+
+def _run(scenario):
+    return asyncio.run(scenario())
+
+
+def test_requests_within_window_share_one_batch():
+    store = MemoryStore()
+    writer = GroupCommitWriter(store, window_ms=50, max_ops=100)
+
+    async def scenario():
+        await asyncio.gather(
+            *(writer.submit([set_op("docs", f"d{i}", {"i": i})]) for i in range(5))
+        )
+
+    _run(scenario)
+    stats = writer.stats()
+    assert stats["batches_committed"] == 1
+    assert stats["requests_committed"] == 5
+    assert stats["batch_size"]["max"] == 5
+
+
+def test_max_ops_splits_batches_without_splitting_requests():
+    store = MemoryStore()
+    writer = GroupCommitWriter(store, window_ms=50, max_ops=3)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                writer.submit(
+                    [set_op("docs", f"a{i}", {}), set_op("docs", f"b{i}", {})]
+                )
+                for i in range(3)
+            )
+        )
+
+    results = _run(scenario)
+    assert results == [[f"a{i}", f"b{i}"] for i in range(3)]
+    stats = writer.stats()
+    assert stats["batches_committed"] == 3
+    assert stats["batch_size"]["max"] == 2
+
+
+def test_failing_request_does_not_fail_others():
+    store = MemoryStore()
+    writer = GroupCommitWriter(store, window_ms=50, max_ops=100)
+
+    async def scenario():
+        await store.set("seeds", "taken", {})
+        return await asyncio.gather(
+            writer.submit([increment_op("counters", "c", {"n": 1})]),
+            writer.submit(
+                [
+                    create_op("seeds", "taken", {}),
+                    increment_op("counters", "c", {"n": 1}),
+                ]
+            ),
+            writer.submit([increment_op("counters", "c", {"n": 1})]),
+            return_exceptions=True,
+        )
+
+    ok_first, failed, ok_last = _run(scenario)
+    assert ok_first == ["c"] and ok_last == ["c"]
+    assert isinstance(failed, DocumentExistsError)
+
+    # 실패한 요청의 증가분은 반영되지 않고, 나머지는 한 번씩만 반영
+    counter = _run(lambda: store.get("counters", "c"))
+    assert counter["n"] == 2
+    stats = writer.stats()
+    assert stats["batches_failed"] == 1
+    assert stats["batches_split"] == 1
+    assert stats["requests_failed"] == 1
+    assert stats["requests_committed"] == 2
+
+
+def test_single_request_failure_is_raised():
+    store = MemoryStore()
+    writer = GroupCommitWriter(store, window_ms=0)
+
+    async def scenario():
+        await store.set("seeds", "taken", {})
+        await writer.submit([create_op("seeds", "taken", {})])
+
+    with pytest.raises(DocumentExistsError):
+        _run(scenario)
+    assert writer.stats()["batches_split"] == 0
@@ -0,0 +1,68 @@
+"""매칭: 상대 행동 스케줄과 시드는 참여자 응답에 노출하지 않는다."""
+
+from services import opponent_schedule
+
+
+def _match(client, user, **extra):
+    return client.post(
+        "/match/trust-game",
+        json={"user_id": user["uid"], "game_type": "trust-game", **extra},
+    )
+
+
+def test_match_responses_hide_schedule_and_seed(client, user):
+    match = _match(client, user)
+    assert match.status_code == 200, match.text
+    assert "seed" not in match.json()
+
+    history = client.get("/match/history").json()["match_history"]
+    assert len(history) == 1
+    assert "opponent_schedule" not in history[0]
+    assert history[0]["matched_personality"] == match.json()["matched_personality"]
+
+    session = client.post(
+        "/game/session/start",
+        json={"game": "trust_game", "match_id": match.json()["match_id"]},
+    ).json()
+    assert "seed" not in session
+    assert "schedule" not in session
+
+
+def test_client_seed_requires_opt_in(client, user, monkeypatch):
+    assert _match(client, user, seed=42).status_code == 403
+    assert (
+        client.post(
+            "/game/session/start", json={"game": "public_goods", "seed": 42}
+        ).status_code
+        == 403
+    )
+
+    monkeypatch.setattr(opponent_schedule, "ALLOW_CLIENT_SEED", True)
+    assert _match(client, user, seed=42).status_code == 200
+
+
+def test_personality_names_match_game_rules():
+    from typing import get_args
+
+    from schemas.game import OpponentPersonality
+    from services.game_rules import OPPONENT_PERSONALITIES
+
+    assert set(get_args(OpponentPersonality)) == {
+        p["name"] for p in OPPONENT_PERSONALITIES
+    }
+
+
+def test_unknown_personality_is_rejected(client, user):
+    assert _match(client, user, personality="Sneaky Receiver").status_code == 422
+    assert _match(client, user, personality="Fair Receiver").status_code == 200
+    response = client.post(
+        "/game/trust-game/submit",
+        json={
+            "round": 1,
+            "role": "trustee",
+            "investment": 10,
+            "current_balance": 100,
+            "personality": "Sneaky Receiver",
+        },
+    )
+    assert response.status_code == 422
@@ -0,0 +1,198 @@
+"""안내 메시지 엔진: 상황별 캐시, SSE 스트리밍, 메시지 기록 증분 조회와 long-poll."""
+
+import asyncio
+import json
+import random
+import time
+
+import pytest
+
+from db import get_repositories
+from services.message_engine import (
+    FakeStreamingMessageGenerator,
+    GeneratedMessage,
+    MessageEngine,
+    TemplateMessageGenerator,
+    message_engine,
+    situation_for,
+)
+
+
+@pytest.fixture(autouse=True)
+def generator(monkeypatch):
+    # 생성기를 바꾸면 상황별 캐시도 비워진다
+    generator = FakeStreamingMessageGenerator(chunk_delay_ms=0, rng=random.Random(0))
+    monkeypatch.setattr(message_engine, "generator", generator)
+    return generator
+
+
+def _events(client, **body):
+    with client.stream(
+        "POST",
+        "/message/generate/stream",
+        json={"game_type": "public_goods", "round": 1, **body},
+    ) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        text = response.read().decode("utf-8")
+
+    events = []
+    for block in text.strip().split("\n\n"):
+        event_line, data_line = block.split("\n")
+        events.append(
+            (
+                event_line.removeprefix("event: "),
+                json.loads(data_line.removeprefix("data: ")),
+            )
+        )
+    return events
+
+
+def _history(client, **params):
+    response = client.get("/message/history", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_situation_normalises_round_and_balance():
+    assert situation_for("public_goods", 2) == ("public_goods", "early", "neutral")
+    assert situation_for("public_goods", 5, {"balance": 120}).band == "high"
+    assert situation_for("public_goods", 9, {"balance": 20}) == (
+        "public_goods",
+        "late",
+        "low",
+    )
+    with pytest.raises(ValueError):
+        situation_for("chess", 1)
+
+
+def test_concurrent_requests_generate_once():
+    calls = []
+
+    class SlowGenerator(TemplateMessageGenerator):
+        async def generate(self, situation):
+            calls.append(situation)
+            await asyncio.sleep(0.01)
+            return await super().generate(situation)
+
+    async def scenario():
+        engine = MessageEngine(generator=SlowGenerator(random.Random(0)))
+        engine._feedback_expires = float("inf")
+        situation = situation_for("public_goods", 1)
+        messages = await asyncio.gather(
+            *(engine.message_for(situation) for _ in range(5))
+        )
+        assert len({message.content for message in messages}) == 1
+        assert len(calls) == 1
+        assert (engine.hits, engine.misses) == (4, 1)
+
+        # 캐시된 상황은 생성기를 다시 부르지 않는다
+        await engine.message_for(situation)
+        assert len(calls) == 1
+
+    asyncio.run(scenario())
+
+
+def test_stream_sends_chunks_then_full_message(client, user):
+    events = _events(client)
+    names = [name for name, _ in events]
+    assert names[0] == "start" and names[-1] == "done"
+    assert set(names[1:-1]) == {"chunk"} and len(names) > 3
+
+    start, done = events[0][1], events[-1][1]
+    assert done["message_id"] == start["message_id"]
+    assert "".join(data["text"] for name, data in events[1:-1]) == done["content"]
+    assert done["template_id"] == "public_goods:0"
+
+    # 같은 상황은 캐시에서 한 조각으로 보낸다
+    cached = _events(client)
+    assert [name for name, _ in cached] == ["start", "chunk", "done"]
+    assert cached[1][1]["text"] == done["content"]
+
+    # 끝까지 전달된 메시지는 기록에 저장된다
+    client.portal.call(message_engine.close)
+    contents = [m["content"] for m in _history(client)["messages"]]
+    assert contents == [done["content"], done["content"]]
+
+
+def test_stream_failure_ends_with_error_event(client, monkeypatch):
+    class BrokenGenerator(TemplateMessageGenerator):
+        async def stream(self, situation):
+            yield GeneratedMessage("앞부분 ", None)
+            raise RuntimeError("생성기 오류")
+
+    monkeypatch.setattr(message_engine, "generator", BrokenGenerator())
+    events = _events(client)
+    assert [name for name, _ in events] == ["start", "chunk", "error"]
+    assert "생성기 오류" in events[-1][1]["detail"]
+
+    # 중간에 끊긴 메시지는 저장하지 않는다
+    client.portal.call(message_engine.close)
+    assert _history(client)["messages"] == []
+
+
+def _generate(client, round_number):
+    response = client.post(
+        "/message/generate", json={"game_type": "public_goods", "round": round_number}
+    )
+    assert response.status_code == 200, response.text
+    client.portal.call(message_engine.close)
+    return response.json()
+
+
+def test_history_cursor_returns_only_new_messages(client):
+    first = _generate(client, 1)
+    second = _generate(client, 5)
+
+    page = _history(client, limit=1)
+    assert [m["message_id"] for m in page["messages"]] == [first["message_id"]]
+    assert page["has_more"] is True
+    page = _history(client, cursor=page["next_cursor"])
+    assert [m["message_id"] for m in page["messages"]] == [second["message_id"]]
+
+    # 새 메시지가 없으면 같은 위치를 돌려준다
+    empty = _history(client, cursor=page["next_cursor"])
+    assert empty["messages"] == []
+    assert empty["next_cursor"] == page["next_cursor"]
+
+    third = _generate(client, 9)
+    page = _history(client, cursor=empty["next_cursor"])
+    assert [m["message_id"] for m in page["messages"]] == [third["message_id"]]
+
+    since = _history(client, since=first["timestamp"])
+    assert [m["message_id"] for m in since["messages"]] == [
+        second["message_id"],
+        third["message_id"],
+    ]
+
+
+def test_history_rejects_bad_since_and_cursor(client):
+    assert client.get("/message/history", params={"since": "어제"}).status_code == 400
+    assert client.get("/message/history", params={"cursor": "!!"}).status_code == 400
+
+
+def test_long_poll_times_out_with_empty_page(client):
+    started = time.monotonic()
+    page = _history(client, wait=0.2)
+    assert page["messages"] == []
+    assert time.monotonic() - started >= 0.2
+    assert message_engine.stats()["long_poll_waiters"] == 0
+
+
+def test_long_poll_wakes_when_message_is_saved(client, user):
+    async def scenario():
+        async def fetch():
+            return await get_repositories().messages.page_for_user(user["uid"])
+
+        started = time.monotonic()
+        # 재조회 간격보다 먼저 저장 알림으로 깨어나야 한다
+        waiting = asyncio.create_task(
+            message_engine.long_poll(user["uid"], fetch, timeout=5, recheck=10)
+        )
+        await asyncio.sleep(0.05)
+        message = await message_engine.generate(user["uid"], "public_goods", 1)
+        docs, _ = await waiting
+        assert [doc.id for doc in docs] == [message["message_id"]]
+        assert time.monotonic() - started < 2
+
+    client.portal.call(scenario)
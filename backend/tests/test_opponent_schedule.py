@@ -0,0 +1,152 @@
+"""상대 행동 스케줄과 Trust Game 반환 엔진."""
+
+import random
+
+import numpy as np
+import pytest
+
+from services.game_rules import (
+    INITIAL_POINTS,
+    NUM_PLAYERS,
+    OPPONENT_PERSONALITIES,
+    OTHER_DONATION_MAX_RATIO,
+    trust_game_outcome,
+    trustee_return_amount,
+)
+from services.opponent_schedule import (
+    generate_opponent_schedule,
+    opponent_for,
+    scheduled_round,
+)
+from services.trust_engine import (
+    InvestorStrategy,
+    draw_return_rate,
+    evaluate_strategies,
+    simulate_trust_games,
+)
+
+RANGES = {p["name"]: p["return_rate_range"] for p in OPPONENT_PERSONALITIES}
+
+
+def test_same_seed_gives_same_schedule():
+    first = generate_opponent_schedule(seed=42, rounds=5)
+    assert first == generate_opponent_schedule(seed=42, rounds=5)
+    assert first != generate_opponent_schedule(seed=43, rounds=5)
+    assert first["seed"] == 42
+    assert [r["round"] for r in first["rounds"]] == [1, 2, 3, 4, 5]
+
+
+def test_schedule_values_stay_in_range():
+    schedule = generate_opponent_schedule(seed=7, rounds=50)
+    low, high = RANGES[schedule["personality"]]
+    assert schedule["return_rate_range"] == [low, high]
+    for scheduled in schedule["rounds"]:
+        assert low <= scheduled["return_rate"] <= high
+        assert len(scheduled["other_donations"]) == NUM_PLAYERS - 1
+        assert all(
+            0 <= donation <= INITIAL_POINTS * OTHER_DONATION_MAX_RATIO
+            for donation in scheduled["other_donations"]
+        )
+
+
+def test_fixed_personality_keeps_other_draws():
+    # 성격을 고정해도 다른 플레이어 기부액은 같은 시드의 것과 같다
+    free = generate_opponent_schedule(seed=11, rounds=5)
+    fixed = generate_opponent_schedule(
+        seed=11, rounds=5, personality="Generous Receiver"
+    )
+    assert fixed["personality"] == "Generous Receiver"
+    assert [r["other_donations"] for r in fixed["rounds"]] == [
+        r["other_donations"] for r in free["rounds"]
+    ]
+    low, high = RANGES["Generous Receiver"]
+    assert all(low <= r["return_rate"] <= high for r in fixed["rounds"])
+
+
+def test_unknown_personality_is_rejected():
+    with pytest.raises(ValueError):
+        generate_opponent_schedule(seed=1, personality="Sneaky Receiver")
+    with pytest.raises(ValueError):
+        draw_return_rate("Sneaky Receiver", random.Random(0))
+
+
+def test_scheduled_round_outside_schedule_is_none():
+    schedule = generate_opponent_schedule(seed=3, rounds=2)
+    assert scheduled_round(schedule, 2) is schedule["rounds"][1]
+    assert scheduled_round(schedule, 0) is None
+    assert scheduled_round(schedule, 3) is None
+    assert scheduled_round(None, 1) is None
+
+
+def test_opponent_prefers_schedule_personality():
+    schedule = generate_opponent_schedule(
+        seed=5, rounds=2, personality="Cautious Receiver"
+    )
+    opponent = opponent_for(schedule, "Generous Receiver")
+    assert opponent.personality == "Cautious Receiver"
+    assert opponent.round(1) == schedule["rounds"][0]
+
+    without_schedule = opponent_for(None, "Generous Receiver")
+    assert without_schedule.personality == "Generous Receiver"
+    assert without_schedule.round(1) is None
+
+
+@pytest.mark.parametrize("name", list(RANGES))
+def test_draw_return_rate_stays_in_range(name):
+    rng = random.Random(0)
+    low, high = RANGES[name]
+    assert all(low <= draw_return_rate(name, rng) <= high for _ in range(200))
+
+
+def test_trustee_round_returns_rate_of_tripled_investment():
+    outcome = trust_game_outcome("trustee", 100, investment=10, return_rate=0.5)
+    assert outcome.role == "trustor"
+    assert outcome.multiplied_amount == 30
+    assert outcome.received_amount == 15
+    assert outcome.payoff == 5
+    assert outcome.new_balance == 105
+
+    receiver = trust_game_outcome("receiver", 100, received_amount=30, return_amount=12)
+    assert receiver.role == "trustee"
+    assert receiver.payoff == 18
+    assert receiver.new_balance == 118
+
+
+def test_simulation_matches_round_rules():
+    strategy = InvestorStrategy("fraction", 0.3)
+    result = simulate_trust_games(strategy, "Fair Receiver", games=20, rounds=6, seed=9)
+
+    # 같은 시드의 반환율로 라운드 규칙을 한 게임씩 다시 계산
+    rates = np.random.default_rng(9).uniform(0.4, 0.6, size=(6, 20)).round(4)
+    for game_index in range(20):
+        balance = float(INITIAL_POINTS)
+        for round_index in range(6):
+            investment = int(balance * 0.3)
+            rate = float(rates[round_index, game_index])
+            balance += trustee_return_amount(investment, rate) - investment
+        assert result.final_balances[game_index] == balance
+
+
+def test_strategy_never_invests_more_than_balance():
+    balances = np.array([0.0, 5.0, 100.0])
+    assert InvestorStrategy("fixed", 10).investments(balances).tolist() == [0, 5, 10]
+    assert InvestorStrategy("fraction", 0.5).investments(balances).tolist() == [
+        0,
+        2,
+        50,
+    ]
+    with pytest.raises(ValueError):
+        InvestorStrategy.parse("all-in:1")
+
+
+def test_evaluate_strategies_covers_every_pair():
+    results = evaluate_strategies(
+        [InvestorStrategy("fixed", 0), InvestorStrategy("fixed", 10)], games=50, seed=1
+    )
+    assert len(results) == 2 * len(RANGES)
+    summaries = {(r.strategy.name, r.personality): r.summary() for r in results}
+    # 투자하지 않으면 잔액이 그대로
+    assert summaries[("fixed:0", "Fair Receiver")]["final_balance"]["min"] == 100
+    # 관대한 상대에게는 투자 1점당 3 * (0.7 ~ 0.9) 를 돌려받는다
+    generous = summaries[("fixed:10", "Generous Receiver")]["return_per_point"]
+    assert 2.1 <= generous <= 2.7
@@ -0,0 +1,126 @@
+"""커서 기반 페이지: 커서 인코딩, 저장소 페이지 조회, 게임 기록과 게임별 리포트."""
+
+import asyncio
+
+import pytest
+
+from db.memory import MemoryStore
+from db.pagination import decode_cursor, encode_cursor, query_page
+
+
+def _submit_public_goods(client, rounds):
+    for round_number in range(1, rounds + 1):
+        response = client.post(
+            "/game/public-goods/submit",
+            json={"round": round_number, "donation": 5, "current_balance": 100},
+        )
+        assert response.status_code == 200, response.text
+
+
+def _submit_trust_game(client, role, rounds):
+    for round_number in range(1, rounds + 1):
+        body = {"round": round_number, "role": role, "current_balance": 100}
+        if role == "receiver":
+            body.update(received_amount=30, return_amount=10)
+        else:
+            body.update(investment=10)
+        response = client.post("/game/trust-game/submit", json=body)
+        assert response.status_code == 200, response.text
+
+
+def _pages(client, url, key, **params):
+    """``next_cursor`` 가 없을 때까지 따라가며 페이지별 라운드 번호"""
+    pages, cursor = [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get(url, params=query)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([row["round"] for row in body[key]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    state = {"after": "doc/1", "trust_game": {"done": True}}
+    cursor = encode_cursor(state)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == state
+    assert decode_cursor(None) == {} and decode_cursor("") == {}
+    for bad in ("%%%", encode_cursor([1, 2])[:-1] + "x", "WzEsMl0"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_query_page_has_no_empty_last_page():
+    async def scenario():
+        store = MemoryStore()
+        for round_number in range(1, 5):
+            await store.set("rounds", f"r{round_number}", {"round": round_number})
+
+        docs, next_after = await query_page(
+            store, "rounds", order_by=["round"], limit=2
+        )
+        assert [doc.id for doc in docs] == ["r1", "r2"] and next_after == "r2"
+        # 남은 문서가 정확히 한 페이지면 다음 커서가 없다
+        docs, next_after = await query_page(
+            store, "rounds", order_by=["round"], limit=2, start_after=next_after
+        )
+        assert [doc.id for doc in docs] == ["r3", "r4"] and next_after is None
+
+    asyncio.run(scenario())
+
+
+def test_game_history_pages_in_round_order(client):
+    _submit_public_goods(client, 5)
+
+    pages = _pages(client, "/game/history/public_goods", "history", limit=2)
+    assert pages == [[1, 2], [3, 4], [5]]
+
+    row = client.get("/game/history/public_goods?limit=1").json()["history"][0]
+    assert set(row) == {
+        "round",
+        "donation",
+        "current_balance",
+        "partner_contribution",
+        "timestamp",
+    }
+
+
+def test_game_history_pages_one_role(client):
+    _submit_trust_game(client, "receiver", 3)
+    _submit_trust_game(client, "trustee", 2)
+
+    assert _pages(client, "/game/history/trust_game_trustee", "history", limit=1) == [
+        [1],
+        [2],
+    ]
+    trustee = client.get("/game/history/trust_game_trustee").json()["history"]
+    assert all(row["invested"] == 10 for row in trustee)
+    assert all(row["received_back"] is not None for row in trustee)
+    receiver = client.get("/game/history/trust_game_receiver").json()["history"]
+    assert [row["round"] for row in receiver] == [1, 2, 3]
+    assert {(row["received"], row["returned"]) for row in receiver} == {(30, 10)}
+
+
+def test_game_history_rejects_bad_cursor(client):
+    assert client.get("/game/history/public_goods?cursor=%%%").status_code == 400
+
+
+def test_game_report_pages_both_games_with_one_cursor(client):
+    _submit_public_goods(client, 3)
+    _submit_trust_game(client, "receiver", 1)
+
+    first = client.get("/report/games?limit=2").json()
+    assert [g["round"] for g in first["games"]["public_goods"]] == [1, 2]
+    assert [g["round"] for g in first["games"]["trust_game"]] == [1]
+
+    # 끝난 게임은 다음 페이지에서 다시 조회하지 않는다
+    second = client.get(f"/report/games?limit=2&cursor={first['next_cursor']}").json()
+    assert [g["round"] for g in second["games"]["public_goods"]] == [3]
+    assert second["games"]["trust_game"] == []
+    assert second["next_cursor"] is None
+
+    pages = _pages(client, "/report/games", "games", game_type="public_goods", limit=2)
+    assert pages == [[1, 2], [3]]
@@ -0,0 +1,78 @@
+"""리포트 요약 집계와 라운드 행이 같은 키(MRN)로 일치하는지."""
+
+
+def _play(client, rounds=3):
+    for round_number in range(1, rounds + 1):
+        response = client.post(
+            "/game/public-goods/submit",
+            json={"round": round_number, "donation": 10, "current_balance": 100},
+        )
+        assert response.status_code == 200, response.text
+        response = client.post(
+            "/game/trust-game/submit",
+            json={
+                "round": round_number,
+                "role": "receiver",
+                "received_amount": 30,
+                "return_amount": 10,
+                "current_balance": 100,
+            },
+        )
+        assert response.status_code == 200, response.text
+
+
+def test_public_goods_summary_matches_rows(client, user):
+    assert user["uid"] != user["email"].split("@")[0]
+    _play(client)
+
+    report = client.get("/report/public-goods").json()
+    rows = report["rounds"]
+    assert [row["round"] for row in rows] == [1, 2, 3]
+    assert report["summary"]["total_rounds"] == len(rows)
+    assert report["summary"]["total_contribution"] == sum(
+        row["human_contribution"] for row in rows
+    )
+
+
+def test_trust_game_summary_matches_rows(client):
+    _play(client)
+
+    report = client.get("/report/trust-game").json()
+    assert report["summary"]["total_rounds"] == len(report["rounds"]) == 3
+
+
+def test_history_uses_same_key(client):
+    _play(client, rounds=2)
+
+    history = client.get("/game/history/public_goods").json()
+    assert len(history["history"]) == 2
+
+
+def test_report_returns_every_round_by_default(client):
+    _play(client, rounds=4)
+
+    report = client.get("/report/public-goods").json()
+    assert len(report["rounds"]) == 4
+    assert "next_cursor" not in report
+
+    everything = client.get("/report/all").json()
+    assert len(everything["public_goods"]["rounds"]) == 4
+    assert len(everything["trust_game"]["rounds"]) == 4
+
+    summary_only = client.get("/report/all?include_rounds=false").json()
+    assert "rounds" not in summary_only["public_goods"]
+
+
+def test_report_paging_is_opt_in(client):
+    _play(client, rounds=3)
+
+    first = client.get("/report/public-goods?limit=2").json()
+    assert [row["round"] for row in first["rounds"]] == [1, 2]
+    second = client.get(
+        f"/report/public-goods?limit=2&cursor={first['next_cursor']}"
+    ).json()
+    assert [row["round"] for row in second["rounds"]] == [3]
+    assert second["next_cursor"] is None
+    assert first["summary"]["total_rounds"] == 3
+
+    assert client.get("/report/public-goods?cursor=garbage").status_code == 400
@@ -0,0 +1,118 @@
+"""리포트 요약 집계: 제출 시 증가분, 집계 도입 이전 라운드의 1회 반영(시드)."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from db import get_repositories, get_store
+from db.repositories import GAME_COLLECTIONS
+from services.report_summary import (
+    load_summary_fields,
+    public_goods_summary,
+    sum_increments,
+    trust_game_summary,
+)
+
+
+def _mrn(user):
+    return user["email"].split("@")[0]
+
+
+def _add_legacy_rounds(client, game, rounds):
+    """집계 도입 이전처럼 ``summarized`` 표시 없이 저장된 라운드"""
+
+    async def add():
+        for data in rounds:
+            await get_store().add(
+                GAME_COLLECTIONS[game], {**data, "timestamp": datetime.utcnow()}
+            )
+
+    client.portal.call(add)
+
+
+def test_trust_game_summary_by_role():
+    rounds = [
+        {"role": "trustor", "decision": 10},
+        {"role": "trustor", "decision": 20},
+        {"role": "trustee", "decision": 15, "received_amount": 30},
+        {"role": "trustee", "decision": 0, "received_amount": 0},
+    ]
+    fields = sum_increments("trust_game", rounds)
+
+    summary = trust_game_summary(fields)
+    assert summary["total_rounds"] == 4
+    assert summary["trustor_stats"] == {
+        "rounds": 2,
+        "total_investment": 30,
+        "average_investment": 15,
+    }
+    assert summary["trustee_stats"] == {
+        "rounds": 2,
+        "total_received": 30,
+        "total_returned": 15,
+        # 받은 금액이 0 인 라운드의 반환율은 0
+        "average_return_rate": 0.25,
+    }
+
+    assert trust_game_summary(fields, "trustor")["trustee_stats"]["rounds"] == 0
+    assert trust_game_summary(fields, "trustee")["total_rounds"] == 2
+    assert trust_game_summary(fields, "referee")["total_rounds"] == 0
+    assert public_goods_summary({})["average_payoff"] == 0
+
+
+def test_legacy_rounds_are_seeded_once(client, user):
+    mrn = _mrn(user)
+    _add_legacy_rounds(
+        client,
+        "public_goods",
+        [
+            {"user_id": mrn, "round": 1, "human_contribution": 10, "human_payoff": 5},
+            {"user_id": mrn, "round": 2, "human_contribution": 20, "human_payoff": -5},
+            # 다른 사용자의 라운드는 반영하지 않는다
+            {"user_id": "other", "round": 1, "human_contribution": 99},
+        ],
+    )
+    for round_number, donation in ((3, 30), (4, 0)):
+        response = client.post(
+            "/game/public-goods/submit",
+            json={"round": round_number, "donation": donation, "current_balance": 100},
+        )
+        assert response.status_code == 200, response.text
+
+        # 이전 라운드는 처음 한 번만 더해지고, 새 라운드는 제출 때마다 더해진다
+        report = client.get("/report/public-goods").json()
+        rows = report["rounds"]
+        assert report["summary"]["total_rounds"] == len(rows) == round_number
+        assert report["summary"]["total_contribution"] == 60
+        assert report["summary"]["total_payoff"] == pytest.approx(
+            sum(row["human_payoff"] for row in rows)
+        )
+
+
+def test_concurrent_seeding_counts_legacy_rounds_once(client, user):
+    mrn = _mrn(user)
+    _add_legacy_rounds(
+        client,
+        "trust_game",
+        [
+            {"user_id": mrn, "round": 1, "role": "trustor", "decision": 10},
+            {"user_id": mrn, "round": 2, "role": "trustor", "decision": 30},
+        ],
+    )
+
+    async def scenario():
+        rounds = get_repositories().rounds
+        results = await asyncio.gather(
+            *(load_summary_fields(rounds, "trust_game", mrn) for _ in range(5))
+        )
+        assert {fields["tg_total_investment"] for fields in results} == {40}
+        assert {fields["tg_rounds"] for fields in results} == {2}
+        # 이미 반영한 뒤에는 다시 더하지 않는다
+        fields = await load_summary_fields(rounds, "trust_game", mrn)
+        assert fields["tg_rounds"] == 2 and fields["tg_seeded"] is True
+
+    client.portal.call(scenario)
+
+    summary = client.get("/report/trust-game").json()["summary"]
+    assert summary["trustor_stats"]["total_investment"] == 40
@@ -0,0 +1,109 @@
+"""사용자별 응답 캐시 무효화와 세대(generation) 검사."""
+
+import asyncio
+
+from starlette.requests import Request
+
+from core.response_cache import ResponseCache, Uncacheable
+from routers import report
+
+
+def _request(path: str = "/report/all") -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+def test_invalidate_during_build_skips_put():
+    cache = ResponseCache()
+
+    async def scenario():
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_build():
+            started.set()
+            await release.wait()
+            return {"total_rounds": 1}
+
+        pending = asyncio.create_task(cache.respond(_request(), "mrn-1", slow_build))
+        await started.wait()
+        cache.invalidate("mrn-1")
+        release.set()
+        await pending
+
+        # 무효화 전에 시작된 응답은 캐시되지 않는다
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["stale_skips"] == 1
+
+        async def fresh_build():
+            return {"total_rounds": 2}
+
+        response = await cache.respond(_request(), "mrn-1", fresh_build)
+        assert response.body == b'{"total_rounds":2}'
+        assert cache.stats()["size"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_other_user_keeps_put():
+    cache = ResponseCache()
+    generation = cache.generation("mrn-1")
+    cache.invalidate("mrn-2")
+    cache.put("mrn-1", "key", b"{}", generation)
+    assert cache.get("mrn-1", "key") is not None
+
+
+def test_evicted_generation_still_skips_put():
+    cache = ResponseCache(max_entries=1)
+    generation = cache.generation("mrn-1")
+    cache.invalidate("mrn-1")
+    # mrn-1 의 세대가 밀려나도 그 전에 기록한 세대와는 다르게 보인다
+    cache.invalidate("mrn-2")
+    cache.put("mrn-1", "key", b"{}", generation)
+    assert cache.get("mrn-1", "key") is None
+
+
+def test_uncacheable_build_is_not_stored():
+    cache = ResponseCache()
+
+    async def degraded_build():
+        return Uncacheable({"overall_summary": {"failed_sections": ["trust_game"]}})
+
+    async def scenario():
+        response = await cache.respond(_request(), "mrn-1", degraded_build)
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.headers["cache-control"] == "no-store"
+
+    asyncio.run(scenario())
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["uncacheable"] == 1
+
+
+def test_report_with_failed_section_is_rebuilt(client, monkeypatch):
+    original = report._trust_game_report
+    calls = []
+
+    async def failing_trust_game_report(*args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            raise RuntimeError("저장소 오류")
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(report, "_trust_game_report", failing_trust_game_report)
+
+    degraded = client.get("/report/all")
+    assert degraded.json()["overall_summary"]["failed_sections"] == ["trust_game"]
+    assert "etag" not in degraded.headers
+
+    recovered = client.get("/report/all")
+    assert recovered.json()["overall_summary"]["failed_sections"] == []
+    assert "etag" in recovered.headers
+    assert len(calls) == 2
@@ -0,0 +1,201 @@
+"""메모리/SQLite 문서 저장소: Firestore 와 같은 조건/정렬/커서/배치 의미."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from db.base import DOCUMENT_ID
+from db.batch import (
+    MAX_BATCH_OPS,
+    DocumentExistsError,
+    create_op,
+    delete_op,
+    increment_op,
+    set_op,
+    update_op,
+)
+from db.memory import MemoryStore
+from db.sqlite import SQLiteStore
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def run(request, tmp_path):
+    """저장소 하나를 만들어 ``scenario(store)`` 를 실행하는 함수"""
+
+    def make():
+        if request.param == "memory":
+            return MemoryStore()
+        return SQLiteStore(str(tmp_path / "store.sqlite3"))
+
+    def run(scenario):
+        async def main():
+            store = make()
+            await store.connect()
+            try:
+                return await scenario(store)
+            finally:
+                await store.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+async def _seed_rounds(store):
+    for user_id in ("a", "b"):
+        for round_number in (3, 1, 5, 2, 4):
+            await store.set(
+                "rounds",
+                f"{user_id}-{round_number}",
+                {
+                    "user_id": user_id,
+                    "round": round_number,
+                    "role": "trustee" if round_number % 2 else "receiver",
+                    "payoff": round_number * 1.5,
+                },
+            )
+    # 정렬 필드(round)가 없는 문서
+    await store.set("rounds", "a-legacy", {"user_id": "a", "payoff": 0})
+
+
+def test_document_crud(run):
+    async def scenario(store):
+        doc_id = await store.add("items", {"name": "x", "at": datetime(2024, 1, 2, 3)})
+        assert await store.get("items", doc_id) == {
+            "name": "x",
+            "at": datetime(2024, 1, 2, 3),
+        }
+
+        await store.set("items", doc_id, {"size": 1}, merge=True)
+        await store.update("items", doc_id, {"name": "y"})
+        assert await store.get("items", doc_id) == {
+            "name": "y",
+            "at": datetime(2024, 1, 2, 3),
+            "size": 1,
+        }
+        await store.set("items", doc_id, {"size": 2})
+        assert await store.get("items", doc_id) == {"size": 2}
+
+        # 돌려받은 문서를 고쳐도 저장된 값은 그대로
+        (await store.get("items", doc_id))["size"] = 3
+        assert (await store.get("items", doc_id))["size"] == 2
+
+        with pytest.raises(ValueError):
+            await store.update("items", "missing", {"name": "z"})
+        await store.delete("items", doc_id)
+        assert await store.get("items", doc_id) is None
+
+    run(scenario)
+
+
+def test_query_filters_order_and_select(run):
+    async def scenario(store):
+        await _seed_rounds(store)
+
+        docs = await store.query(
+            "rounds", filters=[("user_id", "==", "a")], order_by=["round"]
+        )
+        # 정렬 필드가 없는 문서는 빠진다
+        assert [doc.id for doc in docs] == ["a-1", "a-2", "a-3", "a-4", "a-5"]
+
+        docs = await store.query(
+            "rounds",
+            filters=[("user_id", "==", "b"), ("role", "==", "trustee")],
+            order_by=["-round"],
+            limit=2,
+            select=["round"],
+        )
+        assert [(doc.id, doc.data) for doc in docs] == [
+            ("b-5", {"round": 5}),
+            ("b-3", {"round": 3}),
+        ]
+
+        docs = await store.query(
+            "rounds", filters=[("round", "in", [2, 4]), ("payoff", ">", 3)]
+        )
+        assert sorted(doc.id for doc in docs) == ["a-4", "b-4"]
+
+        assert await store.count("rounds") == 11
+        assert await store.count("rounds", [("user_id", "==", "a")]) == 6
+        assert await store.count("rounds", [("round", ">=", 4)]) == 4
+        assert await store.count("missing") == 0
+
+    run(scenario)
+
+
+def test_start_after_pages_without_gaps(run):
+    async def scenario(store):
+        await _seed_rounds(store)
+        for order_by in (["round"], ["-round"], ["role", "-round"], [DOCUMENT_ID]):
+            everything = await store.query("rounds", order_by=order_by)
+            paged, start_after = [], None
+            while True:
+                page = await store.query(
+                    "rounds", order_by=order_by, limit=3, start_after=start_after
+                )
+                if not page:
+                    break
+                paged.extend(page)
+                start_after = page[-1].id
+            assert [doc.id for doc in paged] == [doc.id for doc in everything]
+
+        with pytest.raises(ValueError):
+            await store.query("rounds", order_by=["round"], start_after="nope")
+
+    run(scenario)
+
+
+def test_batch_is_atomic(run):
+    async def scenario(store):
+        await store.set("counters", "c", {"n": 1})
+        ops = [
+            increment_op("counters", "c", {"n": 2}),
+            set_op("items", "new", {"x": 1}),
+            create_op("counters", "c", {"n": 0}),
+        ]
+        with pytest.raises(DocumentExistsError):
+            await store.commit_batch(ops)
+        assert await store.get("counters", "c") == {"n": 1}
+        assert await store.get("items", "new") is None
+
+        ids = await store.commit_batch(
+            [
+                increment_op("counters", "c", {"n": 2}, {"label": "c"}),
+                increment_op("counters", "fresh", {"n": 1}),
+                create_op("items", "new", {"x": 1}),
+                update_op("items", "new", {"y": 2}),
+                delete_op("counters", "gone"),
+            ]
+        )
+        assert ids == ["c", "fresh", "new", "new", "gone"]
+        assert await store.get("counters", "c") == {"n": 3, "label": "c"}
+        assert await store.get("counters", "fresh") == {"n": 1}
+        assert await store.get("items", "new") == {"x": 1, "y": 2}
+
+        with pytest.raises(ValueError):
+            await store.commit_batch(
+                [set_op("items", str(i), {}) for i in range(MAX_BATCH_OPS + 1)]
+            )
+
+    run(scenario)
+
+
+def test_sqlite_keeps_documents_after_reopen(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+
+    async def scenario():
+        store = SQLiteStore(path)
+        await store.set("items", "a", {"at": datetime(2024, 5, 6), "round": 1})
+        await store.close()
+
+        reopened = SQLiteStore(path)
+        try:
+            assert await reopened.get("items", "a") == {
+                "at": datetime(2024, 5, 6),
+                "round": 1,
+            }
+        finally:
+            await reopened.close()
+
+    asyncio.run(scenario())
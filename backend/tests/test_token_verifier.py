@@ -0,0 +1,123 @@
+"""로컬 ID 토큰 검증 (benchmarks.load_test.TokenMinter 로 만든 키로 발급)."""
+
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.load_test import KEY_ID, PROJECT_ID, TokenMinter
+from core import token_verifier as token_verifier_module
+from core.token_verifier import TokenVerificationError, TokenVerifier
+
+
+@pytest.fixture(scope="module")
+def minter():
+    return TokenMinter()
+
+
+@pytest.fixture
+def verifier(minter):
+    verifier = TokenVerifier(project_id=PROJECT_ID, keys_file=None)
+    verifier.load_keys({KEY_ID: minter.public_pem()})
+    return verifier
+
+
+def test_valid_token(verifier, minter):
+    decoded = verifier.verify(minter.mint("uid-1", "1234@eco.play"))
+    assert decoded["uid"] == "uid-1"
+    assert decoded["email"] == "1234@eco.play"
+
+
+def test_bad_signature(verifier):
+    # 같은 kid 지만 다른 키로 서명
+    token = TokenMinter().mint("uid-1", "1234@eco.play")
+    with pytest.raises(TokenVerificationError, match="서명"):
+        verifier.verify(token)
+
+
+def test_tampered_payload(verifier, minter):
+    header, _, signature = minter.mint("uid-1", "1234@eco.play").split(".")
+    other_payload = minter.mint("uid-2", "5678@eco.play").split(".")[1]
+    with pytest.raises(TokenVerificationError, match="서명"):
+        verifier.verify(f"{header}.{other_payload}.{signature}")
+
+
+@pytest.mark.parametrize(
+    "overrides, claim",
+    [
+        ({"aud": "other-project"}, "aud"),
+        ({"iss": "https://securetoken.google.com/other-project"}, "iss"),
+    ],
+)
+def test_wrong_audience_or_issuer(verifier, minter, overrides, claim):
+    token = minter.mint("uid-1", "1234@eco.play", **overrides)
+    with pytest.raises(TokenVerificationError, match=claim):
+        verifier.verify(token)
+
+
+def test_expired_token(verifier, minter):
+    token = minter.mint("uid-1", "1234@eco.play", exp=int(time.time()) - 3600)
+    with pytest.raises(TokenVerificationError, match="만료"):
+        verifier.verify(token)
+
+
+def test_unknown_kid(verifier, minter):
+    token = minter.mint("uid-1", "1234@eco.play", kid="unknown-key")
+    with pytest.raises(TokenVerificationError, match="알 수 없는 서명 키"):
+        verifier.verify(token)
+
+
+def test_lazy_start_fetches_keys_on_first_token(minter, monkeypatch):
+    fetches = []
+
+    def fake_fetch():
+        fetches.append(time.time())
+        return {KEY_ID: minter.public_pem()}, 3600
+
+    monkeypatch.setattr(token_verifier_module, "fetch_google_signing_keys", fake_fetch)
+
+    async def scenario():
+        verifier = TokenVerifier(project_id=PROJECT_ID, keys_file=None)
+        await verifier.start(eager=False)
+        try:
+            assert fetches == []
+
+            token = minter.mint("uid-1", "1234@eco.play")
+            with pytest.raises(TokenVerificationError):
+                verifier.verify(token)
+            for _ in range(100):
+                if verifier.key_set.loaded:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert len(fetches) == 1
+            assert verifier.verify(token)["uid"] == "uid-1"
+        finally:
+            await verifier.stop()
+
+    asyncio.run(scenario())
+
+
+def test_expired_key_set_rejects_and_requests_refresh(verifier, minter):
+    token = minter.mint("uid-1", "1234@eco.play")
+    verifier._refresh_requested = asyncio.Event()
+    verifier.load_keys({KEY_ID: minter.public_pem()}, max_age=3600)
+    assert verifier.verify(token)["uid"] == "uid-1"
+
+    # 갱신이 실패한 채 max-age 가 지남
+    verifier.key_set.expires_at = time.time() - 1
+    with pytest.raises(TokenVerificationError, match="서명 키 목록이 만료"):
+        verifier.verify(token)
+    assert verifier._refresh_requested.is_set()
+    assert verifier.stats()["keys_expired"] is True
+
+    # 갱신되면 다시 검증
+    verifier.load_keys({KEY_ID: minter.public_pem()}, max_age=3600)
+    assert verifier.verify(token)["uid"] == "uid-1"
+
+
+def test_keys_file_never_expires(verifier, minter):
+    # 로컬 키 파일처럼 max-age 없이 로드한 키
+    assert verifier.key_set.expires_at == float("inf")
+    assert verifier.key_set.expired is False
+    assert verifier.verify(minter.mint("uid-1", "1234@eco.play"))["uid"] == "uid-1"